@@ -0,0 +1,176 @@
+"""Render benchmark: latency, allocations and output size per scenario and format.
+
+    python benchmarks/bench_render.py                    # compare to the baseline
+    python benchmarks/bench_render.py --update-baseline  # store a new baseline
+
+Every demo scenario is encoded in each format with `Prisma2020Diagram.render`
+(`svg-compact` uses the hand-built SVG writer instead of matplotlib). Latency
+is the median/p95 over --repeat runs after warm-up; allocations are the peak
+memory traced by tracemalloc during one extra run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from scenarios import SCENARIOS  # noqa: E402
+
+FORMATS = ("png", "svg", "pdf", "svg-compact")
+DEFAULT_BASELINE = HERE / "baselines" / "render.json"
+
+# metric -> tolerance option (relative increase allowed before it counts as a regression)
+COMPARED = {"median": "tolerance", "alloc_peak": "tolerance", "bytes": "bytes_tolerance"}
+
+
+def _p95(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, -(-95 * len(ordered) // 100) - 1)]  # nearest rank
+
+
+def measure(name: str, fmt: str, *, repeat: int, warmup: int) -> Dict[str, Any]:
+    from prisma_flow_diagram import OutputOptions, Prisma2020Diagram
+
+    diagram = Prisma2020Diagram(**SCENARIOS[name])
+    output = OutputOptions(svg_compact=fmt == "svg-compact")
+    encode = fmt.split("-")[0]
+
+    def run() -> bytes:
+        return diagram.render([encode], output=output)[encode]
+
+    for _ in range(warmup):
+        run()
+
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        data = run()
+        samples.append(time.perf_counter() - t0)
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    base = tracemalloc.get_traced_memory()[0]
+    run()
+    alloc_peak = tracemalloc.get_traced_memory()[1] - base
+    if started:
+        tracemalloc.stop()
+
+    return {
+        "median": statistics.median(samples),
+        "p95": _p95(samples),
+        "alloc_peak": alloc_peak,
+        "bytes": len(data),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    *,
+    tolerance: float,
+    bytes_tolerance: float,
+) -> list[str]:
+    """Regressions: metrics above baseline * (1 + tolerance)."""
+    limits = {"tolerance": tolerance, "bytes_tolerance": bytes_tolerance}
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, option in COMPARED.items():
+            if not base.get(metric):
+                continue
+            ratio = current[metric] / base[metric]
+            if ratio > 1 + limits[option]:
+                regressions.append(
+                    f"{key} {metric}: {current[metric]:.6g} vs baseline "
+                    f"{base[metric]:.6g} (+{(ratio - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _rows(results: Dict[str, Dict[str, Any]]) -> Iterable[Tuple[str, ...]]:
+    yield ("scenario/format", "median ms", "p95 ms", "alloc KiB", "bytes")
+    for key, r in results.items():
+        yield (
+            key,
+            f"{r['median'] * 1e3:.1f}",
+            f"{r['p95'] * 1e3:.1f}",
+            f"{r['alloc_peak'] / 1024:.0f}",
+            str(r["bytes"]),
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    p.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--warmup", type=int, default=2)
+    p.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    p.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative increase of latency and allocations (default: 0.25).",
+    )
+    p.add_argument(
+        "--bytes-tolerance",
+        type=float,
+        default=0.05,
+        help="Allowed relative increase of output size (default: 0.05).",
+    )
+    p.add_argument("--update-baseline", action="store_true")
+    p.add_argument("-o", "--output", type=Path, default=None, help="Write JSON results here.")
+    args = p.parse_args(argv)
+
+    results = {
+        f"{name}/{fmt}": measure(name, fmt, repeat=args.repeat, warmup=args.warmup)
+        for name in args.scenarios
+        for fmt in args.formats
+    }
+
+    rows = list(_rows(results))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        cells = [row[0].ljust(widths[0])] + [c.rjust(w) for c, w in zip(row[1:], widths[1:])]
+        print("  ".join(cells))
+
+    text = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline} (run with --update-baseline)")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(
+        results, baseline, tolerance=args.tolerance, bytes_tolerance=args.bytes_tolerance
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
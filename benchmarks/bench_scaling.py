@@ -0,0 +1,174 @@
+"""Scaling benchmark: load, aggregate, validate, layout and render per records-file size.
+
+    python benchmarks/bench_scaling.py --sizes 1000 10000 100000 -o benchmarks/results/scaling.json
+
+Each size runs in a fresh interpreter so that its peak RSS is not inflated by
+earlier (larger) runs. Synthetic records files are generated once per
+size/seed into --data-dir and reused.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from generate_records import GeneratorConfig, write_records  # noqa: E402
+
+# Prefix settings matching the generator's default sources
+PRIOR_REVIEWS = ["prior_review.bib"]
+OTHER_METHODS = ["citations.bib"]
+
+STAGES = ("load", "aggregate", "validate", "layout", "render")
+# stages that process every record (the others work on one diagram's counts)
+PER_RECORD = ("load", "aggregate")
+
+
+def records_file(data_dir: Path, size: int, seed: int) -> Path:
+    path = data_dir / f"records-{size}-s{seed}.bib"
+    if not path.exists():
+        tmp = path.with_suffix(".tmp")
+        write_records(GeneratorConfig(size=size, seed=seed), tmp)
+        tmp.replace(path)
+    return path
+
+
+def _max_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def run_once(path: Path, fmt: str) -> Dict[str, float]:
+    """Run the pipeline once; wall seconds per stage."""
+    from prisma_flow_diagram import Prisma2020Diagram
+    from prisma_flow_diagram.instrument import instrument, stage
+    from prisma_flow_diagram.loader import load_records, status_from_records
+    from prisma_flow_diagram.validation import DiagramInputs, validate_diagram
+
+    with instrument() as inst:
+        records = load_records(path)
+        params = status_from_records(
+            records, prior_reviews=PRIOR_REVIEWS, other_methods=OTHER_METHODS
+        )
+        del records
+        with stage("validate"):
+            validate_diagram(DiagramInputs(**asdict(params)))
+        Prisma2020Diagram(**asdict(params)).render([fmt])
+
+    summary = inst.summary()
+    out = {name: summary[name]["wall"] for name in ("load", "aggregate", "validate", "layout")}
+    out["render"] = summary["draw"]["wall"] + summary["save"]["wall"]
+    return out
+
+
+def child(path: Path, size: int, repeat: int, fmt: str) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    # first import of CoLRev/matplotlib is not part of any stage
+    import colrev.loader.load_utils  # noqa: F401
+    import matplotlib.pyplot  # noqa: F401
+
+    import_seconds = time.perf_counter() - t0
+    runs = [run_once(path, fmt) for _ in range(repeat)]
+    best = {name: min(r[name] for r in runs) for name in STAGES}
+    return {
+        "size": size,
+        "file_bytes": path.stat().st_size,
+        "import_seconds": import_seconds,
+        "seconds": best,
+        # records per second for load/aggregate, diagrams per second otherwise
+        "throughput": {
+            name: (size if name in PER_RECORD else 1) / best[name] if best[name] else None
+            for name in STAGES
+        },
+        "peak_rss": _max_rss(),
+        "repeat": repeat,
+    }
+
+
+def _meta() -> Dict[str, Any]:
+    try:
+        from importlib.metadata import version
+
+        package_version = version("prisma-flow-diagram")
+    except Exception:  # pylint: disable=broad-except
+        package_version = None
+    return {
+        "package_version": package_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3, help="Runs per size (best is kept).")
+    p.add_argument("--format", default="png", help="Render format (default: png).")
+    p.add_argument("--data-dir", type=Path, default=HERE / "data")
+    p.add_argument("-o", "--output", type=Path, default=None, help="Write JSON results here.")
+    p.add_argument("--child", type=Path, default=None, help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.child is not None:
+        result = child(args.child, args.sizes[0], args.repeat, args.format)
+        print(json.dumps(result))
+        return 0
+
+    results = []
+    for size in args.sizes:
+        path = records_file(args.data_dir, size, args.seed)
+        proc = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                str(path),
+                "--sizes",
+                str(size),
+                "--repeat",
+                str(args.repeat),
+                "--format",
+                args.format,
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        s = result["seconds"]
+        print(
+            f"{size:>9} records  "
+            + "  ".join(f"{name}={s[name]:.3f}s" for name in STAGES)
+            + f"  peak_rss={(result['peak_rss'] or 0) / 2**20:.0f}MiB",
+            file=sys.stderr,
+        )
+
+    payload = {"meta": {**_meta(), "seed": args.seed, "format": args.format}, "results": results}
+    text = json.dumps(payload, indent=2) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
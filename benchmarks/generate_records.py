@@ -0,0 +1,153 @@
+"""Deterministic generator for synthetic CoLRev-like records.bib files.
+
+    python benchmarks/generate_records.py --size 100000 --out /tmp/records.bib
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, TextIO
+
+# Typical funnel of a review in progress (weights, normalized when drawing)
+DEFAULT_STATUS_MIX: Dict[str, float] = {
+    "md_processed": 0.02,
+    "rev_prescreen_excluded": 0.70,
+    "rev_prescreen_included": 0.03,
+    "pdf_needs_manual_retrieval": 0.02,
+    "pdf_not_available": 0.02,
+    "pdf_prepared": 0.03,
+    "rev_excluded": 0.13,
+    "rev_included": 0.03,
+    "rev_synthesized": 0.02,
+}
+
+# Number of origins per record (1 = no duplicates merged into the record)
+DEFAULT_ORIGIN_COUNTS: Dict[int, float] = {1: 0.5, 2: 0.3, 3: 0.15, 4: 0.05}
+
+# Search sources (origin prefixes); "citations" / "prior_review" can be used as
+# other-methods / prior-review prefixes
+DEFAULT_PREFIXES: Dict[str, float] = {
+    "crossref.bib": 0.35,
+    "pubmed.bib": 0.25,
+    "dblp.bib": 0.2,
+    "citations.bib": 0.1,
+    "prior_review.bib": 0.1,
+}
+
+_FULLTEXT_SCREENED = {"rev_excluded", "rev_included", "rev_synthesized"}
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    size: int = 1000
+    seed: int = 0
+    status_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_STATUS_MIX))
+    origin_counts: Dict[int, float] = field(
+        default_factory=lambda: dict(DEFAULT_ORIGIN_COUNTS)
+    )
+    prefixes: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_PREFIXES))
+    reasons: int = 6  # number of distinct exclusion criteria
+
+
+def _field(name: str, value: str) -> str:
+    return f"   {name:<30}= {{{value}}},\n"
+
+
+def iter_entries(config: GeneratorConfig) -> Iterator[str]:
+    """Yield BibTeX entries in CoLRev format (sorted by ID)."""
+    rng = random.Random(config.seed)
+    statuses, status_w = zip(*config.status_mix.items())
+    counts, count_w = zip(*config.origin_counts.items())
+    sources, source_w = zip(*config.prefixes.items())
+    criteria = [f"criterion_{i:02d}" for i in range(1, config.reasons + 1)]
+    next_id = {s: 0 for s in sources}
+    width = max(7, len(str(config.size)))
+
+    for idx in range(1, config.size + 1):
+        status = rng.choices(statuses, status_w)[0]
+        n_origins = min(rng.choices(counts, count_w)[0], len(sources))
+        picked: list[str] = []
+        while len(picked) < n_origins:
+            source = rng.choices(sources, source_w)[0]
+            if source not in picked:
+                picked.append(source)
+        origins = []
+        for source in picked:
+            next_id[source] += 1
+            origins.append(f"{source}/{next_id[source]:06d}")
+
+        lines = [f"@article{{R{idx:0{width}d},\n"]
+        lines.append(
+            _field(
+                "colrev_origin",
+                (";\n" + " " * 36).join(origins) + ";",
+            )
+        )
+        lines.append(_field("colrev_status", status))
+        if status in _FULLTEXT_SCREENED and criteria:
+            if status == "rev_excluded":
+                # at least one criterion violated; occasionally several
+                out = {rng.choice(criteria)}
+                if rng.random() < 0.2:
+                    out.add(rng.choice(criteria))
+            else:
+                out = set()
+            lines.append(
+                _field(
+                    "screening_criteria",
+                    ";".join(f"{c}={'out' if c in out else 'in'}" for c in criteria),
+                )
+            )
+        lines.append(_field("title", f"Synthetic record {idx}"))
+        lines.append(_field("author", f"Author, A{idx % 997} and Other, B{idx % 991}"))
+        lines.append(_field("journal", f"Journal {idx % 53}"))
+        lines.append(_field("year", str(1990 + idx % 35)))
+        lines.append("}\n\n")
+        yield "".join(lines)
+
+
+def write_records(config: GeneratorConfig, out: Path | TextIO) -> None:
+    if isinstance(out, Path):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", encoding="utf-8") as file:
+            write_records(config, file)
+        return
+    for entry in iter_entries(config):
+        out.write(entry)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--size", type=int, default=1000, help="Number of records.")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=Path, required=True, help="Output records.bib path.")
+    p.add_argument(
+        "--status-mix", type=json.loads, default=None, help='JSON, e.g. {"rev_included": 1}'
+    )
+    p.add_argument(
+        "--origin-counts", type=json.loads, default=None, help='JSON, e.g. {"1": 0.7, "2": 0.3}'
+    )
+    p.add_argument(
+        "--prefixes", type=json.loads, default=None, help='JSON, e.g. {"crossref.bib": 1}'
+    )
+    p.add_argument("--reasons", type=int, default=6, help="Distinct exclusion criteria.")
+    args = p.parse_args(argv)
+
+    config = GeneratorConfig(
+        size=args.size,
+        seed=args.seed,
+        status_mix=args.status_mix or dict(DEFAULT_STATUS_MIX),
+        origin_counts={int(k): v for k, v in (args.origin_counts or DEFAULT_ORIGIN_COUNTS).items()},
+        prefixes=args.prefixes or dict(DEFAULT_PREFIXES),
+        reasons=args.reasons,
+    )
+    write_records(config, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
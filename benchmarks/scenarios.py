@@ -0,0 +1,107 @@
+"""Diagram inputs of the demo scenarios (see demo/run.py)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "new": {
+        "db_registers": {
+            "identification": {"databases": 1842, "registers": 73},
+            "removed_before_screening": {"duplicates": 412, "automation": 35, "other": 10},
+            "records": {"screened": 1458, "excluded": 1320},
+            "reports": {
+                "sought": 138,
+                "not_retrieved": 9,
+                "assessed": 129,
+                "excluded_reasons": {
+                    "Wrong population": 41,
+                    "Wrong outcome": 28,
+                    "Not primary research": 15,
+                    "Duplicate report": 7,
+                },
+            },
+        },
+        "included": {"studies": 38, "reports": 52},
+    },
+    "new_other-methods": {
+        "db_registers": {
+            "identification": {"databases": 1842, "registers": 73},
+            "removed_before_screening": {"duplicates": 512, "automation": 40, "other": 12},
+            "records": {"screened": 1351, "excluded": 1220},
+            "reports": {
+                "sought": 131,
+                "not_retrieved": 7,
+                "assessed": 124,
+                "excluded_reasons": {
+                    "Wrong design": 33,
+                    "Wrong intervention": 29,
+                    "No full text": 7,
+                    "Other": 15,
+                },
+            },
+        },
+        "included": {"studies": 40, "reports": 56},
+        "other_methods": {
+            "identification": {"Websites": 22, "Organisations": 15, "Citation searching": 41},
+            "removed_before_screening": {"duplicates": 0, "automation": 0, "other": 0},
+            "records": {"screened": 78, "excluded": 60},
+            "reports": {
+                "sought": 18,
+                "not_retrieved": 2,
+                "assessed": 16,
+                "excluded_reasons": {"Not relevant": 9, "Duplicate report": 2},
+            },
+            "included": {"studies": 5, "reports": 6},
+        },
+    },
+    "updated": {
+        "previous": {"included": {"studies": 58, "reports": 74}},
+        "new_db_registers": {
+            "identification": {"databases": 620, "registers": 18},
+            "removed_before_screening": {"duplicates": 101, "automation": 12, "other": 5},
+            "records": {"screened": 520, "excluded": 470},
+            "reports": {
+                "sought": 50,
+                "not_retrieved": 4,
+                "assessed": 46,
+                "excluded_reasons": {
+                    "Wrong comparator": 12,
+                    "Wrong outcomes": 9,
+                    "Not relevant design": 10,
+                },
+            },
+        },
+        "new_included": {"studies": 15, "reports": 19},
+    },
+    "updated_other-methods": {
+        "previous": {"included": {"studies": 58, "reports": 74}},
+        "new_db_registers": {
+            "identification": {"databases": 620, "registers": 18},
+            "removed_before_screening": {"duplicates": 115, "automation": 14, "other": 6},
+            "records": {"screened": 503, "excluded": 452},
+            "reports": {
+                "sought": 51,
+                "not_retrieved": 3,
+                "assessed": 48,
+                "excluded_reasons": {
+                    "Wrong intervention": 11,
+                    "Wrong outcomes": 10,
+                    "Not primary research": 9,
+                },
+            },
+        },
+        "other_methods": {
+            "identification": {"Websites": 10, "Organisations": 8, "Citation searching": 27},
+            "removed_before_screening": {"duplicates": 0, "automation": 0, "other": 0},
+            "records": {"screened": 45, "excluded": 35},
+            "reports": {
+                "sought": 10,
+                "not_retrieved": 1,
+                "assessed": 9,
+                "excluded_reasons": {"Not relevant": 6, "Not primary research": 2},
+            },
+        },
+        "new_included": {"studies": 22, "reports": 27},
+    },
+}
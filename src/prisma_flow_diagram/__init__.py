@@ -1,55 +1,139 @@
 """Package for py-prisma."""
 
+from __future__ import annotations
+
+import importlib
 from dataclasses import asdict
 from pathlib import Path
+from typing import Any, Mapping, Sequence, TYPE_CHECKING
 
-from .loader import load_status_from_records
+from .loader import counts_table, load_status_from_records, status_from_records
+from .loader import status_from_index
 from .loader import PrismaStatus, Prisma2020New, Prisma2020Updated
-from .prisma import plot_prisma2020_new, plot_prisma2020_updated
+from .loader import OtherMethodsPrefixes
+from .validation import ValidationMode
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .output import OutputOptions
+    from .prisma import Prisma2020Diagram
+    from .prisma import plot_prisma2020_new, plot_prisma2020_updated
 
+__version__ = "0.1.0"
 __author__ = "Gerit Wagner"
 __email__ = "gerit.wagner@uni-bamberg.de"
 
 __all__ = [
+    "OutputOptions",
+    "Prisma2020Diagram",
     "PrismaStatus",
+    "counts_table",
     "load_status_from_records",
-    "plot_prisma2020",
+    "plot_prisma",
+    "plot_prisma_from_records",
+    "save_prisma",
+    "status_from_index",
+    "status_from_records",
+    "plot_prisma2020_new",
+    "plot_prisma2020_updated",
+    "ValidationMode",
 ]
 
+# Rendering pulls in matplotlib: these names are imported on first access, so
+# that counting and validation (e.g. `python -m prisma_flow_diagram.cli validate`)
+# stay lightweight.
+_LAZY = {
+    "OutputOptions": ".output",
+    "Prisma2020Diagram": ".prisma",
+    "plot_prisma2020_new": ".prisma",
+    "plot_prisma2020_updated": ".prisma",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 # -------------------------
 # Plot convenience wrapper
 # -------------------------
 
 
-def plot_prisma_from_records(
+def plot_prisma(
+    params: Prisma2020New | Prisma2020Updated,
     *,
-    records_path: str | Path = "data/records.bib",
-    output_path: str | Path = "prisma.png",
+    output_path: str | Path | None = "prisma.png",
     show: bool = False,
-    prior_reviews: list[str] | None = None,
-    other_methods: list[str] | None = None,
+    output: OutputOptions | None = None,
 ) -> None:
-    params = load_status_from_records(
-        records_path,
-        prior_reviews=prior_reviews,
-        other_methods=other_methods,
-    )
+    """Plot PRISMA inputs as returned by `status_from_records`/`load_status_from_records`."""
+    from .prisma import plot_prisma2020_new, plot_prisma2020_updated
+
+    filename = str(output_path) if output_path is not None else None
 
     if isinstance(params, Prisma2020New):
         plot_prisma2020_new(
             **asdict(params),
-            filename=str(output_path),
+            filename=filename,
             show=show,
+            output=output,
         )
         return
 
     if isinstance(params, Prisma2020Updated):
         plot_prisma2020_updated(
             **asdict(params),
-            filename=str(output_path),
+            filename=filename,
             show=show,
+            output=output,
         )
         return
 
     raise TypeError(f"Unexpected params type: {type(params)!r}")
+
+
+def save_prisma(
+    params: Prisma2020New | Prisma2020Updated,
+    filenames: Sequence[str | Path],
+    *,
+    output: OutputOptions | None = None,
+    validation: ValidationMode = "warn",
+) -> list[Path]:
+    """
+    Write PRISMA inputs to several files from a single layout; only files whose
+    content changes are (atomically) replaced. Returns the written paths.
+    """
+    from .prisma import Prisma2020Diagram
+
+    if not isinstance(params, (Prisma2020New, Prisma2020Updated)):
+        raise TypeError(f"Unexpected params type: {type(params)!r}")
+    return Prisma2020Diagram(**asdict(params)).save(
+        filenames, output=output, validation=validation
+    )
+
+
+def plot_prisma_from_records(
+    *,
+    records_path: str | Path = "data/records.bib",
+    output_path: str | Path = "prisma.png",
+    show: bool = False,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    output: OutputOptions | None = None,
+    reason_map: Mapping[str, str] | None = None,
+    max_reasons: int | None = None,
+    other_reasons_label: str = "Other",
+) -> None:
+    params = load_status_from_records(
+        records_path,
+        prior_reviews=prior_reviews,
+        other_methods=other_methods,
+        reason_map=reason_map,
+        max_reasons=max_reasons,
+        other_reasons_label=other_reasons_label,
+    )
+    plot_prisma(params, output_path=output_path, show=show, output=output)
@@ -0,0 +1,283 @@
+"""
+asyncio counterparts of the loading and plotting functions.
+
+Parsing and rendering run in worker processes (matplotlib's pyplot state is
+not thread-safe), so the event loop is never blocked:
+
+    async with AsyncPrisma(max_concurrency=4) as prisma:
+        params = await prisma.load_status_from_records("data/records.bib")
+        png = (await prisma.render(params, ["png"]))["png"]
+
+At most `max_concurrency` calls run at a time; further calls wait without
+occupying a worker. Cancelling a call that is waiting, or whose work has not
+started yet, drops it; work already running in a worker is completed there
+and its result discarded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, TypeVar
+
+from .batch import warm_render_worker
+from .loader import OtherMethodsPrefixes, Prisma2020New, Prisma2020Updated
+from .loader import load_status_from_records as _load_status_from_records
+from .validation import ValidationMode
+
+T = TypeVar("T")
+
+Params = Any  # Prisma2020New | Prisma2020Updated | Mapping of diagram inputs
+
+
+# -------------------------
+# Worker functions (module level: they are pickled)
+# -------------------------
+
+
+def _spec(params: Params) -> Dict[str, Any]:
+    if is_dataclass(params) and not isinstance(params, type):
+        return asdict(params)
+    return dict(params)
+
+
+def _render(spec: Dict[str, Any], formats: Sequence[str], output: Any) -> dict[str, bytes]:
+    from .prisma import Prisma2020Diagram  # pylint: disable=import-outside-toplevel
+
+    return Prisma2020Diagram(**spec).render(formats, output=output)
+
+
+def _save(
+    spec: Dict[str, Any],
+    filenames: Sequence[str],
+    output: Any,
+    validation: ValidationMode,
+    figsize: tuple[float, float] = (14, 10),
+) -> list[Path]:
+    from .prisma import Prisma2020Diagram  # pylint: disable=import-outside-toplevel
+
+    return Prisma2020Diagram(**spec).save(
+        filenames, figsize=figsize, output=output, validation=validation
+    )
+
+
+def _plot_from_records(
+    records_path: str, output_path: str, load_kwargs: Dict[str, Any], output: Any
+) -> list[Path]:
+    params = _load_status_from_records(records_path, **load_kwargs)
+    return _save(asdict(params), [output_path], output, "warn")
+
+
+# -------------------------
+# Client
+# -------------------------
+
+
+class AsyncPrisma:
+    """
+    Runs loading and rendering in `executor` (default: a pool of
+    `max_concurrency` warm worker processes, created on first use).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+        # one semaphore per event loop (a semaphore is bound to its loop)
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrency, initializer=warm_render_worker
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn` in the executor, within the concurrency limit."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(fn, *args, **kwargs)
+            )
+
+    # ---- loading ----
+
+    async def load_status_from_records(
+        self,
+        records_path: Path | str,
+        *,
+        prior_reviews: list[str] | None = None,
+        other_methods: OtherMethodsPrefixes | None = None,
+        origin_field: str = "colrev_origin",
+        reason_map: Optional[Mapping[str, str]] = None,
+        max_reasons: Optional[int] = None,
+        other_reasons_label: str = "Other",
+    ) -> Prisma2020New | Prisma2020Updated:
+        return await self.run(
+            _load_status_from_records,
+            str(records_path),
+            prior_reviews=prior_reviews,
+            other_methods=other_methods,
+            origin_field=origin_field,
+            reason_map=dict(reason_map) if reason_map is not None else None,
+            max_reasons=max_reasons,
+            other_reasons_label=other_reasons_label,
+        )
+
+    # ---- rendering ----
+
+    async def render(
+        self, params: Params, formats: Sequence[str], *, output: Any = None
+    ) -> dict[str, bytes]:
+        """Encoded diagram per format (see `Prisma2020Diagram.render`)."""
+        return await self.run(_render, _spec(params), list(formats), output)
+
+    async def save(
+        self,
+        params: Params,
+        filenames: Sequence[Path | str],
+        *,
+        figsize: tuple[float, float] = (14, 10),
+        output: Any = None,
+        validation: ValidationMode = "warn",
+    ) -> list[Path]:
+        """Write the diagram to each filename (see `Prisma2020Diagram.save`)."""
+        return await self.run(
+            _save, _spec(params), [str(f) for f in filenames], output, validation, figsize
+        )
+
+    async def plot_prisma2020_new(
+        self,
+        *,
+        db_registers: Mapping[str, Any],
+        included: Mapping[str, Any],
+        other_methods: Any = None,
+        # output
+        filename: Path | str,
+        figsize: tuple[float, float] = (14, 10),
+        style: Any = None,
+        validation: ValidationMode = "warn",
+        output: Any = None,
+    ) -> list[Path]:
+        spec = {
+            "db_registers": db_registers,
+            "included": included,
+            "other_methods": other_methods,
+            "style": style,
+        }
+        return await self.save(
+            spec, [filename], figsize=figsize, output=output, validation=validation
+        )
+
+    async def plot_prisma2020_updated(
+        self,
+        *,
+        previous: Mapping[str, Any],
+        new_db_registers: Mapping[str, Any],
+        new_included: Mapping[str, Any],
+        other_methods: Any = None,
+        # output
+        filename: Path | str,
+        figsize: tuple[float, float] = (14, 10),
+        style: Any = None,
+        validation: ValidationMode = "warn",
+        output: Any = None,
+    ) -> list[Path]:
+        spec = {
+            "previous": previous,
+            "new_db_registers": new_db_registers,
+            "new_included": new_included,
+            "other_methods": other_methods,
+            "style": style,
+        }
+        return await self.save(
+            spec, [filename], figsize=figsize, output=output, validation=validation
+        )
+
+    async def plot_prisma_from_records(
+        self,
+        *,
+        records_path: Path | str = "data/records.bib",
+        output_path: Path | str = "prisma.png",
+        prior_reviews: list[str] | None = None,
+        other_methods: OtherMethodsPrefixes | None = None,
+        output: Any = None,
+        reason_map: Optional[Mapping[str, str]] = None,
+        max_reasons: Optional[int] = None,
+        other_reasons_label: str = "Other",
+    ) -> list[Path]:
+        """Load and render in a single worker call."""
+        load_kwargs = {
+            "prior_reviews": prior_reviews,
+            "other_methods": other_methods,
+            "reason_map": dict(reason_map) if reason_map is not None else None,
+            "max_reasons": max_reasons,
+            "other_reasons_label": other_reasons_label,
+        }
+        return await self.run(
+            _plot_from_records, str(records_path), str(output_path), load_kwargs, output
+        )
+
+    # ---- lifecycle ----
+
+    async def aclose(self) -> None:
+        """Shut down the worker pool (if it was created here)."""
+        if self._owns_executor and self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncPrisma":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+# -------------------------
+# Module-level counterparts (shared default client)
+# -------------------------
+
+_default: Optional[AsyncPrisma] = None
+
+
+def default_client() -> AsyncPrisma:
+    """The `AsyncPrisma` used by the module-level functions (one worker per CPU)."""
+    global _default  # pylint: disable=global-statement
+    if _default is None:
+        _default = AsyncPrisma()
+    return _default
+
+
+async def load_status_from_records(records_path: Path | str, **kwargs: Any) -> Any:
+    return await default_client().load_status_from_records(records_path, **kwargs)
+
+
+async def plot_prisma2020_new(*, filename: Path | str, **kwargs: Any) -> list[Path]:
+    return await default_client().plot_prisma2020_new(filename=filename, **kwargs)
+
+
+async def plot_prisma2020_updated(*, filename: Path | str, **kwargs: Any) -> list[Path]:
+    return await default_client().plot_prisma2020_updated(filename=filename, **kwargs)
+
+
+async def plot_prisma_from_records(**kwargs: Any) -> list[Path]:
+    return await default_client().plot_prisma_from_records(**kwargs)
+
+
+async def render(params: Params, formats: Sequence[str], **kwargs: Any) -> dict[str, bytes]:
+    return await default_client().render(params, formats, **kwargs)
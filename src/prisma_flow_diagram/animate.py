@@ -0,0 +1,230 @@
+"""
+Animated (GIF/MP4) or multi-page PDF rendering of a sequence of diagrams,
+e.g. the counts after each search iteration of a living review:
+
+    animation = PrismaAnimation(snapshots, labels=["2023-01", "2023-06", "2024-01"])
+    animation.save("prisma.gif", fps=1)
+
+All frames share one layout (the widest columns and tallest boxes of any
+frame), so boxes and arrows stay in place. The figure and its boxes, arrows
+and phase labels are drawn once; each frame only replaces the box texts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass, replace
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from matplotlib.figure import Figure
+
+from .instrument import stage
+from .output import OutputOptions, pdf_metadata
+from .prisma import (
+    Box,
+    BoxGeometry,
+    MatplotlibRenderer,
+    PrismaStyle,
+    TextBlocks,
+    Widths,
+    as_diagram,
+    figure_size,
+)
+
+Snapshot = Any  # PRISMA inputs (see `as_diagram`)
+
+
+# -------------------------
+# Common layout
+# -------------------------
+
+
+class _TextRecorder:
+    """Renderer that only records the box texts, in drawing order."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def set_ylim(self, bottom: float, top: float) -> None:
+        pass
+
+    def draw_box(self, box: Box, **_: Any) -> BoxGeometry:
+        self.texts.append(box.text)
+        return box.geometry()
+
+    def draw_arrow(self, xy_from: tuple[float, float], xy_to: tuple[float, float]) -> None:
+        pass
+
+    def draw_polyline_arrow(self, points: list[tuple[float, float]]) -> None:
+        pass
+
+    def draw_phase_label(self, xc: float, yc: float, height: float, text: str) -> None:
+        pass
+
+
+def _tallest(values: list[Any]) -> Any:
+    """
+    Texts with the structure of the given text blocks, each padded to the most
+    lines any of them has (box heights follow the number of lines).
+    """
+    first = values[0]
+    if first is None or isinstance(first, str):
+        if any(type(v) is not type(first) for v in values):
+            raise ValueError("all frames must have the same diagram structure")
+        if first is None:
+            return None
+        lines = max(max(1, len(v.splitlines())) for v in values)
+        return first + "\n " * (lines - max(1, len(first.splitlines())))
+    if is_dataclass(first):
+        merged = {f.name: _tallest([getattr(v, f.name) for v in values]) for f in fields(first)}
+        return replace(first, **merged)
+    if isinstance(first, dict):
+        if any(v.keys() != first.keys() for v in values):
+            raise ValueError("all frames must have the same diagram structure")
+        return {k: _tallest([v[k] for v in values]) for k in first}
+    if any(len(v) != len(first) for v in values):
+        raise ValueError("all frames must have the same number of other-methods lanes")
+    return type(first)(_tallest(list(items)) for items in zip(*values))
+
+
+def _widest(widths: list[Widths]) -> Widths:
+    return Widths(
+        w_main_left=max(w.w_main_left for w in widths),
+        w_main_right=max(w.w_main_right for w in widths),
+        w_others=[
+            (max(lane[0] for lane in lanes), max(lane[1] for lane in lanes))
+            for lanes in zip(*(w.w_others for w in widths))
+        ],
+        w_included=max(w.w_included for w in widths),
+    )
+
+
+# -------------------------
+# Animation
+# -------------------------
+
+
+class PrismaAnimation:
+    """
+    A sequence of diagrams drawn on one figure. All snapshots must have the
+    same structure (new or updated review, same other-methods lanes); the
+    style of the first one is used.
+    """
+
+    def __init__(
+        self,
+        snapshots: Sequence[Snapshot],
+        *,
+        labels: Optional[Sequence[str]] = None,
+        figsize: tuple[float, float] = (14, 10),
+        style: Optional[PrismaStyle] = None,
+    ):
+        if not snapshots:
+            raise ValueError("no snapshots to animate")
+        if labels is not None and len(labels) != len(snapshots):
+            raise ValueError("labels must have one entry per snapshot")
+        diagrams = [as_diagram(s, style=style) for s in snapshots]
+        if any(d.is_updated != diagrams[0].is_updated for d in diagrams):
+            raise ValueError("all frames must be new reviews or all updated reviews")
+        self.labels = list(labels) if labels is not None else None
+
+        with stage("layout"):
+            texts = [d._build_text_blocks() for d in diagrams]
+            template: TextBlocks = _tallest(texts)
+            widths = _widest([d._compute_widths(t) for d, t in zip(diagrams, texts)])
+            layout = diagrams[0]._compute_layout(widths)
+            # the box texts of each frame, in the order the boxes are drawn
+            self._frames: list[list[str]] = []
+            for diagram, frame_texts in zip(diagrams, texts):
+                recorder = _TextRecorder()
+                diagram._draw(recorder, layout, widths, frame_texts)
+                self._frames.append(recorder.texts)
+
+        with stage("draw"):
+            style = diagrams[0].style
+            self.style = style
+            self.figure = Figure(figsize=figure_size(figsize, layout.xlim))
+            # the axes fill the figure: every frame has the same extent
+            ax = self.figure.add_axes((0.0, 0.0, 1.0, 1.0))
+            self.renderer = MatplotlibRenderer(
+                figsize=figsize, style=style, xlim=layout.xlim, ax=ax
+            )
+            diagrams[0]._draw(self.renderer, layout, widths, template)
+            if len(self.renderer.box_texts) != len(self._frames[0]):
+                raise ValueError("all frames must have the same diagram structure")
+            self._label = None
+            if self.labels is not None:
+                self._label = ax.text(
+                    0.1, style.ylim[1] - 0.15, "", ha="left", va="top", fontsize=11
+                )
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def draw_frame(self, index: int) -> Figure:
+        """Show snapshot `index` on the (shared) figure."""
+        for artist, text in zip(self.renderer.box_texts, self._frames[index]):
+            artist.set_text(text)
+        if self._label is not None and self.labels is not None:
+            self._label.set_text(self.labels[index])
+        return self.figure
+
+    def save(
+        self,
+        filename: str | Path,
+        *,
+        fps: float = 1.0,
+        dpi: Optional[int] = None,
+        output: Optional[OutputOptions] = None,
+    ) -> Path:
+        """
+        Write all frames to an animated GIF or MP4 (requires ffmpeg), or to a
+        PDF with one page per frame. `dpi` defaults to 100 for animations and
+        to `output.dpi` for PDF.
+        """
+        from matplotlib import animation  # pylint: disable=import-outside-toplevel
+
+        path = Path(filename)
+        fmt = path.suffix.lower().lstrip(".")
+        output = output or OutputOptions()
+
+        if fmt == "pdf":
+            # pylint: disable-next=import-outside-toplevel
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            with stage("save"), PdfPages(path, metadata=pdf_metadata(output)) as pdf:
+                for index in range(len(self)):
+                    pdf.savefig(self.draw_frame(index), dpi=dpi or output.dpi)
+            return path
+
+        if fmt == "gif":
+            writer: Any = animation.PillowWriter(fps=fps)
+        elif fmt == "mp4":
+            if not animation.FFMpegWriter.isAvailable():
+                raise RuntimeError("MP4 output requires ffmpeg on the PATH")
+            writer = animation.FFMpegWriter(fps=fps)
+        else:
+            raise ValueError(f"unsupported animation format: {fmt!r} (use gif, mp4 or pdf)")
+
+        with stage("save"), writer.saving(self.figure, str(path), dpi or 100):
+            for index in range(len(self)):
+                self.draw_frame(index)
+                writer.grab_frame()
+        return path
+
+
+def animate_prisma(
+    snapshots: Sequence[Snapshot],
+    filename: str | Path,
+    *,
+    labels: Optional[Sequence[str]] = None,
+    fps: float = 1.0,
+    dpi: Optional[int] = None,
+    figsize: tuple[float, float] = (14, 10),
+    style: Optional[PrismaStyle] = None,
+    output: Optional[OutputOptions] = None,
+) -> Path:
+    """Write PRISMA inputs (one per frame) to a GIF, MP4 or multi-page PDF."""
+    return PrismaAnimation(snapshots, labels=labels, figsize=figsize, style=style).save(
+        filename, fps=fps, dpi=dpi, output=output
+    )
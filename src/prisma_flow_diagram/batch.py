@@ -0,0 +1,469 @@
+"""Batch validation and rendering of PRISMA inputs (spec files or CoLRev records files)."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+from xml.etree import ElementTree as ET
+
+from typing_extensions import Literal
+
+from .instrument import instrument
+from .loader import OtherMethodsPrefixes, load_status_from_records
+from .validation import DiagramInputs, ValidationIssue, validate_diagram
+
+# NOTE: importing this module does not import matplotlib: validation workers
+# start fast, and rendering workers import it once (see `warm_render_worker`).
+
+FailOn = Literal["error", "warning", "never"]
+
+RECORDS_SUFFIXES = {".bib"}
+
+INPUT_KEYS = {f.name for f in fields(DiagramInputs)}
+
+
+# -------------------------
+# Loading inputs
+# -------------------------
+
+
+def _read_structured(path: Path) -> Any:
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    if suffix in {".yaml", ".yml"}:
+        try:
+            import yaml  # type: ignore
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise ValueError(f"Reading {path.name} requires PyYAML") from exc
+        return yaml.safe_load(path.read_text(encoding="utf-8"))
+    raise ValueError(f"Unsupported input type: {path.name}")
+
+
+def load_spec(path: Path | str) -> Mapping[str, Any]:
+    """
+    Read diagram inputs from a JSON/YAML spec (the keyword arguments of
+    `Prisma2020Diagram`) or derive them from a CoLRev records file.
+    """
+    path = Path(path)
+
+    if path.suffix.lower() in RECORDS_SUFFIXES:
+        if not path.is_file():
+            # CoLRev loads a missing file as an empty one
+            raise FileNotFoundError(f"Records file not found: {path}")
+        return asdict(load_status_from_records(path))
+
+    spec = _read_structured(path)
+
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"{path.name}: expected a mapping of diagram inputs")
+    unknown = sorted(set(spec) - INPUT_KEYS)
+    if unknown:
+        raise ValueError(f"{path.name}: unknown keys {', '.join(unknown)}")
+    return spec
+
+
+# -------------------------
+# Validation
+# -------------------------
+
+
+@dataclass(frozen=True)
+class InputReport:
+    input: str
+    issues: tuple[ValidationIssue, ...] = ()
+    error: Optional[str] = None  # input could not be read
+    seconds: float = 0.0
+
+    def count(self, severity: str) -> int:
+        return sum(1 for i in self.issues if i.severity == severity)
+
+    def failed(self, fail_on: FailOn = "error") -> bool:
+        if self.error is not None:
+            return True
+        if fail_on == "never":
+            return False
+        severities = {"error"} if fail_on == "error" else {"error", "warning"}
+        return any(i.severity in severities for i in self.issues)
+
+
+def validate_file(path: Path | str) -> InputReport:
+    t0 = time.perf_counter()
+    try:
+        spec = load_spec(path)
+        issues = validate_diagram(DiagramInputs(**spec))
+    except Exception as exc:  # pylint: disable=broad-except
+        return InputReport(
+            input=str(path),
+            error=f"{type(exc).__name__}: {exc}",
+            seconds=time.perf_counter() - t0,
+        )
+    return InputReport(
+        input=str(path),
+        issues=tuple(issues),
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def _is_records_file(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in RECORDS_SUFFIXES
+
+
+def _preload_records_loader() -> None:
+    # CoLRev takes long to import: do it once in the parent (inherited by forked
+    # workers) or once per worker (spawn), not once per records file
+    import colrev.loader.load_utils  # noqa: F401  pylint: disable=unused-import
+
+
+def validate_files(
+    paths: Sequence[Path | str], *, jobs: Optional[int] = None
+) -> list[InputReport]:
+    """
+    Validate many inputs, in input order, using `jobs` worker processes.
+
+    Spec files take microseconds, so by default only records files (which are
+    parsed) are spread over processes: one per records file, up to the CPU
+    count. With one job everything runs in-process.
+    """
+    n_records = sum(1 for p in paths if _is_records_file(p))
+    if jobs is None:
+        jobs = min(os.cpu_count() or 1, n_records)
+    jobs = min(jobs, len(paths))
+    if jobs <= 1:
+        return [validate_file(p) for p in paths]
+
+    initializer = None
+    if n_records:
+        _preload_records_loader()
+        initializer = _preload_records_loader
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+        return list(pool.map(validate_file, paths, chunksize=chunksize))
+
+
+# -------------------------
+# Rendering
+# -------------------------
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    records: str
+    outputs: tuple[str, ...]
+    prior_reviews: Optional[list[str]] = None
+    other_methods: Optional[OtherMethodsPrefixes] = None
+    origin_field: str = "colrev_origin"
+
+
+_JOB_KEYS = {f.name for f in fields(RenderJob)} | {"output"}
+
+
+def job_name(records: Path) -> str:
+    """Display name of a records file: <repo>/data/records.bib -> <repo>."""
+    if records.parent.name == "data" and records.parent.parent.name:
+        return records.parent.parent.name
+    return records.stem
+
+
+def default_outputs(
+    records: Path | str, formats: Sequence[str], output_dir: Optional[Path | str] = None
+) -> tuple[str, ...]:
+    """`<output_dir>/<repo>.<fmt>`, or `prisma.<fmt>` next to the records file."""
+    records = Path(records)
+    if output_dir is None:
+        return tuple(str(records.parent / f"prisma.{fmt}") for fmt in formats)
+    name = job_name(records)
+    return tuple(str(Path(output_dir) / f"{name}.{fmt}") for fmt in formats)
+
+
+def load_manifest(path: Path | str) -> list[RenderJob]:
+    """
+    Read render jobs from a JSON/YAML manifest: a list of jobs, or a mapping
+    with "jobs" and shared "defaults". A job has "records", "output" or
+    "outputs", and optionally "prior_reviews", "other_methods" and
+    "origin_field". Relative paths are resolved against the manifest's folder.
+    """
+    path = Path(path)
+    data = _read_structured(path)
+    defaults: Mapping[str, Any] = {}
+    if isinstance(data, Mapping):
+        defaults = data.get("defaults") or {}
+        data = data.get("jobs")
+    if not isinstance(data, list):
+        raise ValueError(f"{path.name}: expected a list of jobs")
+
+    base = path.parent
+    jobs = []
+    for idx, entry in enumerate(data):
+        if not isinstance(entry, Mapping):
+            raise ValueError(f"{path.name}: job {idx} is not a mapping")
+        spec = {**defaults, **entry}
+        unknown = sorted(set(spec) - _JOB_KEYS)
+        if unknown:
+            raise ValueError(f"{path.name}: job {idx}: unknown keys {', '.join(unknown)}")
+        if "records" not in spec:
+            raise ValueError(f"{path.name}: job {idx}: missing records")
+        outputs = spec.pop("outputs", None) or spec.pop("output", None)
+        spec.pop("output", None)
+        if not outputs:
+            raise ValueError(f"{path.name}: job {idx}: missing output(s)")
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        spec["records"] = str(base / spec["records"])
+        spec["outputs"] = tuple(str(base / o) for o in outputs)
+        jobs.append(RenderJob(**spec))
+    return jobs
+
+
+@dataclass(frozen=True)
+class RenderReport:
+    records: str
+    outputs: tuple[str, ...]
+    written: tuple[str, ...] = ()  # outputs whose content changed
+    issues: tuple[ValidationIssue, ...] = ()
+    error: Optional[str] = None
+    seconds: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)  # wall seconds per stage
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "failed"
+        return "written" if self.written else "unchanged"
+
+
+def render_job(job: RenderJob) -> RenderReport:
+    """Count, validate and render one records file (never raises)."""
+    # imported here: rendering pulls in matplotlib
+    from . import save_prisma
+
+    t0 = time.perf_counter()
+    try:
+        if not Path(job.records).is_file():
+            # CoLRev loads a missing file as an empty one (an empty diagram)
+            raise FileNotFoundError(f"Records file not found: {job.records}")
+        with instrument() as inst:
+            params = load_status_from_records(
+                job.records,
+                prior_reviews=job.prior_reviews,
+                other_methods=job.other_methods,
+                origin_field=job.origin_field,
+            )
+            issues = validate_diagram(DiagramInputs(**asdict(params)))
+            written = save_prisma(params, job.outputs, validation="off")
+    except Exception as exc:  # pylint: disable=broad-except
+        return RenderReport(
+            records=job.records,
+            outputs=job.outputs,
+            error=f"{type(exc).__name__}: {exc}",
+            seconds=time.perf_counter() - t0,
+        )
+    return RenderReport(
+        records=job.records,
+        outputs=job.outputs,
+        written=tuple(str(p) for p in written),
+        issues=tuple(issues),
+        seconds=time.perf_counter() - t0,
+        stages={name: s["wall"] for name, s in inst.summary().items()},
+    )
+
+
+def warm_render_worker() -> None:
+    """Initializer of rendering worker processes."""
+    # Import CoLRev and matplotlib once per worker and render a tiny figure so
+    # that the font cache and the Agg backend are ready before the first job.
+    import matplotlib  # pylint: disable=import-outside-toplevel
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+
+    from . import prisma  # noqa: F401  pylint: disable=unused-import,import-outside-toplevel
+
+    _preload_records_loader()
+    fig = plt.figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, "warm-up")
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def render_jobs(
+    jobs: Sequence[RenderJob],
+    *,
+    workers: Optional[int] = None,
+    on_report: Optional[Callable[[RenderReport], None]] = None,
+) -> list[RenderReport]:
+    """
+    Render many records files, in input order, over a pool of warm worker
+    processes (default: one per CPU). `on_report` is called as each job
+    finishes (in completion order), e.g. to show progress.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        reports = []
+        for job in jobs:
+            reports.append(render_job(job))
+            if on_report is not None:
+                on_report(reports[-1])
+        return reports
+
+    results: list[Optional[RenderReport]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_render_worker) as pool:
+        futures = {pool.submit(render_job, job): idx for idx, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            report = future.result()
+            results[futures[future]] = report
+            if on_report is not None:
+                on_report(report)
+    return [r for r in results if r is not None]
+
+
+def render_report_json(reports: Sequence[RenderReport]) -> str:
+    payload = {
+        "summary": {
+            "jobs": len(reports),
+            "written": sum(1 for r in reports if r.status == "written"),
+            "unchanged": sum(1 for r in reports if r.status == "unchanged"),
+            "failed": sum(1 for r in reports if r.status == "failed"),
+            "seconds": round(sum(r.seconds for r in reports), 6),
+        },
+        "jobs": [
+            {
+                "records": r.records,
+                "status": r.status,
+                "outputs": list(r.outputs),
+                "written": list(r.written),
+                "error": r.error,
+                "issues": [asdict(i) for i in r.issues],
+                "seconds": round(r.seconds, 6),
+                "stages": {k: round(v, 6) for k, v in r.stages.items()},
+            }
+            for r in reports
+        ],
+    }
+    return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+
+
+def render_report_line(report: RenderReport) -> str:
+    line = f"{report.status:<9} {report.seconds:7.2f}s  {report.records}"
+    if report.error is not None:
+        return f"{line}\n    {report.error}"
+    return line + "".join(f"\n    {issue_line(i)}" for i in report.issues)
+
+
+# -------------------------
+# Reports
+# -------------------------
+
+
+def _summary(reports: Sequence[InputReport], fail_on: FailOn) -> dict[str, Any]:
+    return {
+        "inputs": len(reports),
+        "failed": sum(1 for r in reports if r.failed(fail_on)),
+        "unreadable": sum(1 for r in reports if r.error is not None),
+        "errors": sum(r.count("error") for r in reports),
+        "warnings": sum(r.count("warning") for r in reports),
+        "fail_on": fail_on,
+    }
+
+
+def report_json(reports: Sequence[InputReport], *, fail_on: FailOn = "error") -> str:
+    payload = {
+        "summary": _summary(reports, fail_on),
+        "inputs": [
+            {
+                "input": r.input,
+                "failed": r.failed(fail_on),
+                "error": r.error,
+                "issues": [asdict(i) for i in r.issues],
+                "seconds": round(r.seconds, 6),
+            }
+            for r in reports
+        ],
+    }
+    return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+
+
+def issue_line(issue: ValidationIssue) -> str:
+    """One-line form of an issue: SEVERITY code [path]: message."""
+    where = f" [{issue.path}]" if issue.path else ""
+    return f"{issue.severity.upper()} {issue.code}{where}: {issue.message}"
+
+
+def report_junit(reports: Sequence[InputReport], *, fail_on: FailOn = "error") -> str:
+    """
+    One testcase per input: failing issues become a <failure>, unreadable
+    inputs an <error>, and all issues are listed in <system-out>.
+    """
+    summary = _summary(reports, fail_on)
+    suite = ET.Element(
+        "testsuite",
+        name="prisma-validation",
+        tests=str(summary["inputs"]),
+        failures=str(summary["failed"] - summary["unreadable"]),
+        errors=str(summary["unreadable"]),
+        time=f"{sum(r.seconds for r in reports):.6f}",
+    )
+    for r in reports:
+        case = ET.SubElement(
+            suite,
+            "testcase",
+            classname="prisma_flow_diagram.validation",
+            name=r.input,
+            time=f"{r.seconds:.6f}",
+        )
+        if r.error is not None:
+            ET.SubElement(case, "error", type="input", message=r.error)
+        elif r.failed(fail_on):
+            failing = [
+                i
+                for i in r.issues
+                if fail_on == "warning" or i.severity == "error"
+            ]
+            failure = ET.SubElement(
+                case,
+                "failure",
+                type=failing[0].code,
+                message=f"{len(failing)} validation issue(s)",
+            )
+            failure.text = "\n".join(issue_line(i) for i in failing)
+        if r.issues:
+            ET.SubElement(case, "system-out").text = "\n".join(
+                issue_line(i) for i in r.issues
+            )
+
+    suites = ET.Element(
+        "testsuites",
+        name="prisma-validation",
+        tests=suite.get("tests", "0"),
+        failures=suite.get("failures", "0"),
+        errors=suite.get("errors", "0"),
+        time=suite.get("time", "0"),
+    )
+    suites.append(suite)
+    return ET.tostring(suites, encoding="unicode", xml_declaration=True) + "\n"
+
+
+def report_text(reports: Sequence[InputReport], *, fail_on: FailOn = "error") -> str:
+    lines = []
+    for r in reports:
+        status = "FAIL" if r.failed(fail_on) else "ok"
+        lines.append(f"{status} {r.input}")
+        if r.error is not None:
+            lines.append(f"    {r.error}")
+        lines.extend(f"    {issue_line(i)}" for i in r.issues)
+    s = _summary(reports, fail_on)
+    lines.append(
+        f"{s['inputs']} input(s), {s['failed']} failed, "
+        f"{s['errors']} error(s), {s['warnings']} warning(s)"
+    )
+    return "\n".join(lines) + "\n"
+
+
+REPORTERS = {"text": report_text, "json": report_json, "junit": report_junit}
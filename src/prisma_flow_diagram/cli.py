@@ -1,44 +1,651 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
+from dataclasses import asdict
 from pathlib import Path
 
-from py_prisma import plot_prisma_from_records
+COMMANDS = ("render", "validate", "batch", "daemon", "serve", "history", "grid", "report")
 
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
-        prog="prisma-from-records",
-        description="Generate a PRISMA-style flow diagram from a CoLRev records.bib file.",
+        prog="prisma-flow-diagram",
+        description="Generate and validate PRISMA 2020 flow diagrams.",
     )
-    p.add_argument(
+    sub = p.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser(
+        "render",
+        help="Generate a PRISMA-style flow diagram from a CoLRev records.bib file.",
+    )
+    render.add_argument(
         "records",
         type=Path,
         help="Path to CoLRev records file (e.g., data/records.bib).",
     )
-    p.add_argument(
+    render.add_argument(
         "output",
         type=Path,
         help="Output path (png/svg/pdf/... inferred from extension).",
     )
-    p.add_argument(
+    # --watch keeps rendering in a loop: it cannot also block in a window
+    show_or_watch = render.add_mutually_exclusive_group()
+    show_or_watch.add_argument(
         "--show",
         action="store_true",
         help="Show the figure in a window (in addition to saving).",
     )
+    render.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print wall/CPU time and peak memory per stage (JSON lines on stderr).",
+    )
+    render.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Render in this process even if a rendering daemon is running.",
+    )
+    render.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Socket of the rendering daemon (default: per-user socket).",
+    )
+    show_or_watch.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-render when the records file changes the counts.",
+    )
+    render.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="With --watch: seconds without writes before re-rendering (default: 0.2).",
+    )
+    render.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch: poll file times instead of using inotify.",
+    )
+
+    validate = sub.add_parser(
+        "validate",
+        help="Validate many inputs (JSON/YAML specs or records files) without plotting.",
+    )
+    validate.add_argument(
+        "inputs",
+        type=Path,
+        nargs="+",
+        help="Spec files (.json/.yaml with Prisma2020Diagram inputs) or records files (.bib).",
+    )
+    validate.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one per records file, up to the CPU count).",
+    )
+    validate.add_argument(
+        "--format",
+        choices=["text", "json", "junit"],
+        default="text",
+        help="Report format (default: text).",
+    )
+    validate.add_argument(
+        "-o",
+        "--report",
+        type=Path,
+        default=None,
+        help="Write the report to this file instead of stdout.",
+    )
+    validate.add_argument(
+        "--fail-on",
+        choices=["error", "warning", "never"],
+        default="error",
+        help="Exit with status 1 if an input has issues of this severity (default: error).",
+    )
+
+    batch = sub.add_parser(
+        "batch",
+        help="Render diagrams for many records files over a pool of warm worker processes.",
+    )
+    batch.add_argument(
+        "records",
+        type=Path,
+        nargs="*",
+        help="Records files (e.g., */data/records.bib).",
+    )
+    batch.add_argument(
+        "-m",
+        "--manifest",
+        type=Path,
+        default=None,
+        help="JSON/YAML manifest of jobs (records, outputs, prefix settings).",
+    )
+    batch.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Write <repo>.<format> here (default: prisma.<format> next to each records file).",
+    )
+    batch.add_argument(
+        "--formats",
+        nargs="+",
+        default=["png"],
+        help="Output formats for records given on the command line (default: png).",
+    )
+    batch.add_argument(
+        "--prior-reviews",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of prior reviews (for records given on the command line).",
+    )
+    batch.add_argument(
+        "--other-methods",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of other methods (for records given on the command line).",
+    )
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count).",
+    )
+    batch.add_argument(
+        "-o",
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON report (per-job status, issues and stage timings).",
+    )
+    batch.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running in one process and re-render jobs whose counts change.",
+    )
+    batch.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="With --watch: seconds without writes before re-rendering (default: 0.2).",
+    )
+    batch.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch: poll file times instead of using inotify.",
+    )
+
+    daemon = sub.add_parser(
+        "daemon",
+        help="Run a rendering daemon that keeps CoLRev parsing and matplotlib warm.",
+    )
+    daemon.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Unix socket path (default: $PRISMA_FLOW_DIAGRAM_SOCKET or a per-user socket).",
+    )
+    daemon.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Exit after this many seconds without requests.",
+    )
+    action = daemon.add_mutually_exclusive_group()
+    action.add_argument("--stop", action="store_true", help="Stop a running daemon.")
+    action.add_argument("--status", action="store_true", help="Check whether a daemon is running.")
+
+    serve = sub.add_parser(
+        "serve",
+        help="Serve diagrams over HTTP (POST /render, /validate; GET /metrics).",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    serve.add_argument("--port", type=int, default=8000, help="Port (default: 8000).")
+    serve.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=2,
+        help="Rendering worker processes (default: 2).",
+    )
+    serve.add_argument(
+        "--max-pending",
+        type=int,
+        default=16,
+        help="Renders queued or running before requests are rejected with 503 (default: 16).",
+    )
+    serve.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Seconds per render before answering 504 (default: 30).",
+    )
+    serve.add_argument(
+        "--cache-entries",
+        type=int,
+        default=256,
+        help="Rendered diagrams kept in the LRU cache (default: 256).",
+    )
+
+    history = sub.add_parser(
+        "history",
+        help="Table of PRISMA counts at each commit that changed a records file.",
+    )
+    history.add_argument(
+        "records",
+        type=Path,
+        nargs="?",
+        default=Path("data/records.bib"),
+        help="Records file in a git repository (default: data/records.bib).",
+    )
+    history.add_argument("--rev", default="HEAD", help="Walk the history of this revision.")
+    history.add_argument(
+        "--all-parents",
+        action="store_true",
+        help="Include commits of merged branches (default: first parents only).",
+    )
+    history.add_argument(
+        "--max-count",
+        type=int,
+        default=None,
+        help="Only the most recent N commits that changed the file.",
+    )
+    history.add_argument(
+        "--prior-reviews",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of prior reviews.",
+    )
+    history.add_argument(
+        "--other-methods",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of other methods.",
+    )
+    history.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default="csv",
+        help="Table format (default: csv).",
+    )
+    history.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the table here (default: stdout, unless --animate is given).",
+    )
+    history.add_argument(
+        "--animate",
+        type=Path,
+        default=None,
+        help="Also write the diagram at each commit as an animation (.gif, .mp4) or .pdf pages.",
+    )
+    history.add_argument(
+        "--fps",
+        type=float,
+        default=1.0,
+        help="With --animate: frames per second (default: 1).",
+    )
+
+    grid = sub.add_parser(
+        "grid",
+        help="Draw the diagrams of many records files side by side in one figure.",
+    )
+    grid.add_argument(
+        "records",
+        type=Path,
+        nargs="+",
+        help="Records files (e.g., */data/records.bib).",
+    )
+    grid.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        nargs="+",
+        required=True,
+        help="Output file(s); the format is inferred from the extension (png, pdf, svg).",
+    )
+    grid.add_argument(
+        "--ncols",
+        type=int,
+        default=None,
+        help="Diagrams per row (default: a roughly square grid).",
+    )
+    grid.add_argument(
+        "--prior-reviews",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of prior reviews.",
+    )
+    grid.add_argument(
+        "--other-methods",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of other methods.",
+    )
+
+    report = sub.add_parser(
+        "report",
+        help="Write a PDF with one page per records file (diagram, issues and counts).",
+    )
+    report.add_argument(
+        "records",
+        type=Path,
+        nargs="+",
+        help="Records files (e.g., */data/records.bib).",
+    )
+    report.add_argument("-o", "--output", type=Path, required=True, help="PDF file.")
+    report.add_argument(
+        "--no-issues",
+        action="store_true",
+        help="Do not list the validation issues next to each diagram.",
+    )
+    report.add_argument(
+        "--no-counts",
+        action="store_true",
+        help="Do not list the counts next to each diagram.",
+    )
+    report.add_argument(
+        "--prior-reviews",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of prior reviews.",
+    )
+    report.add_argument(
+        "--other-methods",
+        nargs="+",
+        default=None,
+        help="Origin prefixes of other methods.",
+    )
     return p
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = build_parser().parse_args(argv)
+def _render_via_daemon(args: argparse.Namespace) -> bool:
+    """Render with a running daemon; False if none is available."""
+    from .daemon import DaemonUnavailable, request
+    from .validation import ValidationIssue, handle_validation
+
+    try:
+        response = request(
+            {
+                "op": "render",
+                "records": str(args.records.resolve()),
+                "outputs": [str(args.output.resolve())],
+            },
+            socket_path=args.socket,
+        )
+    except DaemonUnavailable:
+        return False
+    except RuntimeError as exc:
+        raise SystemExit(f"render (daemon): {exc}") from exc
+    handle_validation([ValidationIssue(**i) for i in response["issues"]], mode="warn")
+    return True
+
+
+def _daemon(args: argparse.Namespace) -> int:
+    from .daemon import DaemonUnavailable, default_socket_path, request, serve
+
+    path = args.socket or default_socket_path()
+    if args.stop or args.status:
+        try:
+            response = request({"op": "shutdown" if args.stop else "ping"}, socket_path=path)
+        except DaemonUnavailable:
+            print(f"no daemon listening on {path}")
+            return 1
+        verb = "stopped" if args.stop else "running"
+        print(f"daemon {verb} (pid {response['pid']}, {response['requests']} request(s)) on {path}")
+        return 0
+
+    try:
+        serve(
+            path,
+            idle_timeout=args.idle_timeout,
+            on_ready=lambda p: print(f"listening on {p}", flush=True),
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    import logging
+
+    from .server import ServerConfig, serve
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        serve(
+            ServerConfig(
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                max_pending=args.max_pending,
+                timeout=args.timeout,
+                cache_entries=args.cache_entries,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _watch(args: argparse.Namespace, jobs: list) -> int:
+    from .watch import update_line, watch
+
+    try:
+        watch(
+            jobs,
+            debounce=args.debounce,
+            polling=args.poll,
+            on_update=lambda u: print(update_line(u), flush=True),
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _render(args: argparse.Namespace) -> int:
+    # imported here: rendering pulls in matplotlib (and CoLRev)
+    from . import plot_prisma_from_records
+
+    from .instrument import instrument
 
     if not args.records.exists():
         raise FileNotFoundError(f"Records file not found: {args.records}")
 
-    plot_prisma_from_records(output_path=args.output, show=args.show)
+    local_only = args.no_daemon or args.show or args.timings or args.watch
+    if not local_only and _render_via_daemon(args):
+        return 0
 
+    if args.watch:
+        from .batch import RenderJob
+
+        return _watch(args, [RenderJob(records=str(args.records), outputs=(str(args.output),))])
+
+    callbacks = []
+    if args.timings:
+        callbacks.append(
+            lambda m: print(json.dumps(asdict(m)), file=sys.stderr, flush=True)
+        )
+    with instrument(callbacks=callbacks, trace_memory=args.timings):
+        plot_prisma_from_records(
+            records_path=args.records, output_path=args.output, show=args.show
+        )
     return 0
 
 
+def _validate(args: argparse.Namespace) -> int:
+    from .batch import REPORTERS, validate_files
+
+    reports = validate_files(args.inputs, jobs=args.jobs)
+    text = REPORTERS[args.format](reports, fail_on=args.fail_on)
+    if args.report is None:
+        sys.stdout.write(text)
+    else:
+        args.report.write_text(text, encoding="utf-8")
+
+    return 1 if any(r.failed(args.fail_on) for r in reports) else 0
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from .batch import RenderJob, default_outputs, load_manifest
+    from .batch import render_jobs, render_report_json, render_report_line
+
+    try:
+        jobs = load_manifest(args.manifest) if args.manifest is not None else []
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"batch: {exc}") from exc
+    jobs.extend(
+        RenderJob(
+            records=str(records),
+            outputs=default_outputs(records, args.formats, args.output_dir),
+            prior_reviews=args.prior_reviews,
+            other_methods=args.other_methods,
+        )
+        for records in args.records
+    )
+    if not jobs:
+        raise SystemExit("batch: no records files or manifest given")
+    if args.output_dir is not None:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+    if args.watch:
+        return _watch(args, jobs)
+
+    reports = render_jobs(
+        jobs,
+        workers=args.jobs,
+        on_report=lambda r: print(render_report_line(r), flush=True),
+    )
+    failed = sum(1 for r in reports if r.status == "failed")
+    written = sum(1 for r in reports if r.status == "written")
+    print(
+        f"{len(reports)} job(s), {written} written, "
+        f"{len(reports) - written - failed} unchanged, {failed} failed"
+    )
+    if args.report is not None:
+        args.report.write_text(render_report_json(reports), encoding="utf-8")
+    return 1 if failed else 0
+
+
+def _history(args: argparse.Namespace) -> int:
+    from .history import iter_history, write_history
+
+    if not args.records.exists():
+        raise FileNotFoundError(f"Records file not found: {args.records}")
+    points = iter_history(
+        args.records,
+        rev=args.rev,
+        first_parent=not args.all_parents,
+        max_count=args.max_count,
+        prior_reviews=args.prior_reviews,
+        other_methods=args.other_methods,
+    )
+    try:
+        if args.animate is not None:
+            points = list(points)
+        if args.output is not None:
+            with args.output.open("w", encoding="utf-8", newline="") as file:
+                write_history(points, file, fmt=args.format)
+        elif args.animate is None:
+            write_history(points, sys.stdout, fmt=args.format)
+    except RuntimeError as exc:  # git errors
+        raise SystemExit(f"history: {exc}") from exc
+
+    if args.animate is not None:
+        if not points:
+            raise SystemExit(f"history: no commits changed {args.records}")
+        import time
+
+        from .animate import animate_prisma
+
+        labels = [
+            f"{p.revision.commit[:8]}  "
+            + time.strftime("%Y-%m-%d", time.gmtime(p.revision.timestamp))
+            for p in points
+        ]
+        try:
+            animate_prisma([p.params for p in points], args.animate, labels=labels, fps=args.fps)
+        except (RuntimeError, ValueError) as exc:
+            raise SystemExit(f"history: {exc}") from exc
+    return 0
+
+
+def _load_all(args: argparse.Namespace) -> list:
+    """PRISMA inputs of each records file given on the command line."""
+    from .loader import status_from_records
+    from .reconcile import RecordsCache
+
+    params = []
+    for records in args.records:
+        if not records.exists():
+            raise FileNotFoundError(f"Records file not found: {records}")
+        params.append(
+            status_from_records(
+                RecordsCache().load(records),
+                prior_reviews=args.prior_reviews,
+                other_methods=args.other_methods,
+            )
+        )
+    return params
+
+
+def _grid(args: argparse.Namespace) -> int:
+    from .batch import job_name
+    from .grid import save_grid
+
+    save_grid(
+        _load_all(args),
+        args.output,
+        titles=[job_name(r) for r in args.records],
+        ncols=args.ncols,
+    )
+    return 0
+
+
+def _report(args: argparse.Namespace) -> int:
+    from .batch import job_name
+    from .report import write_pdf_report
+
+    if args.output.suffix.lower() != ".pdf":
+        raise SystemExit("report: the output must be a .pdf file")
+    write_pdf_report(
+        _load_all(args),
+        args.output,
+        titles=[job_name(r) for r in args.records],
+        issues=not args.no_issues,
+        counts=not args.no_counts,
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `prisma-flow-diagram records.bib out.png` (without a command) renders
+    if argv and argv[0] not in COMMANDS and not argv[0].startswith("-"):
+        argv.insert(0, "render")
+
+    args = build_parser().parse_args(argv)
+    if args.command == "validate":
+        return _validate(args)
+    if args.command == "batch":
+        return _batch(args)
+    if args.command == "daemon":
+        return _daemon(args)
+    if args.command == "serve":
+        return _serve(args)
+    if args.command == "history":
+        return _history(args)
+    if args.command == "grid":
+        return _grid(args)
+    if args.command == "report":
+        return _report(args)
+    return _render(args)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
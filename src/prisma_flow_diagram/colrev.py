@@ -2,8 +2,14 @@
 """Creation of a PRISMA chart as part of the data operations"""
 from __future__ import annotations
 
+import csv
+import hashlib
+import io
+import json
 import logging
+import os
 import typing
+from dataclasses import asdict
 from pathlib import Path
 
 from pydantic import BaseModel
@@ -13,7 +19,15 @@ import colrev.env.docker_manager
 import colrev.env.utils
 import colrev.package_manager.package_base_classes as base_classes
 import colrev.package_manager.package_settings
-from prisma_flow_diagram import plot_prisma_from_records
+from prisma_flow_diagram import __version__
+from prisma_flow_diagram import counts_table
+from prisma_flow_diagram import OutputOptions
+from prisma_flow_diagram import save_prisma
+from prisma_flow_diagram import status_from_records
+from prisma_flow_diagram import worker
+from prisma_flow_diagram.output import write_if_changed
+from prisma_flow_diagram.prisma import PrismaStyle
+from prisma_flow_diagram.reconcile import RecordsCache
 
 if typing.TYPE_CHECKING:
     import colrev.ops.data
@@ -34,6 +48,13 @@ class PRISMA(base_classes.DataPackageBaseClass):
         diagram_path: typing.List[Path] = Field(
             default_factory=lambda: [Path("PRISMA.png")]
         )
+        # PNGs are committed to the repository: keep them small by default
+        png_palette: bool = True
+        png_compress_level: int = 9
+        # render diagrams in a background worker process (counts/CSV stay synchronous)
+        background: bool = False
+        # seconds to wait for the previous background job before giving up
+        job_timeout: float = 300.0
 
     settings_class = PRISMASettings
 
@@ -61,6 +82,14 @@ class PRISMA(base_classes.DataPackageBaseClass):
 
         output_dir = self.review_manager.paths.output
         self.csv_path = output_dir / Path("PRISMA.csv")
+        # local state lives in a private directory outside the working tree:
+        # the fingerprint of the inputs that were rendered last (see
+        # update_data) and background jobs
+        self.state_dir = self._state_dir(Path(self.review_manager.path))
+        self.fingerprint_path = self.state_dir / "fingerprint"
+        self.job_dir = self.state_dir / "job"
+        # record headers for live counts (see live_counts)
+        self._records_cache = RecordsCache()
 
         self.settings.diagram_path = [
             output_dir / path for path in self.settings.diagram_path
@@ -82,13 +111,123 @@ class PRISMA(base_classes.DataPackageBaseClass):
 
     def update_data(
         self,
-        records: dict,  # pylint: disable=unused-argument
+        records: dict,
         synthesized_record_status_matrix: dict,  # pylint: disable=unused-argument
         silent_mode: bool,
     ) -> None:
         """Update the data/prisma diagram"""
 
-        plot_prisma_from_records(output_path="colrev_new.png")
+        worker.private_dir(self.state_dir)
+
+        # a previous background job must finish before its outputs are replaced
+        if not self.wait(timeout=self.settings.job_timeout) and (
+            worker.job_status(self.job_dir) == "running"
+        ):
+            self.logger.error(
+                "PRISMA background rendering still running after %ss: diagrams not updated",
+                self.settings.job_timeout,
+            )
+            return
+
+        # The data operation already loaded the records: aggregate them in memory
+        # instead of parsing records.bib again.
+        params = status_from_records(records)
+        output = OutputOptions(
+            png_palette=self.settings.png_palette,
+            png_compress_level=self.settings.png_compress_level,
+        )
+        targets = [*self.settings.diagram_path, self.csv_path]
+
+        fingerprint = self._fingerprint(params, outputs=targets, output=output)
+        if (
+            all(path.is_file() for path in targets)
+            and self._last_fingerprint() == fingerprint
+        ):
+            self.logger.debug("PRISMA counts unchanged: skip rendering")
+            return
+
+        if write_if_changed(self.csv_path, self._counts_csv(params)):
+            self.logger.debug("Updated %s", self.csv_path)
+
+        if self.settings.background:
+            # the worker writes the fingerprint once all diagrams are rendered
+            self.fingerprint_path.unlink(missing_ok=True)
+            pid = worker.start_job(
+                self.job_dir,
+                params,
+                self.settings.diagram_path,
+                output=output,
+                fingerprint=(self.fingerprint_path, fingerprint),
+            )
+            self.logger.debug("PRISMA rendering started in background (pid %s)", pid)
+            return
+
+        # one aggregation and one layout for all diagram paths
+        written = save_prisma(params, self.settings.diagram_path, output=output)
+        for path in written:
+            self.logger.debug("Updated %s", path)
+
+        write_if_changed(self.fingerprint_path, (fingerprint + "\n").encode("utf-8"))
+
+    def wait(self, *, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait for (and reap) a background rendering job. Returns False if the
+        job failed (its error log is reported) or did not finish in time.
+        """
+        marker = worker.wait_for_job(self.job_dir, timeout=timeout)
+        if marker is None:
+            return worker.job_status(self.job_dir) == "none"
+        worker.reap_job(self.job_dir)
+        if marker.get("status") != "ok":
+            self.logger.error(
+                "PRISMA background rendering failed:\n%s", marker.get("error", "")
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _state_dir(repo: Path) -> Path:
+        """.git/prisma-flow-diagram, else a directory per project in the user cache."""
+        git_dir = repo / ".git"
+        if git_dir.is_dir():
+            return git_dir / "prisma-flow-diagram"
+        cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        repo_key = hashlib.sha256(str(repo.resolve()).encode()).hexdigest()
+        return Path(cache) / "prisma-flow-diagram" / repo_key[:16]
+
+    @staticmethod
+    def _counts_csv(params: typing.Any) -> bytes:
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(["field", "count"])
+        writer.writerows(counts_table(params))
+        return buf.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _fingerprint(
+        params: typing.Any, *, outputs: typing.List[Path], output: OutputOptions
+    ) -> str:
+        """
+        Hash of everything the diagram depends on: the aggregated counts (status
+        buckets, origin/prefix counts, exclusion reasons), the package version,
+        the style and the output settings.
+        """
+        payload = {
+            "version": __version__,
+            "style": asdict(PrismaStyle()),
+            "type": type(params).__name__,
+            "params": asdict(params),
+            "outputs": [str(p) for p in outputs],
+            "output": asdict(output),
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _last_fingerprint(self) -> str:
+        try:
+            return self.fingerprint_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return ""
 
     def update_record_status_matrix(
         self,
@@ -101,6 +240,16 @@ class PRISMA(base_classes.DataPackageBaseClass):
         for syn_id in list(synthesized_record_status_matrix.keys()):
             synthesized_record_status_matrix[syn_id][endpoint_identifier] = True
 
+    def live_counts(self) -> typing.Any:
+        """
+        PRISMA inputs from the record headers (ID, status, origin, screening
+        criteria) of records.bib, without parsing full records. The counts are
+        those of the diagram rendered by `update_data`, exclusion reasons
+        included; unchanged entries are not parsed again on later calls.
+        """
+        records = self._records_cache.load(self.review_manager.paths.records)
+        return status_from_records(records)
+
     def get_advice(
         self,
     ) -> dict:
@@ -114,10 +263,29 @@ class PRISMA(base_classes.DataPackageBaseClass):
                 for x in self.settings.diagram_path
             ]
         )
-        advice = {
-            "msg": f"{data_endpoint}"
+        msg = (
+            f"{data_endpoint}"
             + "\n    - The PRISMA diagram is created automatically "
-            + f"({path_str})",
-            "detailed_msg": "TODO",
+            + f"({path_str})"
+        )
+        detailed_msg = ""
+        try:
+            params = self.live_counts()
+        except Exception as exc:  # pylint: disable=broad-except
+            # advice must never break the status display
+            self.logger.debug("PRISMA live counts unavailable: %s", exc)
+        else:
+            rows = counts_table(params)
+            counts = dict(rows)
+            msg += (
+                "\n    - Current counts: "
+                + f"{counts.get('db_registers.records.screened', 0)} screened, "
+                + f"{counts.get('included.studies', 0)} included"
+            )
+            detailed_msg = "\n".join(f"{field}: {value}" for field, value in rows)
+
+        advice = {
+            "msg": msg,
+            "detailed_msg": detailed_msg or "TODO",
         }
         return advice
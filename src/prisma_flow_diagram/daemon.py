@@ -0,0 +1,351 @@
+"""
+Long-lived rendering daemon serving render/count requests over a Unix socket.
+
+The protocol is one JSON object per line in each direction:
+
+    {"op": "render", "records": "/abs/data/records.bib", "outputs": ["/abs/prisma.png"]}
+    {"ok": true, "written": ["/abs/prisma.png"], "issues": [], "seconds": 0.41}
+
+Operations: "ping", "counts" and "render" (with "records" and optional
+"prior_reviews", "other_methods", "origin_field"; "render" also needs
+"outputs"), and "shutdown". Paths should be absolute.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from . import __version__
+from .batch import RenderJob
+from .loader import Prisma2020New, Prisma2020Updated, counts_table, status_from_records
+from .reconcile import HEADER_FIELDS, RecordsCache
+from .validation import DiagramInputs, validate_diagram
+from .watch import WarmRenderer
+
+PROTOCOL = 1
+ENV_SOCKET = "PRISMA_FLOW_DIAGRAM_SOCKET"
+
+_REQUEST_KEYS = {"op", "records", "outputs", "prior_reviews", "other_methods", "origin_field"}
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+def _check_owner(path: Path) -> None:
+    """Refuse sockets of other users (e.g. one created first in a shared /tmp)."""
+    if not hasattr(os, "getuid"):
+        return
+    try:
+        owner = os.stat(path).st_uid
+    except FileNotFoundError:
+        return
+    if owner != os.getuid():
+        raise DaemonUnavailable(f"{path} is owned by another user")
+
+
+def default_socket_path() -> Path:
+    """$PRISMA_FLOW_DIAGRAM_SOCKET, else a per-user socket in $XDG_RUNTIME_DIR or /tmp."""
+    env = os.environ.get(ENV_SOCKET)
+    if env:
+        return Path(env)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "prisma-flow-diagram.sock"
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return Path(tempfile.gettempdir()) / f"prisma-flow-diagram-{uid}.sock"
+
+
+# -------------------------
+# Service (request handling)
+# -------------------------
+
+
+class RenderService:
+    """
+    Handles requests with warm state: parsed entries of recently used records
+    files, one matplotlib figure, and the counts last written to each output
+    (unchanged diagrams are not drawn again).
+    """
+
+    def __init__(
+        self,
+        *,
+        figsize: tuple[float, float] = (14, 10),
+        output: Any = None,
+        max_records_files: int = 64,
+    ):
+        self.max_records_files = max_records_files
+        self.renderer = WarmRenderer(figsize=figsize, output=output)
+        self._caches: "OrderedDict[tuple[str, str], RecordsCache]" = OrderedDict()
+        self._rendered: "OrderedDict[tuple[str, tuple[str, ...]], tuple[Any, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()  # matplotlib and the caches are not thread-safe
+        self.requests = 0
+        self.last_request = time.monotonic()
+
+    def warm_up(self) -> None:
+        self.renderer.warm_up()
+
+    def handle(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        self.last_request = time.monotonic()
+        self.requests += 1
+        op = request.get("op")
+        if op in {"ping", "shutdown"}:
+            return {
+                "ok": True,
+                "protocol": PROTOCOL,
+                "version": __version__,
+                "pid": os.getpid(),
+                "requests": self.requests,
+            }
+        if op not in {"counts", "render"}:
+            raise ValueError(f"unknown op: {op!r}")
+
+        unknown = sorted(set(request) - _REQUEST_KEYS)
+        if unknown:
+            raise ValueError(f"unknown keys {', '.join(unknown)}")
+        if not request.get("records"):
+            raise ValueError("missing records")
+        job = RenderJob(
+            records=str(request["records"]),
+            outputs=tuple(str(o) for o in request.get("outputs") or ()),
+            prior_reviews=request.get("prior_reviews"),
+            other_methods=request.get("other_methods"),
+            origin_field=request.get("origin_field") or "colrev_origin",
+        )
+
+        t0 = time.perf_counter()
+        with self._lock:
+            params = self._params(job)
+            if op == "counts":
+                return {
+                    "ok": True,
+                    "type": "updated" if isinstance(params, Prisma2020Updated) else "new",
+                    "params": asdict(params),
+                    "table": counts_table(params),
+                    "seconds": time.perf_counter() - t0,
+                }
+            if not job.outputs:
+                raise ValueError("missing outputs")
+            issues = validate_diagram(DiagramInputs(**asdict(params)))
+            written = self._render(job, params)
+        return {
+            "ok": True,
+            "written": written,
+            "issues": [asdict(i) for i in issues],
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def _params(self, job: RenderJob) -> Prisma2020New | Prisma2020Updated:
+        key = (str(Path(job.records).resolve()), job.origin_field)
+        cache = self._caches.pop(key, None) or RecordsCache(
+            fields={*HEADER_FIELDS, job.origin_field}
+        )
+        self._caches[key] = cache
+        while len(self._caches) > self.max_records_files:
+            self._caches.popitem(last=False)
+        return status_from_records(
+            cache.load(job.records),
+            prior_reviews=job.prior_reviews,
+            other_methods=job.other_methods,
+            origin_field=job.origin_field,
+        )
+
+    @staticmethod
+    def _stamps(outputs: tuple[str, ...]) -> tuple[Optional[tuple[int, int]], ...]:
+        stamps = []
+        for path in outputs:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamps)
+
+    def _render(self, job: RenderJob, params: Any) -> list[str]:
+        key = (job.records, job.outputs)
+        previous = self._rendered.pop(key, None)
+        if previous == (params, self._stamps(job.outputs)):
+            written: list[str] = []
+        else:
+            written = [str(p) for p in self.renderer.save(params, job.outputs)]
+        self._rendered[key] = (params, self._stamps(job.outputs))
+        while len(self._rendered) > self.max_records_files:
+            self._rendered.popitem(last=False)
+        return written
+
+
+# -------------------------
+# Server
+# -------------------------
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            op = None
+            try:
+                request = json.loads(line)
+                if not isinstance(request, Mapping):
+                    raise ValueError("expected a JSON object")
+                op = request.get("op")
+                response = self.server.service.handle(request)
+            except Exception as exc:  # pylint: disable=broad-except
+                response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if op == "shutdown":
+                self.server.stop()
+                return
+
+
+# Unix sockets are not available on Windows (`serve` raises there)
+_UnixStreamServer: Any = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+class _Server(socketserver.ThreadingMixIn, _UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: RenderService):
+        self.service = service
+        super().__init__(path, _Handler)
+
+    def stop(self) -> None:
+        # shutdown() waits for serve_forever(), so it must not run in its thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def serve(
+    socket_path: Optional[Path | str] = None,
+    *,
+    idle_timeout: Optional[float] = None,
+    figsize: tuple[float, float] = (14, 10),
+    output: Any = None,
+    on_ready: Optional[Any] = None,
+) -> None:
+    """
+    Serve requests on `socket_path` until a "shutdown" request, SIGTERM, or
+    `idle_timeout` seconds without requests. The socket is only accessible to
+    the current user.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("The daemon requires Unix domain sockets")
+    path = Path(socket_path) if socket_path is not None else default_socket_path()
+    if path.exists():
+        try:
+            _check_owner(path)
+        except DaemonUnavailable as exc:
+            raise RuntimeError(str(exc)) from exc
+        try:
+            request({"op": "ping"}, socket_path=path, timeout=1.0)
+        except DaemonUnavailable:
+            path.unlink()  # stale socket of a daemon that did not shut down cleanly
+        else:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    service = RenderService(figsize=figsize, output=output)
+    service.warm_up()
+
+    umask = os.umask(0o177)
+    try:
+        server = _Server(str(path), service)
+    finally:
+        os.umask(umask)
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: server.stop())
+
+    if idle_timeout is not None:
+
+        def watchdog() -> None:
+            while True:
+                time.sleep(min(idle_timeout, 1.0))
+                if time.monotonic() - service.last_request > idle_timeout:
+                    server.stop()
+                    return
+
+        threading.Thread(target=watchdog, daemon=True).start()
+
+    try:
+        if on_ready is not None:
+            on_ready(path)
+        server.serve_forever(poll_interval=0.2)
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# -------------------------
+# Client
+# -------------------------
+
+
+def request(
+    payload: Mapping[str, Any],
+    *,
+    socket_path: Optional[Path | str] = None,
+    timeout: Optional[float] = 60.0,
+) -> Dict[str, Any]:
+    """
+    Send one request to the daemon and return its response. Raises
+    `DaemonUnavailable` if no daemon of this version listens (or the socket
+    belongs to another user) and RuntimeError if the request failed in the
+    daemon.
+    """
+    path = Path(socket_path) if socket_path is not None else default_socket_path()
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix sockets are not available on this platform")
+    _check_owner(path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    with sock:
+        try:
+            sock.connect(str(path))
+        except OSError as exc:  # missing socket, refused, ...
+            raise DaemonUnavailable(f"No daemon listening on {path}") from exc
+        with sock.makefile("rb") as file:
+            if payload.get("op") not in {"ping", "shutdown"}:
+                # a daemon started by another version may count or render differently
+                hello = _exchange(sock, file, {"op": "ping"}, path)
+                if (hello.get("protocol"), hello.get("version")) != (PROTOCOL, __version__):
+                    raise DaemonUnavailable(
+                        f"The daemon on {path} runs version {hello.get('version')} "
+                        f"(protocol {hello.get('protocol')}); restart it"
+                    )
+            response = _exchange(sock, file, payload, path)
+
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error") or "request failed")
+    return response
+
+
+def _exchange(sock: socket.socket, file: Any, payload: Mapping[str, Any], path: Path) -> Any:
+    try:
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        line = file.readline()
+    except OSError as exc:  # timed out, daemon died (broken pipe, reset), ...
+        raise DaemonUnavailable(f"The daemon on {path} did not answer: {exc}") from exc
+    if not line:
+        raise DaemonUnavailable(f"The daemon on {path} closed the connection")
+    return json.loads(line)
@@ -0,0 +1,126 @@
+"""
+Small multiples: many diagrams side by side on one figure, e.g. to compare
+the PRISMA flows of a portfolio of reviews:
+
+    save_grid(params_per_review, ["portfolio.pdf"], titles=review_names)
+
+Every diagram keeps the size it has on its own (text sizes are in points), so
+large grids are best written as PDF/SVG or as PNG with a lower resolution.
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from matplotlib.figure import Figure
+
+from .instrument import stage
+from .output import OutputOptions, figure_bytes, write_if_changed
+from .prisma import PrismaStyle, as_diagram, figure_size
+
+# PNG resolution of grids (a grid of 50 diagrams at 300 dpi is ~30k pixels wide)
+GRID_OUTPUT = OutputOptions(dpi=100)
+
+_TITLE_HEIGHT = 0.5  # inches above each diagram
+
+
+def grid_figure(
+    diagrams: Sequence[Any],
+    *,
+    titles: Optional[Sequence[str]] = None,
+    ncols: Optional[int] = None,
+    figsize: tuple[float, float] = (14, 10),
+    style: Optional[PrismaStyle] = None,
+) -> Figure:
+    """
+    Draw the diagrams (PRISMA inputs, see `as_diagram`) row by row onto one
+    figure with `ncols` columns (default: a roughly square grid). Each cell is
+    as wide as the widest diagram.
+    """
+    if not diagrams:
+        raise ValueError("no diagrams to draw")
+    if titles is not None and len(titles) != len(diagrams):
+        raise ValueError("titles must have one entry per diagram")
+    ncols = max(1, min(ncols or math.ceil(math.sqrt(len(diagrams))), len(diagrams)))
+    nrows = math.ceil(len(diagrams) / ncols)
+
+    figure = Figure()
+    axes = []
+    with stage("draw"):
+        for i, inputs in enumerate(diagrams):
+            ax = figure.add_axes((0.0, 0.0, 1.0, 1.0))  # placed below
+            as_diagram(inputs, style=style).draw(ax, figsize=figsize)
+            if titles is not None:
+                ax.set_title(titles[i], loc="left", fontsize=12)
+            axes.append(ax)
+
+    # cells sized like the standalone diagrams (see `figure_size`)
+    widths = [figure_size(figsize, ax.get_xlim())[0] for ax in axes]
+    cell_w = max(widths)
+    cell_h = figsize[1] + (_TITLE_HEIGHT if titles is not None else 0.0)
+    fig_w, fig_h = ncols * cell_w, nrows * cell_h
+    figure.set_size_inches(fig_w, fig_h)
+    for i, (ax, width) in enumerate(zip(axes, widths)):
+        row, col = divmod(i, ncols)
+        ax.set_position(
+            (
+                col * cell_w / fig_w,
+                1.0 - (row * cell_h + cell_h) / fig_h,
+                width / fig_w,
+                figsize[1] / fig_h,
+            )
+        )
+    return figure
+
+
+def render_grid(
+    diagrams: Sequence[Any],
+    formats: Sequence[str],
+    *,
+    titles: Optional[Sequence[str]] = None,
+    ncols: Optional[int] = None,
+    figsize: tuple[float, float] = (14, 10),
+    style: Optional[PrismaStyle] = None,
+    output: Optional[OutputOptions] = None,
+) -> dict[str, bytes]:
+    """Encode the grid in each of the given formats (drawn once)."""
+    output = output or GRID_OUTPUT
+    figure = grid_figure(diagrams, titles=titles, ncols=ncols, figsize=figsize, style=style)
+    style = style or PrismaStyle()
+    result: dict[str, bytes] = {}
+    for fmt in dict.fromkeys(f.lower().lstrip(".") for f in formats):
+        with stage("save"):
+            result[fmt] = figure_bytes(figure, fmt, style=style, options=output)
+    return result
+
+
+def save_grid(
+    diagrams: Sequence[Any],
+    filenames: Sequence[str | Path],
+    *,
+    titles: Optional[Sequence[str]] = None,
+    ncols: Optional[int] = None,
+    figsize: tuple[float, float] = (14, 10),
+    style: Optional[PrismaStyle] = None,
+    output: Optional[OutputOptions] = None,
+) -> list[Path]:
+    """
+    Write the grid to every filename (format inferred from the extension);
+    only files whose content changes are replaced. Returns the written paths.
+    """
+    paths = [Path(f) for f in filenames]
+    encoded = render_grid(
+        diagrams,
+        [p.suffix for p in paths],
+        titles=titles,
+        ncols=ncols,
+        figsize=figsize,
+        style=style,
+        output=output,
+    )
+    with stage("save"):
+        return [
+            p for p in paths if write_if_changed(p, encoded[p.suffix.lower().lstrip(".")])
+        ]
@@ -0,0 +1,259 @@
+"""
+PRISMA counts across the git history of a records file (living reviews).
+
+    for point in iter_history("data/records.bib"):
+        print(point.revision.commit[:8], dict(counts_table(point.params)))
+
+Revisions are listed with one `git log --raw` and their blobs streamed through
+one `git cat-file --batch` process; consecutive revisions share most entries,
+so only added or edited entries are parsed again (see `RecordsCache`).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Mapping, Optional
+
+from .loader import (
+    OtherMethodsPrefixes,
+    Prisma2020New,
+    Prisma2020Updated,
+    counts_table,
+    status_from_records,
+)
+from .reconcile import HEADER_FIELDS, RecordsCache
+
+_NULL_SHA = "0" * 40
+_COMMIT_MARK = "\x00commit "  # `git log --format` prefix of commit lines (%x00 is NUL)
+
+
+def _git(repo: Path | str, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo), *args],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError("git is not installed") from exc
+    except subprocess.CalledProcessError as exc:
+        raise RuntimeError(exc.stderr.strip() or f"git {args[0]} failed") from exc
+    return result.stdout
+
+
+# -------------------------
+# Revisions
+# -------------------------
+
+
+@dataclass(frozen=True)
+class Revision:
+    commit: str
+    timestamp: int  # committer date (Unix time)
+    subject: str
+    blob: str  # object name of the records file in this commit
+
+
+def iter_revisions(
+    records_path: Path | str,
+    *,
+    rev: str = "HEAD",
+    first_parent: bool = True,
+    max_count: Optional[int] = None,
+) -> Iterator[Revision]:
+    """
+    Commits that changed the records file, oldest first. With `first_parent`,
+    merges are compared to their first parent (the history of the main line).
+    Commits that deleted the file are skipped.
+    """
+    path = Path(records_path).resolve()
+    top = Path(_git(path.parent, "rev-parse", "--show-toplevel").strip())
+    relative = path.relative_to(top.resolve()).as_posix()
+
+    args = ["log", "--raw", "--no-abbrev", "--no-renames", "--format=%x00commit %H %ct %s"]
+    if first_parent:
+        args += ["--first-parent", "--diff-merges=first-parent"]
+    if max_count is not None:
+        args.append(f"--max-count={max_count}")
+    output = _git(top, *args, rev, "--", relative)
+
+    revisions = []
+    header: Optional[tuple[str, int, str]] = None
+    for line in output.splitlines():
+        if line.startswith(_COMMIT_MARK):
+            commit, timestamp, subject = (line[len(_COMMIT_MARK) :].split(" ", 2) + [""])[:3]
+            header = (commit, int(timestamp), subject)
+        elif line.startswith(":") and header is not None:
+            # :<old mode> <new mode> <old sha> <new sha> <status>\t<path>
+            meta, _, name = line.partition("\t")
+            blob = meta.split()[3]
+            if name == relative and blob != _NULL_SHA:
+                revisions.append(Revision(*header, blob=blob))
+            header = None
+    return reversed(revisions)
+
+
+# -------------------------
+# Batched object reads
+# -------------------------
+
+
+class BlobReader:
+    """
+    Reads many objects through one `git cat-file --batch` process; the object
+    names are written by a separate thread so that the pipes never block.
+    """
+
+    def __init__(self, repo: Path | str):
+        self.repo = Path(repo)
+
+    def iter_blobs(self, shas: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """(sha, content) for each object name, in order."""
+        process = subprocess.Popen(
+            ["git", "-C", str(self.repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdin is not None and process.stdout is not None
+        stdin, stdout = process.stdin, process.stdout
+
+        def feed() -> None:
+            try:
+                for sha in shas:
+                    stdin.write(sha.encode("ascii") + b"\n")
+                stdin.close()
+            except (BrokenPipeError, ValueError):  # reader stopped early
+                pass
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            while True:
+                header = stdout.readline()
+                if not header:
+                    break
+                # <sha> <type> <size>\n<content>\n  or  <name> missing\n
+                parts = header.split()
+                if len(parts) != 3:
+                    raise RuntimeError(f"git cat-file: {header.decode(errors='replace').strip()}")
+                content = stdout.read(int(parts[2]))
+                stdout.read(1)
+                yield parts[0].decode("ascii"), content
+        finally:
+            stdout.close()
+            if not stdin.closed:
+                try:
+                    stdin.close()
+                except BrokenPipeError:
+                    pass
+            process.wait()
+            feeder.join()
+
+
+# -------------------------
+# History
+# -------------------------
+
+
+@dataclass(frozen=True)
+class HistoryPoint:
+    revision: Revision
+    params: Prisma2020New | Prisma2020Updated
+    parsed: int = 0  # entries parsed for this revision (0: unchanged blob)
+
+
+def iter_history(
+    records_path: Path | str = "data/records.bib",
+    *,
+    rev: str = "HEAD",
+    first_parent: bool = True,
+    max_count: Optional[int] = None,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    origin_field: str = "colrev_origin",
+    reason_map: Optional[Mapping[str, str]] = None,
+    max_reasons: Optional[int] = None,
+    other_reasons_label: str = "Other",
+) -> Iterator[HistoryPoint]:
+    """PRISMA inputs of the records file at each commit that changed it, oldest first."""
+    path = Path(records_path).resolve()
+    revisions = list(
+        iter_revisions(path, rev=rev, first_parent=first_parent, max_count=max_count)
+    )
+    cache = RecordsCache(fields={*HEADER_FIELDS, origin_field})
+    by_blob: Dict[str, Prisma2020New | Prisma2020Updated] = {}
+
+    # reverts and merges bring back earlier blobs: read each object once
+    unique = list(dict.fromkeys(r.blob for r in revisions))
+    blobs = BlobReader(path.parent).iter_blobs(unique)
+    try:
+        for revision in revisions:
+            if revision.blob in by_blob:
+                yield HistoryPoint(revision, by_blob[revision.blob])
+                continue
+            sha, content = next(blobs)
+            records = cache.load_text(content.decode("utf-8"))
+            params = by_blob[sha] = status_from_records(
+                records,
+                prior_reviews=prior_reviews,
+                other_methods=other_methods,
+                origin_field=origin_field,
+                reason_map=reason_map,
+                max_reasons=max_reasons,
+                other_reasons_label=other_reasons_label,
+            )
+            yield HistoryPoint(revision, params, parsed=cache.parsed)
+    finally:
+        blobs.close()
+
+
+# -------------------------
+# Tables
+# -------------------------
+
+_REVISION_COLUMNS = ("commit", "timestamp", "subject")
+
+
+def history_rows(points: Iterable[HistoryPoint]) -> tuple[list[str], list[Dict[str, Any]]]:
+    """
+    Columns and one row per commit: the revision and its counts (see
+    `counts_table`). Counts a commit does not have (e.g. a reason that was
+    introduced later) are left empty.
+    """
+    columns: Dict[str, None] = dict.fromkeys(_REVISION_COLUMNS)
+    rows = []
+    for point in points:
+        r = point.revision
+        row: Dict[str, Any] = {"commit": r.commit, "timestamp": r.timestamp, "subject": r.subject}
+        for field, value in counts_table(point.params):
+            columns.setdefault(field)
+            row[field] = value
+        rows.append(row)
+    return list(columns), rows
+
+
+def write_history(
+    points: Iterable[HistoryPoint], file: IO[str], *, fmt: str = "csv"
+) -> None:
+    """Write the history table as CSV or as JSON lines."""
+    if fmt == "jsonl":
+        # streamed: one line per commit as it is computed
+        for point in points:
+            r = point.revision
+            row = {"commit": r.commit, "timestamp": r.timestamp, "subject": r.subject}
+            row.update(counts_table(point.params))
+            file.write(json.dumps(row) + "\n")
+        return
+    if fmt != "csv":
+        raise ValueError(f"unknown format: {fmt!r}")
+    columns, rows = history_rows(points)
+    writer = csv.DictWriter(file, fieldnames=columns, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
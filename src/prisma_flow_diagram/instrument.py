@@ -0,0 +1,209 @@
+"""Per-stage timing and profiling hooks (load, aggregate, validate, layout, draw, save)."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+STAGES = ("load", "aggregate", "validate", "layout", "draw", "save")
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    stage: str
+    wall: float  # seconds
+    cpu: float  # process CPU seconds
+    # peak traced memory above the level at stage start (bytes; trace_memory=True)
+    peak_memory: Optional[int] = None
+    # process peak RSS so far (bytes; where the platform reports it)
+    max_rss: Optional[int] = None
+    depth: int = 0  # nesting level (0 = outermost stage)
+
+
+StageCallback = Callable[[StageMetrics], None]
+
+
+def _max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Instrumentation:
+    """
+    Collects `StageMetrics` for the stages run while it is active (see
+    `instrument`), passes each one to the callbacks and optionally logs it.
+
+    With `profile_dir`, every outermost stage is run under cProfile and its
+    stats are dumped to `<profile_dir>/<nnn>-<stage>.prof` (plus a tracemalloc
+    snapshot `<nnn>-<stage>.tracemalloc` if memory is traced).
+    """
+
+    def __init__(
+        self,
+        *,
+        callbacks: Sequence[StageCallback] = (),
+        logger: Optional[logging.Logger] = None,
+        trace_memory: bool = False,
+        profile_dir: Optional[Path] = None,
+    ):
+        self.callbacks = list(callbacks)
+        self.logger = logger
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.metrics: list[StageMetrics] = []
+        # per open stage: highest traced peak seen before nested stages reset it
+        self._peaks: list[int] = []
+        self._profiling = False
+        self._seq = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        depth = len(self._peaks)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        base = 0
+        if tracing:
+            base, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            if hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+                tracemalloc.reset_peak()
+        self._peaks.append(0)
+
+        profiler = None
+        if self.profile_dir is not None and not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+            profiler.enable()
+
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+
+            nested_peak = self._peaks.pop()
+            peak_memory = None
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], nested_peak)
+                peak_memory = max(0, peak - base)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+            if profiler is not None:
+                self._dump(name, profiler, tracing)
+
+            self._report(
+                StageMetrics(
+                    stage=name,
+                    wall=wall,
+                    cpu=cpu,
+                    peak_memory=peak_memory,
+                    max_rss=_max_rss(),
+                    depth=depth,
+                )
+            )
+
+    def _dump(self, name: str, profiler: cProfile.Profile, tracing: bool) -> None:
+        assert self.profile_dir is not None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        stem = self.profile_dir / f"{self._seq:03d}-{name}"
+        profiler.dump_stats(str(stem.with_suffix(".prof")))
+        if tracing:
+            tracemalloc.take_snapshot().dump(str(stem.with_suffix(".tracemalloc")))
+
+    def _report(self, metrics: StageMetrics) -> None:
+        self.metrics.append(metrics)
+        for callback in self.callbacks:
+            callback(metrics)
+        if self.logger is not None:
+            self.logger.info(
+                "stage %s: wall=%.4fs cpu=%.4fs peak_memory=%s",
+                metrics.stage,
+                metrics.wall,
+                metrics.cpu,
+                metrics.peak_memory,
+                extra={"prisma_stage": asdict(metrics)},
+            )
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Totals per stage: count, wall, cpu and the highest peak_memory."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for m in self.metrics:
+            s = out.setdefault(
+                m.stage, {"count": 0, "wall": 0.0, "cpu": 0.0, "peak_memory": None}
+            )
+            s["count"] += 1
+            s["wall"] += m.wall
+            s["cpu"] += m.cpu
+            if m.peak_memory is not None:
+                s["peak_memory"] = max(s["peak_memory"] or 0, m.peak_memory)
+        return out
+
+
+_ACTIVE: ContextVar[Optional[Instrumentation]] = ContextVar(
+    "prisma_flow_diagram_instrumentation", default=None
+)
+_NOOP = nullcontext()
+
+
+@contextmanager
+def instrument(
+    *,
+    callbacks: Sequence[StageCallback] = (),
+    logger: Optional[logging.Logger] = None,
+    trace_memory: bool = False,
+    profile_dir: Optional[Path | str] = None,
+) -> Iterator[Instrumentation]:
+    """
+    Measure the pipeline stages run inside the block, e.g.
+
+        with instrument(callbacks=[push_metric]) as inst:
+            plot_prisma_from_records(records_path="data/records.bib")
+        print(inst.summary())
+
+    `trace_memory` starts tracemalloc for the block (if it is not running
+    already) to report per-stage peak memory; it slows down the stages.
+    """
+    inst = Instrumentation(
+        callbacks=callbacks,
+        logger=logger,
+        trace_memory=trace_memory,
+        profile_dir=Path(profile_dir) if profile_dir is not None else None,
+    )
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _ACTIVE.set(inst)
+    try:
+        yield inst
+    finally:
+        _ACTIVE.reset(token)
+        if started:
+            tracemalloc.stop()
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Mark a pipeline stage (a no-op unless inside `instrument`)."""
+    inst = _ACTIVE.get()
+    return _NOOP if inst is None else inst.stage(name)
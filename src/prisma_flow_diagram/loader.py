@@ -2,20 +2,28 @@ from __future__ import annotations
 
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
 
-import colrev.loader.load_utils
+from .instrument import stage
+from .reasons import ReasonNormalizer, top_k_reasons
 
 # -------------------------
 # Public PRISMA 2020 interfaces
 # -------------------------
 
 
+# A single other-methods lane, or one mapping per lane
+OtherMethodsLanes = Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]
+
+# Other-methods origin prefixes: one lane (list) or one lane per label (mapping)
+OtherMethodsPrefixes = Union[List[str], Mapping[str, List[str]]]
+
+
 @dataclass(frozen=True)
 class Prisma2020New:
     db_registers: Optional[Mapping[str, Any]] = None
     included: Optional[Mapping[str, Any]] = None
-    other_methods: Optional[Mapping[str, Any]] = None
+    other_methods: Optional[OtherMethodsLanes] = None
 
 
 @dataclass(frozen=True)
@@ -23,7 +31,7 @@ class Prisma2020Updated:
     previous: Mapping[str, Any]
     new_db_registers: Optional[Mapping[str, Any]] = None
     new_included: Optional[Mapping[str, Any]] = None
-    other_methods: Optional[Mapping[str, Any]] = None
+    other_methods: Optional[OtherMethodsLanes] = None
 
 
 # -------------------------
@@ -116,7 +124,11 @@ class PrismaStatus:
 
 
 def load_records(records_path: Path | str) -> Dict[str, Dict[str, Any]]:
-    return colrev.loader.load_utils.load(filename=str(records_path))
+    # imported here: CoLRev is only needed to read records files
+    import colrev.loader.load_utils  # pylint: disable=import-outside-toplevel
+
+    with stage("load"):
+        return colrev.loader.load_utils.load(filename=str(records_path))
 
 
 def get_status(rec: Mapping[str, Any]) -> str:
@@ -170,12 +182,33 @@ def status_bucket(status: str) -> str:
     return "other"
 
 
+# Lane boxes -> status buckets counted in them (shared with reconciliation)
+LANE_BUCKETS: Dict[str, tuple[str, ...]] = {
+    "records.screened": (
+        "screened",
+        "prescreen_excluded",
+        "pdf_not_retrieved",
+        "pdf_retrieved",
+        "included",
+    ),
+    "records.excluded": ("prescreen_excluded",),
+    "reports.sought": ("screened", "pdf_not_retrieved", "pdf_retrieved", "included"),
+    "reports.not_retrieved": ("pdf_not_retrieved",),
+    "reports.assessed": ("pdf_retrieved", "included"),
+}
+
+
+def lane_count(buckets: Mapping[str, int], box: str) -> int:
+    return sum(buckets.get(b, 0) for b in LANE_BUCKETS[box])
+
+
 # -------------------------
 # Origin handling / prefix matching
 # -------------------------
 
 
-def _split_origin(value: Any) -> list[str]:
+def split_origin(value: Any) -> list[str]:
+    """Origins of a record (a ";"-separated string or a list)."""
     if not value:
         return []
     if isinstance(value, str):
@@ -185,35 +218,36 @@ def _split_origin(value: Any) -> list[str]:
     return []
 
 
-def _has_any_origin_prefix(
+def has_any_origin_prefix(
     rec: Mapping[str, Any], *, origin_field: str, prefixes: list[str]
 ) -> bool:
+    """Whether any origin of the record starts with one of the prefixes."""
     if not prefixes:
         return False
-    parts = _split_origin(rec.get(origin_field))
+    parts = split_origin(rec.get(origin_field))
     return any(any(p.startswith(pref) for pref in prefixes) for p in parts)
 
 
 def split_records_by_origin_prefix(
-    records: Dict[str, Dict[str, Any]],
+    records: Mapping[str, Mapping[str, Any]],
     *,
     origin_field: str,
     prefixes: list[str],
     record_id_prefix_exclude: str = "md_",
-) -> tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+) -> tuple[Dict[str, Mapping[str, Any]], Dict[str, Mapping[str, Any]]]:
     """
     Returns (matched, rest) where `matched` are records that have at least one origin
     starting with any prefix.
     """
-    matched: Dict[str, Dict[str, Any]] = {}
-    rest: Dict[str, Dict[str, Any]] = {}
+    matched: Dict[str, Mapping[str, Any]] = {}
+    rest: Dict[str, Mapping[str, Any]] = {}
 
     for rid, rec in records.items():
         if rid.startswith(record_id_prefix_exclude):
             rest[rid] = rec
             continue
 
-        if _has_any_origin_prefix(rec, origin_field=origin_field, prefixes=prefixes):
+        if has_any_origin_prefix(rec, origin_field=origin_field, prefixes=prefixes):
             matched[rid] = rec
         else:
             rest[rid] = rec
@@ -222,7 +256,7 @@ def split_records_by_origin_prefix(
 
 
 def compute_origin_stats(
-    records: Dict[str, Dict[str, Any]],
+    records: Mapping[str, Mapping[str, Any]],
     *,
     origin_field: str = "colrev_origin",
     record_id_prefix_exclude: str = "md_",
@@ -239,7 +273,7 @@ def compute_origin_stats(
         if rid.startswith(record_id_prefix_exclude):
             continue
         kept += 1
-        parts = _split_origin(rec.get(origin_field))
+        parts = split_origin(rec.get(origin_field))
         if parts:
             any_origin = True
             total_origins += len(parts)
@@ -287,11 +321,23 @@ def parse_screening_criteria(value: Any) -> Dict[str, int]:
 
 
 def records_to_status(
-    records: Dict[str, Dict[str, Any]],
+    records: Mapping[str, Mapping[str, Any]],
     *,
     exclusion_reason_key: str = "exclusion_reason",
     screening_criteria_key: str = "screening_criteria",
+    reason_map: Optional[Mapping[str, str]] = None,
+    max_reasons: Optional[int] = None,
+    other_reasons_label: str = "Other",
 ) -> PrismaStatus:
+    """
+    Aggregate records into PRISMA counts.
+
+    - `reason_map`: optional mapping of raw reason strings (exact or
+      case-insensitive) to canonical labels, applied before counting.
+    - `max_reasons`: keep at most this many full-text exclusion reasons; the
+      remaining ones are aggregated as `other_reasons_label`.
+    """
+    normalize = ReasonNormalizer(reason_map)
     buckets = {
         "screened": 0,
         "prescreen_excluded": 0,
@@ -313,22 +359,17 @@ def records_to_status(
             parsed = parse_screening_criteria(rec.get(screening_criteria_key))
             if parsed:
                 for k, v in parsed.items():
+                    k = normalize(k)
                     fulltext_reasons[k] = fulltext_reasons.get(k, 0) + int(v)
             else:
-                r = str(rec.get(exclusion_reason_key, "")).strip()
+                r = normalize(str(rec.get(exclusion_reason_key, "")))
                 if r:
                     fulltext_reasons[r] = fulltext_reasons.get(r, 0) + 1
 
-    screened_total = (
-        buckets["screened"]
-        + buckets["prescreen_excluded"]
-        + buckets["pdf_not_retrieved"]
-        + buckets["pdf_retrieved"]
-        + buckets["included"]
-    )
-
-    records_sought = screened_total - buckets["prescreen_excluded"]
-    assessed = buckets["pdf_retrieved"] + buckets["included"]
+    if max_reasons is not None:
+        fulltext_reasons = top_k_reasons(
+            fulltext_reasons, k=max_reasons, other_label=other_reasons_label
+        )
 
     # origin-based identification is injected later (because we split by origin prefixes)
     return PrismaStatus(
@@ -337,11 +378,11 @@ def records_to_status(
         duplicates=None,
         automation=None,
         other_removed=None,
-        screened=screened_total,
-        records_excluded=buckets["prescreen_excluded"],  # prescreen only
-        reports_sought=records_sought,
-        not_retrieved=buckets["pdf_not_retrieved"],
-        assessed=assessed,
+        screened=lane_count(buckets, "records.screened"),
+        records_excluded=lane_count(buckets, "records.excluded"),  # prescreen only
+        reports_sought=lane_count(buckets, "reports.sought"),
+        not_retrieved=lane_count(buckets, "reports.not_retrieved"),
+        assessed=lane_count(buckets, "reports.assessed"),
         reports_excluded=fulltext_reasons or None,
         included=buckets["included"],
         new_reports=buckets["included"],  # keep existing behavior
@@ -411,13 +452,87 @@ def _status_to_included_mapping(status: PrismaStatus) -> Optional[Dict[str, Any]
     )
 
 
-def _other_methods_mapping(count: int) -> Optional[Dict[str, Any]]:
-    # Keep this minimal; adjust keys if your Prisma2020Diagram expects a different schema.
-    return {"records_identified": int(count)} if count > 0 else None
+def other_method_groups(
+    other_methods: Optional[OtherMethodsPrefixes],
+) -> list[tuple[Optional[str], list[str]]]:
+    """Normalize prefixes into (lane label, prefixes) groups."""
+    if not other_methods:
+        return []
+    if isinstance(other_methods, Mapping):
+        groups: list[tuple[Optional[str], list[str]]] = []
+        for label, prefixes in other_methods.items():
+            prefixes = [p for p in (prefixes or []) if p]
+            if prefixes:
+                groups.append((str(label), prefixes))
+        return groups
+    prefixes = [p for p in other_methods if p]
+    return [(None, prefixes)] if prefixes else []
+
+
+def _prefix_breakdown(
+    records: Mapping[str, Mapping[str, Any]], *, origin_field: str, prefixes: list[str]
+) -> Dict[str, int]:
+    """Count records by the first prefix (in order) that one of their origins matches."""
+    counts = {p: 0 for p in prefixes}
+    for rec in records.values():
+        parts = split_origin(rec.get(origin_field))
+        for pref in prefixes:
+            if any(part.startswith(pref) for part in parts):
+                counts[pref] += 1
+                break
+    return counts
+
+
+def _other_methods_mapping(
+    records: Mapping[str, Mapping[str, Any]],
+    *,
+    label: Optional[str],
+    prefixes: list[str],
+    origin_field: str,
+) -> Optional[Dict[str, Any]]:
+    if not records:
+        return None
+    lane: Dict[str, Any] = {
+        "identification": _prefix_breakdown(
+            records, origin_field=origin_field, prefixes=prefixes
+        )
+    }
+    if label:
+        lane["label"] = label
+    return lane
 
 
 # -------------------------
-# Public API: load_status_from_records
+# PRISMA inputs -> flat count table
+# -------------------------
+
+
+def counts_table(
+    params: Prisma2020New | Prisma2020Updated | Mapping[str, Any],
+) -> list[tuple[str, Any]]:
+    """
+    Flatten PRISMA inputs (or a mapping of diagram inputs) into (field, count)
+    rows, e.g. ("db_registers.records.screened", 1458). Lanes of a list-valued
+    other_methods block are addressed as "other_methods[0]...".
+    """
+    rows: list[tuple[str, Any]] = []
+
+    def walk(prefix: str, value: Any) -> None:
+        if isinstance(value, Mapping):
+            for k, v in value.items():
+                walk(f"{prefix}.{k}" if prefix else str(k), v)
+        elif isinstance(value, (list, tuple)):
+            for idx, v in enumerate(value):
+                walk(f"{prefix}[{idx}]", v)
+        elif value is not None:
+            rows.append((prefix, value))
+
+    walk("", params if isinstance(params, Mapping) else asdict(params))
+    return rows
+
+
+# -------------------------
+# Public API: status_from_records / load_status_from_records
 # -------------------------
 
 
@@ -425,11 +540,37 @@ def load_status_from_records(
     records_path: Path | str,
     *,
     prior_reviews: list[str] | None = None,
-    other_methods: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    origin_field: str = "colrev_origin",
+    reason_map: Optional[Mapping[str, str]] = None,
+    max_reasons: Optional[int] = None,
+    other_reasons_label: str = "Other",
+) -> Prisma2020New | Prisma2020Updated:
+    """Load a CoLRev records file and build PRISMA inputs (see `status_from_records`)."""
+    return status_from_records(
+        load_records(records_path),
+        prior_reviews=prior_reviews,
+        other_methods=other_methods,
+        origin_field=origin_field,
+        reason_map=reason_map,
+        max_reasons=max_reasons,
+        other_reasons_label=other_reasons_label,
+    )
+
+
+def status_from_records(
+    records: Mapping[str, Mapping[str, Any]],
+    *,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
     origin_field: str = "colrev_origin",
+    reason_map: Optional[Mapping[str, str]] = None,
+    max_reasons: Optional[int] = None,
+    other_reasons_label: str = "Other",
 ) -> Prisma2020New | Prisma2020Updated:
     """
-    Build PRISMA inputs from CoLRev records using origin-prefix heuristics.
+    Build PRISMA inputs from an in-memory CoLRev records mapping (record ID ->
+    record dict) using origin-prefix heuristics.
 
     - `prior_reviews`: list of prefixes (e.g., ["wagner2021.bib", "fink2023.bib"]).
       If ANY origin part starts with one of these prefixes, the record is counted as
@@ -438,18 +579,50 @@ def load_status_from_records(
     - `other_methods`: list of prefixes (e.g., ["citations.bib"]).
       Among the remaining (non-prior) records, if ANY origin part starts with one of
       these prefixes, it is counted toward "other methods" identification.
+      A mapping of lane labels to prefixes (e.g.,
+      {"Citation searching": ["citations.bib"], "Experts": ["experts.bib"]})
+      creates one independent other-methods lane per label. Records matching
+      several lanes are counted in the first one.
+
+    - `reason_map` / `max_reasons` / `other_reasons_label`: normalization and
+      top-k aggregation of exclusion reasons (see `records_to_status`).
 
     - If *no prefixes are given at all* (both lists empty/None), returns Prisma2020New
       without applying any prefix-based splitting.
     """
-    prior_reviews = [p for p in (prior_reviews or []) if p]
-    other_methods = [p for p in (other_methods or []) if p]
+    with stage("aggregate"):
+        return _status_from_records(
+            records,
+            prior_reviews=prior_reviews,
+            other_methods=other_methods,
+            origin_field=origin_field,
+            reason_map=reason_map,
+            max_reasons=max_reasons,
+            other_reasons_label=other_reasons_label,
+        )
+
 
-    records = load_records(records_path)
+def _status_from_records(
+    records: Mapping[str, Mapping[str, Any]],
+    *,
+    prior_reviews: list[str] | None,
+    other_methods: OtherMethodsPrefixes | None,
+    origin_field: str,
+    reason_map: Optional[Mapping[str, str]],
+    max_reasons: Optional[int],
+    other_reasons_label: str,
+) -> Prisma2020New | Prisma2020Updated:
+    prior_reviews = [p for p in (prior_reviews or []) if p]
+    groups = other_method_groups(other_methods)
 
     # If no prefix logic requested: behave like a plain "new review" loader
-    if not prior_reviews and not other_methods:
-        status_all = records_to_status(records)
+    if not prior_reviews and not groups:
+        status_all = records_to_status(
+            records,
+            reason_map=reason_map,
+            max_reasons=max_reasons,
+            other_reasons_label=other_reasons_label,
+        )
         n_origins, dup_removed = compute_origin_stats(
             records, origin_field=origin_field
         )
@@ -469,16 +642,37 @@ def load_status_from_records(
         prefixes=prior_reviews,
     )
 
-    # 2) Among remaining, split out "other methods" records
-    other_method_recs, db_recs = split_records_by_origin_prefix(
-        remaining,
-        origin_field=origin_field,
-        prefixes=other_methods,
-    )
+    # 2) Among remaining, split out "other methods" records (lane by lane)
+    lanes: list[Optional[Dict[str, Any]]] = []
+    other_method_recs: Dict[str, Mapping[str, Any]] = {}
+    db_recs = remaining
+    for label, prefixes in groups:
+        lane_recs, db_recs = split_records_by_origin_prefix(
+            db_recs,
+            origin_field=origin_field,
+            prefixes=prefixes,
+        )
+        other_method_recs.update(lane_recs)
+        lanes.append(
+            _other_methods_mapping(
+                lane_recs, label=label, prefixes=prefixes, origin_field=origin_field
+            )
+        )
+
+    other_methods_block: Optional[OtherMethodsLanes]
+    if isinstance(other_methods, Mapping):
+        other_methods_block = [lane for lane in lanes if lane is not None] or None
+    else:
+        other_methods_block = lanes[0] if lanes else None
 
     # New pipeline counts (screening/inclusion) should include *all* non-prior records
-    new_pipeline_recs: Dict[str, Dict[str, Any]] = {**db_recs, **other_method_recs}
-    status_new = records_to_status(new_pipeline_recs)
+    new_pipeline_recs: Dict[str, Mapping[str, Any]] = {**db_recs, **other_method_recs}
+    status_new = records_to_status(
+        new_pipeline_recs,
+        reason_map=reason_map,
+        max_reasons=max_reasons,
+        other_reasons_label=other_reasons_label,
+    )
 
     # Identification breakdown:
     # - databases/registers: derived only from db_recs origins
@@ -505,12 +699,70 @@ def load_status_from_records(
             previous=previous_block,
             new_db_registers=_status_to_db_registers_mapping(status_new),
             new_included=_status_to_included_mapping(status_new),
-            other_methods=_other_methods_mapping(len(other_method_recs)),
+            other_methods=other_methods_block,
         )
 
     # Otherwise -> New interface (but possibly with other_methods identification)
     return Prisma2020New(
         db_registers=_status_to_db_registers_mapping(status_new),
         included=_status_to_included_mapping(status_new),
-        other_methods=_other_methods_mapping(len(other_method_recs)),
+        other_methods=other_methods_block,
+    )
+
+
+# -------------------------
+# Public API: status_from_index (no full records)
+# -------------------------
+
+
+def status_from_index(
+    status_index: Mapping[str, Any],
+    origin_index: Optional[Mapping[str, Any]] = None,
+    *,
+    synthesized_record_status_matrix: Optional[Mapping[str, Any]] = None,
+    criteria_index: Optional[Mapping[str, Any]] = None,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    origin_field: str = "colrev_origin",
+    reason_map: Optional[Mapping[str, str]] = None,
+    max_reasons: Optional[int] = None,
+    other_reasons_label: str = "Other",
+) -> Prisma2020New | Prisma2020Updated:
+    """
+    Build PRISMA inputs from compact per-record indexes instead of full records.
+
+    - `status_index`: record ID -> colrev_status
+    - `origin_index`: record ID -> colrev_origin (list or "a;b" string)
+    - `synthesized_record_status_matrix`: the data operation's matrix; records
+      listed there but missing from `status_index` count as synthesized
+    - `criteria_index`: record ID -> screening_criteria (for exclusion reasons)
+
+    Aggregation is shared with `status_from_records`.
+    """
+    origin_index = origin_index or {}
+    criteria_index = criteria_index or {}
+
+    ids = list(status_index)
+    for rid in synthesized_record_status_matrix or {}:
+        if rid not in status_index:
+            ids.append(rid)
+
+    records: Dict[str, Dict[str, Any]] = {}
+    for rid in ids:
+        rec: Dict[str, Any] = {
+            "colrev_status": status_index.get(rid, "rev_synthesized"),
+            origin_field: origin_index.get(rid),
+        }
+        if rid in criteria_index:
+            rec["screening_criteria"] = criteria_index[rid]
+        records[rid] = rec
+
+    return status_from_records(
+        records,
+        prior_reviews=prior_reviews,
+        other_methods=other_methods,
+        origin_field=origin_field,
+        reason_map=reason_map,
+        max_reasons=max_reasons,
+        other_reasons_label=other_reasons_label,
     )
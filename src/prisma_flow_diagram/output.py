@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import io
+import os
+import stat
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import matplotlib as mpl
+from matplotlib.colors import to_rgb
+from PIL import Image
+
+# ============================================================================
+# Output configuration
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    dpi: int = 300
+
+    # PNG: write an indexed-palette image restricted to the style colours
+    # (plus the anti-aliasing blends between them) instead of 8-bit RGBA.
+    png_palette: bool = False
+    # zlib compression level (0-9) used for palette PNGs
+    png_compress_level: int = 9
+
+    # SVG: write compact, hand-built SVG (real <text>, shared <defs>/<use>)
+    # instead of matplotlib's path-based output
+    svg_compact: bool = False
+    # decimals kept for coordinates in compact SVG
+    svg_precision: int = 2
+
+    # Byte-identical files for identical input: no timestamps in metadata and
+    # a fixed salt for the ids matplotlib generates in SVG files.
+    deterministic: bool = True
+
+
+# ============================================================================
+# Palette quantization
+# ============================================================================
+
+_PALETTE_SIZE = 256
+
+
+def _style_colors(style: Any) -> list[tuple[int, int, int]]:
+    """Distinct colours used by the renderer (background, ink and style fills)."""
+    names = [
+        "white",
+        "black",
+        style.box_face,
+        style.box_edge,
+        style.header_face,
+        style.header_edge,
+        style.phase_face,
+    ]
+    colors: list[tuple[int, int, int]] = []
+    for name in names:
+        rgb = tuple(int(round(c * 255)) for c in to_rgb(name))
+        if rgb not in colors:
+            colors.append(rgb)  # type: ignore[arg-type]
+    return colors
+
+
+def style_palette(style: Any) -> list[tuple[int, int, int]]:
+    """
+    Build a palette of at most 256 colours from the style colours.
+
+    Anti-aliased edges and glyphs blend two neighbouring colours, so the space
+    left after the base colours is filled with evenly spaced blends between
+    each pair of them.
+    """
+    base = _style_colors(style)
+    pairs = list(combinations(base, 2))
+    steps = (_PALETTE_SIZE - len(base)) // max(1, len(pairs))
+
+    palette = list(base)
+    for a, b in pairs:
+        for i in range(1, steps + 1):
+            t = i / (steps + 1)
+            blend = tuple(int(round(ca + (cb - ca) * t)) for ca, cb in zip(a, b))
+            if blend not in palette:
+                palette.append(blend)  # type: ignore[arg-type]
+    return palette[:_PALETTE_SIZE]
+
+
+def quantize_png(png_bytes: bytes, *, style: Any, compress_level: int = 9) -> bytes:
+    """Convert an RGBA PNG rendered by matplotlib into an indexed-palette PNG."""
+    palette = np.asarray(style_palette(style), dtype=np.int32)
+
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        pixels = np.asarray(img.convert("RGB"), dtype=np.int32)
+
+    # Map each distinct colour (few, as the diagram is flat) to its exact
+    # nearest palette entry instead of every pixel.
+    packed = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+    uniq, inverse = np.unique(packed.ravel(), return_inverse=True)
+    uniq_rgb = np.stack([(uniq >> 16) & 255, (uniq >> 8) & 255, uniq & 255], axis=1)
+    dist = ((uniq_rgb[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+    nearest = dist.argmin(axis=1).astype(np.uint8)
+
+    # putpalette() turns the 8-bit index image into a "P" image
+    indexed = Image.fromarray(nearest[inverse].reshape(packed.shape))
+    indexed.putpalette(palette.astype(np.uint8).ravel().tolist())
+
+    out = io.BytesIO()
+    indexed.save(
+        out,
+        format="PNG",
+        compress_level=compress_level,
+        optimize=compress_level >= 9,
+    )
+    return out.getvalue()
+
+
+# ============================================================================
+# Saving
+# ============================================================================
+
+
+_SVG_HASHSALT = "prisma-flow-diagram"
+
+# Metadata keys that embed the creation time, per matplotlib backend
+_TIMESTAMP_METADATA = {
+    "pdf": {"CreationDate": None, "ModDate": None},
+    "svg": {"Date": None},
+}
+# The PostScript backend only takes the date from SOURCE_DATE_EPOCH
+_SOURCE_DATE_EPOCH_FORMATS = {"ps", "eps"}
+
+
+def pdf_metadata(options: OutputOptions) -> dict[str, Any] | None:
+    """Metadata for `PdfPages` (multi-page PDFs): no creation dates if deterministic."""
+    return dict(_TIMESTAMP_METADATA["pdf"]) if options.deterministic else None
+
+
+def _format_of(filename: str | Path) -> str:
+    return Path(filename).suffix.lower().lstrip(".")
+
+
+def _savefig(fig: Any, target: Any, *, fmt: str, options: OutputOptions) -> None:
+    kwargs: dict[str, Any] = {"format": fmt, "bbox_inches": "tight", "dpi": options.dpi}
+    if not options.deterministic:
+        fig.savefig(target, **kwargs)
+        return
+
+    metadata = _TIMESTAMP_METADATA.get(fmt)
+    if metadata is not None:
+        kwargs["metadata"] = metadata
+    if fmt in _SOURCE_DATE_EPOCH_FORMATS and "SOURCE_DATE_EPOCH" not in os.environ:
+        os.environ["SOURCE_DATE_EPOCH"] = "0"
+        try:
+            with mpl.rc_context({"svg.hashsalt": _SVG_HASHSALT}):
+                fig.savefig(target, **kwargs)
+        finally:
+            del os.environ["SOURCE_DATE_EPOCH"]
+        return
+
+    with mpl.rc_context({"svg.hashsalt": _SVG_HASHSALT}):
+        fig.savefig(target, **kwargs)
+
+
+def figure_bytes(fig: Any, fmt: str, *, style: Any, options: OutputOptions) -> bytes:
+    """Encode a figure in the given format (e.g. "png", "pdf", "svg")."""
+    buf = io.BytesIO()
+    _savefig(fig, buf, fmt=fmt, options=options)
+    if options.png_palette and fmt == "png":
+        return quantize_png(
+            buf.getvalue(), style=style, compress_level=options.png_compress_level
+        )
+    return buf.getvalue()
+
+
+def save_figure(
+    fig: Any, filename: str | Path, *, style: Any, options: OutputOptions
+) -> None:
+    fmt = _format_of(filename) or mpl.rcParams["savefig.format"]
+
+    if options.png_palette and fmt == "png":
+        data = figure_bytes(fig, fmt, style=style, options=options)
+        Path(filename).write_bytes(data)
+        return
+
+    _savefig(fig, filename, fmt=fmt, options=options)
+
+
+@lru_cache(maxsize=None)
+def _new_file_mode() -> int:
+    # the umask can only be read by setting it: do so once per process
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _file_mode(path: Path) -> int:
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        return _new_file_mode()
+
+
+def write_if_changed(path: str | Path, data: bytes) -> bool:
+    """
+    Atomically replace `path` with `data` unless it already has that content.
+
+    The data is written to a temporary file in the target directory and moved
+    into place, so readers never see a partially written file. Returns True if
+    the file was written.
+    """
+    path = Path(path)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            if hasattr(os, "fchmod"):
+                # mkstemp creates the file with mode 0600: keep the mode of the
+                # replaced file, or use the default (umask) mode of new files
+                os.fchmod(fh.fileno(), _file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True
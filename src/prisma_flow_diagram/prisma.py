@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Mapping, Optional
-from typing_extensions import Literal
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence, Union
+from typing_extensions import Literal, Protocol
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.text import Text
 
 # NOTE:
 # Validation is extracted to a separate module (recommended):
@@ -12,6 +15,10 @@ import matplotlib.pyplot as plt
 # If that import fails (e.g., single-file usage), we provide a small fallback
 # validator at the bottom of this file.
 from .validation import handle_validation, validate_diagram  # type: ignore
+from .instrument import stage
+from .output import OutputOptions, figure_bytes, save_figure, write_if_changed
+from .reasons import top_k_reasons
+from .svg import SvgRenderer
 
 # ============================================================================
 # Styling / layout configuration
@@ -69,6 +76,11 @@ class PrismaStyle:
     comfy_chars: int = 18
     max_width: float = 4.2
 
+    # exclusion reasons: show at most this many rows (the rest is aggregated
+    # as "<other_reasons_label> (n = ...)"); None shows all reasons
+    max_reasons: Optional[int] = None
+    other_reasons_label: str = "Other"
+
 
 # ============================================================================
 # Constants / keys
@@ -125,6 +137,39 @@ class Box:
         )
 
 
+class Renderer(Protocol):
+    def set_ylim(self, bottom: float, top: float) -> None: ...
+
+    def draw_box(
+        self,
+        box: Box,
+        *,
+        facecolor: Optional[str] = None,
+        edgecolor: Optional[str] = None,
+        fontsize: Optional[int] = None,
+        boxstyle: Optional[str] = None,
+    ) -> BoxGeometry: ...
+
+    def draw_arrow(
+        self, xy_from: tuple[float, float], xy_to: tuple[float, float]
+    ) -> None: ...
+
+    def draw_polyline_arrow(self, points: list[tuple[float, float]]) -> None: ...
+
+    def draw_phase_label(
+        self, xc: float, yc: float, height: float, text: str
+    ) -> None: ...
+
+
+def figure_size(
+    figsize: tuple[float, float], xlim: tuple[float, float]
+) -> tuple[float, float]:
+    """Figure size for a diagram spanning `xlim` (the width scales with the x-range)."""
+    x_span = max(1.0, xlim[1] - xlim[0])
+    base_span = 7.2
+    return figsize[0] * x_span / base_span, figsize[1]
+
+
 class MatplotlibRenderer:
     def __init__(
         self,
@@ -132,19 +177,24 @@ class MatplotlibRenderer:
         figsize: tuple[float, float],
         style: PrismaStyle,
         xlim: tuple[float, float],
+        ax: Optional[Axes] = None,
     ):
         self.style = style
-        self.fig, self.ax = plt.subplots(figsize=figsize)
-
-        # Dynamic width: scale with x-range
-        x_span = max(1.0, xlim[1] - xlim[0])
-        base_span = 7.2
-        width_scale = x_span / base_span
-        self.fig.set_size_inches(figsize[0] * width_scale, figsize[1], forward=True)
+        if ax is None:
+            self.fig, self.ax = plt.subplots(figsize=figsize)
+            self.fig.set_size_inches(*figure_size(figsize, xlim), forward=True)
+        else:
+            # drawing into an existing axes: the figure size is left to the caller
+            self.fig, self.ax = ax.figure, ax
 
         self.ax.set_xlim(*xlim)
         self.ax.set_ylim(*style.ylim)
         self.ax.axis("off")
+        # text artists of the boxes, in drawing order
+        self.box_texts: list[Text] = []
+
+    def set_ylim(self, bottom: float, top: float) -> None:
+        self.ax.set_ylim(bottom, top)
 
     def draw_box(
         self,
@@ -174,14 +224,16 @@ class MatplotlibRenderer:
             text_x = g.center_x
             ha = "center"
 
-        self.ax.text(
-            text_x,
-            g.center_y,
-            box.text,
-            ha=ha,
-            va="center",
-            fontsize=fontsize or self.style.box_fontsize,
-            wrap=True,
+        self.box_texts.append(
+            self.ax.text(
+                text_x,
+                g.center_y,
+                box.text,
+                ha=ha,
+                va="center",
+                fontsize=fontsize or self.style.box_fontsize,
+                wrap=True,
+            )
         )
         return g
 
@@ -226,14 +278,22 @@ class MatplotlibRenderer:
 # ============================================================================
 
 PrismaSection = Mapping[str, Any]
+# a single other-methods lane, or one mapping per lane
+OtherMethods = Union[PrismaSection, Sequence[PrismaSection]]
+
+
+@dataclass(frozen=True)
+class OtherLaneTexts:
+    header: str
+    left: dict[str, str]
+    right: dict[str, str]
 
 
 @dataclass(frozen=True)
 class TextBlocks:
     main_left: dict[str, str]
     main_right: dict[str, str]
-    other_left: dict[str, str] | None
-    other_right: dict[str, str] | None
+    others: list[OtherLaneTexts]  # one per other-methods lane (may be empty)
     included_new: str | None
     included_updated: tuple[str, str, str] | None  # (prev, new, total)
 
@@ -242,11 +302,17 @@ class TextBlocks:
 class Widths:
     w_main_left: float
     w_main_right: float
-    w_other_left: float
-    w_other_right: float
+    w_others: list[tuple[float, float]]  # (left, right) per other-methods lane
     w_included: float
 
 
+@dataclass(frozen=True)
+class LaneLayout:
+    x_left: float
+    x_right: float
+    lane_w: float
+
+
 @dataclass(frozen=True)
 class Layout:
     # overall extent
@@ -257,10 +323,8 @@ class Layout:
     x_main_right: float
     main_lane_w: float
 
-    # other lane (optional)
-    x_other_left: float | None
-    x_other_right: float | None
-    other_lane_w: float | None
+    # other-methods lanes (optional, left to right)
+    others: list[LaneLayout]
 
     # previous lane (updated review only)
     x_prev_center: float | None
@@ -270,7 +334,7 @@ class Layout:
 @dataclass(frozen=True)
 class LaneGeometries:
     main: dict[str, BoxGeometry]
-    other: dict[str, BoxGeometry] | None
+    others: list[dict[str, BoxGeometry]]
 
 
 @dataclass(frozen=True)
@@ -299,7 +363,7 @@ class Prisma2020Diagram:
         # NEW review inputs
         db_registers: Optional[PrismaSection] = None,
         included: Optional[PrismaSection] = None,
-        other_methods: Optional[PrismaSection] = None,
+        other_methods: Optional[OtherMethods] = None,
         # UPDATED review inputs
         previous: Optional[PrismaSection] = None,
         new_db_registers: Optional[PrismaSection] = None,
@@ -326,9 +390,13 @@ class Prisma2020Diagram:
         self.included: Optional[Mapping[str, Any]] = (
             dict(included) if included is not None else None
         )
-        self.other_methods: Optional[Mapping[str, Any]] = (
-            dict(other_methods) if other_methods is not None else None
-        )
+        self.other_methods: Optional[Mapping[str, Any] | list[Mapping[str, Any]]]
+        if other_methods is None:
+            self.other_methods = None
+        elif isinstance(other_methods, Mapping):
+            self.other_methods = dict(other_methods)
+        else:
+            self.other_methods = [dict(lane) for lane in other_methods]
 
         self.previous: Optional[Mapping[str, Any]] = (
             dict(previous) if previous is not None else None
@@ -378,13 +446,20 @@ class Prisma2020Diagram:
     def _has(d: Mapping[str, Any], key: str) -> bool:
         return key in d
 
-    @staticmethod
-    def _format_excluded_reasons(value: Any, fallback: str) -> str:
+    def _format_excluded_reasons(self, value: Any, fallback: str) -> str:
         if not value:
             return fallback
         if isinstance(value, Mapping):
-            # stable ordering is nicer for tests and reproducible output
-            items = sorted(value.items(), key=lambda kv: str(kv[0]))
+            other_label = self.style.other_reasons_label
+            if self.style.max_reasons is not None:
+                value = top_k_reasons(
+                    value, k=self.style.max_reasons, other_label=other_label
+                )
+            # stable ordering is nicer for tests and reproducible output;
+            # the aggregated row goes last
+            items = sorted(
+                value.items(), key=lambda kv: (str(kv[0]) == other_label, str(kv[0]))
+            )
             return "\n".join(f"{k} (n = {v})" for k, v in items)
         return str(value)
 
@@ -523,10 +598,22 @@ class Prisma2020Diagram:
             ),
         }
 
-    def _other_left_text(self) -> dict[str, str]:
-        assert self.other_methods is not None
+    def _other_lanes(self) -> list[Mapping[str, Any]]:
+        if self.other_methods is None:
+            return []
+        if isinstance(self.other_methods, Mapping):
+            return [self.other_methods]
+        return list(self.other_methods)
 
-        ident_raw = self.other_methods.get("identification", {})
+    @staticmethod
+    def _other_header_text(lane: Mapping[str, Any]) -> str:
+        label = lane.get("label")
+        if label:
+            return f"Identification of studies via other methods: {label}"
+        return "Identification of studies via other methods"
+
+    def _other_left_text(self, lane: Mapping[str, Any]) -> dict[str, str]:
+        ident_raw = lane.get("identification", {})
         ident = dict(ident_raw) if isinstance(ident_raw, Mapping) else {}
 
         # Support both:
@@ -539,7 +626,7 @@ class Prisma2020Diagram:
             # treat the entire identification mapping as sources if it looks like a breakdown
             sources = ident
 
-        reports_raw = self.other_methods.get("reports", {})
+        reports_raw = lane.get("reports", {})
         reports = dict(reports_raw) if isinstance(reports_raw, Mapping) else {}
 
         ident_lines: list[str] = ["Records identified from:"]
@@ -563,10 +650,8 @@ class Prisma2020Diagram:
             ASSESSED: f"Reports assessed for eligibility\n(n = {self._get(reports, 'assessed', 0)})",
         }
 
-    def _other_right_text(self) -> dict[str, str]:
-        assert self.other_methods is not None
-
-        reports_raw = self.other_methods.get("reports", {})
+    def _other_right_text(self, lane: Mapping[str, Any]) -> dict[str, str]:
+        reports_raw = lane.get("reports", {})
         reports = dict(reports_raw) if isinstance(reports_raw, Mapping) else {}
 
         excluded_reasons = self._get(reports, "excluded_reasons", None)
@@ -656,10 +741,14 @@ class Prisma2020Diagram:
         main_left = self._main_left_text(main_lane)
         main_right = self._main_right_text(main_lane)
 
-        other_left = other_right = None
-        if self.other_methods is not None:
-            other_left = self._other_left_text()
-            other_right = self._other_right_text()
+        others = [
+            OtherLaneTexts(
+                header=self._other_header_text(lane),
+                left=self._other_left_text(lane),
+                right=self._other_right_text(lane),
+            )
+            for lane in self._other_lanes()
+        ]
 
         if self.is_updated:
             inc_updated = self._included_updated_texts()
@@ -671,8 +760,7 @@ class Prisma2020Diagram:
         return TextBlocks(
             main_left=main_left,
             main_right=main_right,
-            other_left=other_left,
-            other_right=other_right,
+            others=others,
             included_new=inc_new,
             included_updated=inc_updated,
         )
@@ -685,12 +773,13 @@ class Prisma2020Diagram:
         w_main_left = self.compute_column_width(texts.main_left)
         w_main_right = self.compute_column_width(texts.main_right)
 
-        if texts.other_left is not None and texts.other_right is not None:
-            w_other_left = self.compute_column_width(texts.other_left)
-            w_other_right = self.compute_column_width(texts.other_right)
-        else:
-            w_other_left = 0.0
-            w_other_right = 0.0
+        w_others = [
+            (
+                self.compute_column_width(lane.left),
+                self.compute_column_width(lane.right),
+            )
+            for lane in texts.others
+        ]
 
         if self.is_updated:
             assert texts.included_updated is not None
@@ -705,12 +794,15 @@ class Prisma2020Diagram:
         return Widths(
             w_main_left=w_main_left,
             w_main_right=w_main_right,
-            w_other_left=w_other_left,
-            w_other_right=w_other_right,
+            w_others=w_others,
             w_included=w_included,
         )
 
-    def _compute_layout(self, widths: Widths, *, has_other: bool) -> Layout:
+    def _compute_layout(self, widths: Widths) -> Layout:
+        """
+        Place lanes left to right in a single pass:
+        [previous] | main | other_1 | ... | other_n
+        """
         style = self.style
         x = style.left_margin
 
@@ -721,50 +813,35 @@ class Prisma2020Diagram:
             x_prev_center = x + prev_lane_w / 2
             x = x_prev_center + prev_lane_w / 2 + style.prev_lane_gap
 
-        x_main_left = x + widths.w_main_left / 2
-        x_main_right = (
-            x_main_left
-            + widths.w_main_left / 2
-            + style.col_gap
-            + widths.w_main_right / 2
-        )
-        main_lane_w = widths.w_main_left + style.col_gap + widths.w_main_right
+        main = self._place_lane(x, widths.w_main_left, widths.w_main_right)
+        x = main.x_right + widths.w_main_right / 2
 
-        x = (
-            x_main_right
-            + widths.w_main_right / 2
-            + (style.lane_gap if has_other else 0.0)
-        )
-
-        x_other_left: float | None = None
-        x_other_right: float | None = None
-        other_lane_w: float | None = None
-
-        if has_other:
-            x_other_left = x + widths.w_other_left / 2
-            x_other_right = (
-                x_other_left
-                + widths.w_other_left / 2
-                + style.col_gap
-                + widths.w_other_right / 2
-            )
-            other_lane_w = widths.w_other_left + style.col_gap + widths.w_other_right
-            x_end = x_other_right + widths.w_other_right / 2 + style.right_margin
-        else:
-            x_end = x_main_right + widths.w_main_right / 2 + style.right_margin
+        others: list[LaneLayout] = []
+        for w_left, w_right in widths.w_others:
+            lane = self._place_lane(x + style.lane_gap, w_left, w_right)
+            others.append(lane)
+            x = lane.x_right + w_right / 2
 
         return Layout(
-            xlim=(0.0, x_end),
-            x_main_left=x_main_left,
-            x_main_right=x_main_right,
-            main_lane_w=main_lane_w,
-            x_other_left=x_other_left,
-            x_other_right=x_other_right,
-            other_lane_w=other_lane_w,
+            xlim=(0.0, x + style.right_margin),
+            x_main_left=main.x_left,
+            x_main_right=main.x_right,
+            main_lane_w=main.lane_w,
+            others=others,
             x_prev_center=x_prev_center,
             prev_lane_w=prev_lane_w,
         )
 
+    def _place_lane(self, x: float, w_left: float, w_right: float) -> LaneLayout:
+        """Place a two-column lane whose left edge is at x."""
+        x_left = x + w_left / 2
+        x_right = x_left + w_left / 2 + self.style.col_gap + w_right / 2
+        return LaneLayout(
+            x_left=x_left,
+            x_right=x_right,
+            lane_w=w_left + self.style.col_gap + w_right,
+        )
+
     # ------------------------------------------------------------------------
     # Drawing helpers
     # ------------------------------------------------------------------------
@@ -772,7 +849,7 @@ class Prisma2020Diagram:
     def _draw_vertical_flow(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         x_center: float,
         steps: list[str],
         texts: dict[str, str],
@@ -814,7 +891,7 @@ class Prisma2020Diagram:
     def _draw_side_box(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         ref_left: BoxGeometry,
         text: str,
         x_center: float,
@@ -834,7 +911,7 @@ class Prisma2020Diagram:
     def _draw_prev_to_total_routed(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         prev_geom: BoxGeometry,
         total_geom: BoxGeometry,
     ) -> None:
@@ -850,7 +927,7 @@ class Prisma2020Diagram:
     # ------------------------------------------------------------------------
 
     def _draw_headers(
-        self, renderer: MatplotlibRenderer, layout: Layout, *, has_other: bool
+        self, renderer: Renderer, layout: Layout, texts: TextBlocks
     ) -> None:
         style = self.style
 
@@ -891,19 +968,14 @@ class Prisma2020Diagram:
                 fontsize=10,
             )
 
-        if has_other:
-            assert (
-                layout.x_other_left is not None
-                and layout.x_other_right is not None
-                and layout.other_lane_w is not None
-            )
+        for i, (lane, lane_texts) in enumerate(zip(layout.others, texts.others)):
             renderer.draw_box(
                 Box(
-                    "hdr_other",
-                    "Identification of studies via other methods",
-                    (layout.x_other_left + layout.x_other_right) / 2,
+                    f"hdr_other_{i}",
+                    lane_texts.header,
+                    (lane.x_left + lane.x_right) / 2,
                     style.header_y,
-                    layout.other_lane_w,
+                    lane.lane_w,
                     style.header_h,
                     align="center",
                 ),
@@ -915,7 +987,7 @@ class Prisma2020Diagram:
     def _draw_lanes(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         layout: Layout,
         widths: Widths,
         texts: TextBlocks,
@@ -938,63 +1010,73 @@ class Prisma2020Diagram:
                 width=widths.w_main_right,
             )
 
-        # other lane (optional), aligned to main
-        other_geoms: dict[str, BoxGeometry] | None = None
-        if texts.other_left is not None and texts.other_right is not None:
-            assert layout.x_other_left is not None and layout.x_other_right is not None
-            forced_y = {
-                IDENT: main_geoms[IDENT].center_y,
-                SOUGHT: main_geoms[SOUGHT].center_y,
-                ASSESSED: main_geoms[ASSESSED].center_y,
-            }
-            other_geoms = self._draw_vertical_flow(
+        # other lanes (optional), aligned to main
+        forced_y = {
+            IDENT: main_geoms[IDENT].center_y,
+            SOUGHT: main_geoms[SOUGHT].center_y,
+            ASSESSED: main_geoms[ASSESSED].center_y,
+        }
+        other_geoms: list[dict[str, BoxGeometry]] = []
+        for lane, lane_texts, (w_left, w_right) in zip(
+            layout.others, texts.others, widths.w_others
+        ):
+            geoms = self._draw_vertical_flow(
                 renderer=renderer,
-                x_center=layout.x_other_left,
+                x_center=lane.x_left,
                 steps=OTHER_STEPS,
-                texts=texts.other_left,
-                box_width=widths.w_other_left,
+                texts=lane_texts.left,
+                box_width=w_left,
                 start_y_center=7.1,
                 forced_y=forced_y,
             )
             for step in [SOUGHT, ASSESSED]:
                 self._draw_side_box(
                     renderer=renderer,
-                    ref_left=other_geoms[step],
-                    text=texts.other_right[step],
-                    x_center=layout.x_other_right,
-                    width=widths.w_other_right,
+                    ref_left=geoms[step],
+                    text=lane_texts.right[step],
+                    x_center=lane.x_right,
+                    width=w_right,
                 )
+            other_geoms.append(geoms)
 
-        return LaneGeometries(main=main_geoms, other=other_geoms)
+        return LaneGeometries(main=main_geoms, others=other_geoms)
 
     def _lowest_assessed_bottom(self, lane_geoms: LaneGeometries) -> float:
         lowest = lane_geoms.main[ASSESSED].bottom
-        if lane_geoms.other is not None:
-            lowest = min(lowest, lane_geoms.other[ASSESSED].bottom)
+        for geoms in lane_geoms.others:
+            lowest = min(lowest, geoms[ASSESSED].bottom)
         return lowest
 
-    def _connect_other_assessed_to_included(
+    def _connect_others_to_included(
         self,
         *,
-        renderer: MatplotlibRenderer,
-        other_assessed: BoxGeometry,
+        renderer: Renderer,
+        lane_geoms: LaneGeometries,
         target: BoxGeometry,
     ) -> None:
+        """
+        Route each other-methods lane DOWN, then LEFT into the right edge of the
+        included box. Lanes further right enter lower, so no connector crosses
+        the vertical segment of a lane closer to the box.
+        """
         style = self.style
-        elbow_y = target.center_y
-        renderer.draw_polyline_arrow(
-            [
-                (other_assessed.center_x, other_assessed.bottom - style.arrow_margin),
-                (other_assessed.center_x, elbow_y),
-                (target.right + style.arrow_margin, elbow_y),
-                (target.right, target.center_y),
-            ]
-        )
+        n = len(lane_geoms.others)
+        for i, geoms in enumerate(lane_geoms.others):
+            assessed = geoms[ASSESSED]
+            elbow_y = target.top - (i + 1) * target.height / (n + 1)
+            renderer.draw_polyline_arrow(
+                [
+                    (assessed.center_x, assessed.bottom - style.arrow_margin),
+                    (assessed.center_x, elbow_y),
+                    (target.right + style.arrow_margin, elbow_y),
+                    (target.right, elbow_y),
+                ]
+            )
 
     def _draw_included_new(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         layout: Layout,
         widths: Widths,
         texts: TextBlocks,
@@ -1027,17 +1109,16 @@ class Prisma2020Diagram:
             (inc_geom.center_x, inc_geom.top + style.arrow_margin),
         )
 
-        if lanes.other is not None:
-            self._connect_other_assessed_to_included(
-                renderer=renderer, other_assessed=lanes.other[ASSESSED], target=inc_geom
-            )
+        self._connect_others_to_included(
+            renderer=renderer, lane_geoms=lanes, target=inc_geom
+        )
 
         return IncludedGeometries(included=inc_geom, prev=None, new=None, total=None)
 
     def _draw_included_updated(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         layout: Layout,
         widths: Widths,
         texts: TextBlocks,
@@ -1103,10 +1184,9 @@ class Prisma2020Diagram:
             (new_geom.center_x, new_geom.top + style.arrow_margin),
         )
 
-        if lanes.other is not None:
-            self._connect_other_assessed_to_included(
-                renderer=renderer, other_assessed=lanes.other[ASSESSED], target=new_geom
-            )
+        self._connect_others_to_included(
+            renderer=renderer, lane_geoms=lanes, target=new_geom
+        )
 
         renderer.draw_arrow(
             (new_geom.center_x, new_geom.bottom - style.arrow_margin),
@@ -1119,7 +1199,7 @@ class Prisma2020Diagram:
 
         # ensure bottom is included
         desired_ymin = min(style.ylim[0], total_geom.bottom - style.bottom_padding)
-        renderer.ax.set_ylim(desired_ymin, style.ylim[1])
+        renderer.set_ylim(desired_ymin, style.ylim[1])
 
         return IncludedGeometries(
             included=None, prev=prev_geom, new=new_geom, total=total_geom
@@ -1128,7 +1208,7 @@ class Prisma2020Diagram:
     def _draw_included(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         layout: Layout,
         widths: Widths,
         texts: TextBlocks,
@@ -1149,7 +1229,7 @@ class Prisma2020Diagram:
     def _draw_phase_labels(
         self,
         *,
-        renderer: MatplotlibRenderer,
+        renderer: Renderer,
         lanes: LaneGeometries,
         included: IncludedGeometries,
     ) -> None:
@@ -1183,23 +1263,161 @@ class Prisma2020Diagram:
         show: bool = False,
         figsize: tuple[float, float] = (14, 10),
         validation: ValidationMode = "warn",
+        output: OutputOptions | None = None,
     ) -> None:
         # ---- validation hook (before any drawing) ----
         if validation != "off":
-            issues = self.validate()
-            handle_validation(issues, mode=validation)
+            with stage("validate"):
+                issues = self.validate()
+                handle_validation(issues, mode=validation)
+
+        texts, widths, layout = self._prepare()
+
+        output = output or OutputOptions()
+        svg_compact = (
+            output.svg_compact
+            and filename is not None
+            and str(filename).lower().endswith(".svg")
+        )
+
+        if svg_compact:
+            with stage("draw"):
+                svg_renderer = SvgRenderer(
+                    figsize=figsize,
+                    style=self.style,
+                    xlim=layout.xlim,
+                    precision=output.svg_precision,
+                )
+                self._draw(svg_renderer, layout, widths, texts)
+            assert filename is not None
+            with stage("save"):
+                svg_renderer.save(filename)
+            if not show:
+                return
+
+        with stage("draw"):
+            renderer = MatplotlibRenderer(
+                figsize=figsize, style=self.style, xlim=layout.xlim
+            )
+            self._draw(renderer, layout, widths, texts)
+
+        if filename is not None and not svg_compact:
+            with stage("save"):
+                save_figure(renderer.fig, filename, style=self.style, options=output)
+        if show:
+            plt.show()
 
-        texts = self._build_text_blocks()
-        has_other = texts.other_left is not None and texts.other_right is not None
+    def render(
+        self,
+        formats: Sequence[str],
+        *,
+        figsize: tuple[float, float] = (14, 10),
+        output: OutputOptions | None = None,
+    ) -> dict[str, bytes]:
+        """
+        Encode the diagram in each of the given formats (e.g. ["png", "pdf"]).
+
+        The layout is computed once and drawn at most once per renderer
+        (matplotlib, and the compact SVG writer if enabled).
+        """
+        output = output or OutputOptions()
+        texts, widths, layout = self._prepare()
+        result: dict[str, bytes] = {}
+
+        formats = [f.lower().lstrip(".") for f in formats]
+        if output.svg_compact and "svg" in formats:
+            with stage("draw"):
+                svg_renderer = SvgRenderer(
+                    figsize=figsize,
+                    style=self.style,
+                    xlim=layout.xlim,
+                    precision=output.svg_precision,
+                )
+                self._draw(svg_renderer, layout, widths, texts)
+            with stage("save"):
+                result["svg"] = svg_renderer.to_string().encode("utf-8")
+
+        mpl_formats = [f for f in dict.fromkeys(formats) if f not in result]
+        if mpl_formats:
+            renderer: Optional[MatplotlibRenderer] = None
+            try:
+                with stage("draw"):
+                    renderer = MatplotlibRenderer(
+                        figsize=figsize, style=self.style, xlim=layout.xlim
+                    )
+                    self._draw(renderer, layout, widths, texts)
+                for fmt in mpl_formats:
+                    with stage("save"):
+                        result[fmt] = figure_bytes(
+                            renderer.fig, fmt, style=self.style, options=output
+                        )
+            finally:
+                if renderer is not None:
+                    plt.close(renderer.fig)
+
+        return result
+
+    def save(
+        self,
+        filenames: Sequence[str | Path],
+        *,
+        figsize: tuple[float, float] = (14, 10),
+        validation: ValidationMode = "warn",
+        output: OutputOptions | None = None,
+    ) -> list[Path]:
+        """
+        Write the diagram to every filename (format inferred from the extension).
 
-        widths = self._compute_widths(texts)
-        layout = self._compute_layout(widths, has_other=has_other)
+        Files are replaced atomically and only if their content changes; the
+        paths that were written are returned.
+        """
+        if validation != "off":
+            with stage("validate"):
+                handle_validation(self.validate(), mode=validation)
 
-        renderer = MatplotlibRenderer(
-            figsize=figsize, style=self.style, xlim=layout.xlim
+        paths = [Path(f) for f in filenames]
+        encoded = self.render(
+            [p.suffix for p in paths], figsize=figsize, output=output
         )
+        with stage("save"):
+            return [
+                p
+                for p in paths
+                if write_if_changed(p, encoded[p.suffix.lower().lstrip(".")])
+            ]
+
+    def draw(
+        self,
+        ax: Optional[Axes] = None,
+        *,
+        figsize: tuple[float, float] = (14, 10),
+    ) -> MatplotlibRenderer:
+        """
+        Draw the diagram with matplotlib (without validation), onto `ax` if
+        given or else onto a new figure. The renderer holds `fig` and `ax`.
+        """
+        texts, widths, layout = self._prepare()
+        with stage("draw"):
+            renderer = MatplotlibRenderer(
+                figsize=figsize, style=self.style, xlim=layout.xlim, ax=ax
+            )
+            self._draw(renderer, layout, widths, texts)
+        return renderer
 
-        self._draw_headers(renderer, layout, has_other=has_other)
+    def _prepare(self) -> tuple[TextBlocks, Widths, Layout]:
+        with stage("layout"):
+            texts = self._build_text_blocks()
+            widths = self._compute_widths(texts)
+            return texts, widths, self._compute_layout(widths)
+
+    def _draw(
+        self,
+        renderer: Renderer,
+        layout: Layout,
+        widths: Widths,
+        texts: TextBlocks,
+    ) -> None:
+        self._draw_headers(renderer, layout, texts)
         lanes = self._draw_lanes(
             renderer=renderer, layout=layout, widths=widths, texts=texts
         )
@@ -1208,28 +1426,37 @@ class Prisma2020Diagram:
         )
         self._draw_phase_labels(renderer=renderer, lanes=lanes, included=included)
 
-        if filename is not None:
-            renderer.fig.savefig(filename, bbox_inches="tight", dpi=300)
-        if show:
-            plt.show()
-
 
 # ============================================================================
 # Public API
 # ============================================================================
 
 
+def as_diagram(inputs: Any, *, style: PrismaStyle | None = None) -> Prisma2020Diagram:
+    """
+    A diagram from PRISMA inputs: a `Prisma2020New`/`Prisma2020Updated` (as
+    returned by `status_from_records`), a mapping of keyword inputs, or a
+    diagram (returned as is).
+    """
+    if isinstance(inputs, Prisma2020Diagram):
+        return inputs
+    if is_dataclass(inputs) and not isinstance(inputs, type):
+        inputs = asdict(inputs)
+    return Prisma2020Diagram(**inputs, style=style)
+
+
 def plot_prisma2020_new(
     *,
     db_registers: Mapping[str, Any],
     included: Mapping[str, Any],
-    other_methods: Mapping[str, Any] | None = None,
+    other_methods: OtherMethods | None = None,
     # output
     filename: str | None = None,
     show: bool = False,
     figsize: tuple[float, float] = (14, 10),
     style: PrismaStyle | None = None,
     validation: ValidationMode = "warn",
+    output: OutputOptions | None = None,
 ) -> None:
     Prisma2020Diagram(
         db_registers=db_registers,
@@ -1244,6 +1471,7 @@ def plot_prisma2020_new(
         show=show,
         figsize=figsize,
         validation=validation,
+        output=output,
     )
 
 
@@ -1252,13 +1480,14 @@ def plot_prisma2020_updated(
     previous: Mapping[str, Any],
     new_db_registers: Mapping[str, Any],
     new_included: Mapping[str, Any],
-    other_methods: Mapping[str, Any] | None = None,
+    other_methods: OtherMethods | None = None,
     # output
     filename: str | None = None,
     show: bool = False,
     figsize: tuple[float, float] = (14, 10),
     style: PrismaStyle | None = None,
     validation: ValidationMode = "warn",
+    output: OutputOptions | None = None,
 ) -> None:
     Prisma2020Diagram(
         db_registers=None,
@@ -1273,6 +1502,7 @@ def plot_prisma2020_updated(
         show=show,
         figsize=figsize,
         validation=validation,
+        output=output,
     )
 
 
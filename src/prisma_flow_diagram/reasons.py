@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Mapping, Optional
+
+# -------------------------
+# Exclusion-reason normalization and aggregation
+# -------------------------
+
+
+class ReasonNormalizer:
+    """
+    Map free-text reason strings onto canonical labels.
+
+    Lookups are exact first, then case-insensitive (after trimming
+    whitespace); unmapped reasons are returned trimmed.
+    """
+
+    def __init__(self, reason_map: Optional[Mapping[str, str]] = None):
+        self._exact = dict(reason_map or {})
+        self._folded = {k.strip().casefold(): v for k, v in self._exact.items()}
+
+    def __call__(self, reason: str) -> str:
+        r = reason.strip()
+        if r in self._exact:
+            return self._exact[r]
+        return self._folded.get(r.casefold(), r)
+
+
+def _count(v: Any) -> int:
+    try:
+        return int(v)
+    except Exception:
+        return 0
+
+
+def top_k_reasons(
+    reasons: Mapping[str, Any],
+    *,
+    k: Optional[int],
+    other_label: str = "Other",
+) -> Dict[str, int]:
+    """
+    Keep the `k` most frequent reasons and aggregate the rest under
+    `other_label` (counts of an existing `other_label` entry are merged in).
+
+    Selection uses a heap, so it is O(n log k) for n distinct reasons. Ties
+    are broken by reason name to keep the output stable.
+    """
+    counts = {str(key): _count(v) for key, v in reasons.items()}
+    if k is None or len(counts) <= k:
+        return counts
+
+    other = counts.pop(other_label, 0)
+    # keep one slot for the aggregate row
+    keep = max(0, k - 1)
+    top = heapq.nsmallest(keep, counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    kept = dict(top)
+    other += sum(v for key, v in counts.items() if key not in kept)
+    if other:
+        kept[other_label] = other
+    return kept
@@ -0,0 +1,421 @@
+"""Reconcile PRISMA counts against the records they were derived from."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
+
+from .loader import LANE_BUCKETS
+from .loader import OtherMethodsPrefixes
+from .loader import has_any_origin_prefix, other_method_groups, split_origin
+from .loader import get_status, parse_screening_criteria, status_bucket
+from .validation import ValidationIssue, as_int_maybe, get_path, sum_counts_any
+
+# Fields read from each record (all others are skipped without being parsed)
+HEADER_FIELDS = (
+    "colrev_origin",
+    "colrev_status",
+    "status",
+    "screening_status",
+    "screening_criteria",
+    "exclusion_reason",
+)
+
+
+# -------------------------
+# Streaming records.bib reader
+# -------------------------
+
+
+def _field_value(text: str) -> str:
+    value = text.strip().rstrip(",").strip()
+    if value.startswith("{") and value.endswith("}"):
+        value = value[1:-1]
+    return value.strip()
+
+
+def iter_headers(
+    lines: Iterable[str], *, fields: Iterable[str] = HEADER_FIELDS
+) -> Iterator[Dict[str, str]]:
+    """
+    Yield one dict per entry of (CoLRev-formatted) BibTeX lines with the ID and
+    the requested fields. Only the current entry is held in memory.
+    """
+    wanted = set(fields)
+    record: Optional[Dict[str, str]] = None
+    key: Optional[str] = None  # field whose (multi-line) value is being read
+    parts: list[str] = []
+    depth = 0
+
+    for raw in lines:
+        line = raw.strip()
+
+        if key is not None:
+            depth += line.count("{") - line.count("}")
+            if key in wanted:
+                parts.append(line)
+            if depth <= 0:
+                if key in wanted and record is not None:
+                    record[key] = _field_value(" ".join(parts))
+                key, parts = None, []
+            continue
+
+        if not line or line.startswith("%"):
+            continue
+
+        if line.startswith("@"):
+            if record is not None:
+                yield record
+            rid = line.partition("{")[2].rstrip(",").strip()
+            record = {"ID": rid} if rid else None
+            continue
+
+        if record is None:
+            continue
+
+        if line == "}":
+            yield record
+            record = None
+            continue
+
+        name, sep, rest = line.partition("=")
+        if not sep:
+            continue
+        name = name.strip()
+        depth = rest.count("{") - rest.count("}")
+        if depth > 0:
+            key = name
+            parts = [rest] if name in wanted else []
+        elif name in wanted:
+            record[name] = _field_value(rest)
+
+    if record is not None:
+        yield record
+
+
+def iter_record_headers(
+    records_path: Path | str, *, fields: Iterable[str] = HEADER_FIELDS
+) -> Iterator[Dict[str, str]]:
+    """Stream the entries of a records file line by line (see `iter_headers`)."""
+    with open(records_path, encoding="utf-8") as file:
+        yield from iter_headers(file, fields=fields)
+
+
+# -------------------------
+# Incremental parsing (entry cache)
+# -------------------------
+
+class RecordsCache:
+    """
+    Record headers of a records file, cached by a hash of each entry's text:
+    after a change, only added or edited entries are parsed again.
+    """
+
+    def __init__(self, *, fields: Iterable[str] = HEADER_FIELDS):
+        self.fields = tuple(fields)
+        self._entries: Dict[bytes, Optional[Dict[str, str]]] = {}
+        self.parsed = 0  # entries parsed by the last `load`
+
+    def load(self, records_path: Path | str) -> Dict[str, Dict[str, str]]:
+        return self.load_text(Path(records_path).read_text(encoding="utf-8"))
+
+    def load_text(self, text: str) -> Dict[str, Dict[str, str]]:
+        """Record headers (ID -> fields) of a records file's content."""
+        entries: Dict[bytes, Optional[Dict[str, str]]] = {}
+        records: Dict[str, Dict[str, str]] = {}
+        parsed = 0
+        # entries start with "@" at the beginning of a line (str.split beats a regex)
+        chunks = text.split("\n@")
+        if not chunks[0].startswith("@"):
+            chunks[0] = ""
+        for i, chunk in enumerate(chunks):
+            if i:
+                chunk = "@" + chunk
+            elif not chunk:
+                continue
+            key = hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).digest()
+            if key in entries:
+                header = entries[key]
+            elif key in self._entries:
+                header = self._entries[key]
+            else:
+                header = next(iter_headers(chunk.splitlines(), fields=self.fields), None)
+                parsed += 1
+            entries[key] = header
+            if header is not None:
+                records[header["ID"]] = header
+        # entries that disappeared from the file are dropped
+        self._entries = entries
+        self.parsed = parsed
+        return records
+
+
+# -------------------------
+# Tallies (count + bounded ID sample)
+# -------------------------
+
+
+class _Tally:
+    __slots__ = ("count", "ids")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.ids: list[str] = []
+
+    def add(self, rid: str, max_ids: int) -> None:
+        self.count += 1
+        if len(self.ids) < max_ids:
+            self.ids.append(rid)
+
+
+def _sample(tallies: Iterable[_Tally], max_ids: int) -> str:
+    ids: list[str] = []
+    total = 0
+    for tally in tallies:
+        total += tally.count
+        ids.extend(tally.ids[: max_ids - len(ids)])
+    if not ids:
+        return "none"
+    more = total - len(ids)
+    return ", ".join(ids) + (f" (+{more} more)" if more > 0 else "")
+
+
+class _Group:
+    """Status buckets and origin counts of one part of the diagram."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, _Tally] = {}
+        self.origins = 0
+        self.kept = 0  # records that count towards origin statistics
+        self.any_origin = False
+
+    def tally(self, bucket: str) -> _Tally:
+        if bucket not in self.buckets:
+            self.buckets[bucket] = _Tally()
+        return self.buckets[bucket]
+
+    def count(self, *buckets: str) -> int:
+        return sum(self.buckets[b].count for b in buckets if b in self.buckets)
+
+    def total(self) -> int:
+        return sum(t.count for t in self.buckets.values())
+
+
+# -------------------------
+# Reconciliation
+# -------------------------
+
+
+def _params_mapping(params: Any) -> Mapping[str, Any]:
+    if is_dataclass(params) and not isinstance(params, type):
+        return asdict(params)
+    return params
+
+
+def reconcile(
+    params: Any,
+    records: Iterable[Mapping[str, Any]],
+    *,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    origin_field: str = "colrev_origin",
+    max_ids: int = 20,
+) -> list[ValidationIssue]:
+    """
+    Cross-check PRISMA inputs against records (dicts with "ID"; a single pass).
+
+    Records are routed and counted as in `status_from_records` (with the same
+    `prior_reviews`/`other_methods` prefixes). Each lane box is compared to the
+    number of records with matching statuses, the sum of exclusion reasons to
+    the number of excluded reports, and other-methods lanes to their records.
+    Mismatches list up to `max_ids` record IDs; memory does not grow with the
+    number of records.
+    """
+    prior_reviews = [p for p in (prior_reviews or []) if p]
+    groups = other_method_groups(other_methods)
+
+    main, prior = _Group(), _Group()
+    lanes = [_Group() for _ in groups]
+    db_origins = 0
+    unclassified = _Tally()
+    no_reason, several_reasons = _Tally(), _Tally()
+
+    for rec in records:
+        rid = str(rec.get("ID", ""))
+        eligible = not rid.startswith("md_")
+
+        if eligible and has_any_origin_prefix(
+            rec, origin_field=origin_field, prefixes=prior_reviews
+        ):
+            prior.tally("prior").add(rid, max_ids)
+            continue
+
+        bucket = status_bucket(get_status(rec))
+        main.tally(bucket).add(rid, max_ids)
+        if bucket == "other":
+            unclassified.add(rid, max_ids)
+
+        lane_idx = None
+        if eligible:
+            for idx, (_, prefixes) in enumerate(groups):
+                if has_any_origin_prefix(rec, origin_field=origin_field, prefixes=prefixes):
+                    lane_idx = idx
+                    lanes[idx].tally("lane").add(rid, max_ids)
+                    break
+
+        if eligible:
+            n_origins = len(split_origin(rec.get(origin_field)))
+            main.kept += 1
+            main.origins += n_origins
+            main.any_origin = main.any_origin or n_origins > 0
+            if lane_idx is None:
+                db_origins += n_origins
+
+        if bucket == "fulltext_excluded":
+            reasons = sum(parse_screening_criteria(rec.get("screening_criteria")).values())
+            if not reasons and rec.get("exclusion_reason"):
+                reasons = 1
+            if reasons == 0:
+                no_reason.add(rid, max_ids)
+            elif reasons > 1:
+                several_reasons.add(rid, max_ids)
+
+    diagram = _params_mapping(params)
+    updated = diagram.get("previous") is not None
+    prefix = "new_db_registers" if updated else "db_registers"
+    inc_prefix = "new_included" if updated else "included"
+    lane = diagram.get(prefix) or {}
+
+    issues: list[ValidationIssue] = []
+
+    def compare(path: str, actual: Optional[int], expected: int, sample: str) -> None:
+        if actual is None or actual == expected:
+            return
+        issues.append(
+            ValidationIssue(
+                severity="error",
+                code="reconcile.count_mismatch",
+                message=f"Diagram: {actual}. Records: {expected}. Records counted: {sample}.",
+                path=path,
+            )
+        )
+
+    # lane boxes vs. status buckets
+    for box, buckets in LANE_BUCKETS.items():
+        compare(
+            f"{prefix}.{box}",
+            as_int_maybe(get_path(lane, *box.split("."))),
+            main.count(*buckets),
+            _sample((main.buckets[b] for b in buckets if b in main.buckets), max_ids),
+        )
+    for field in ("studies", "reports"):
+        compare(
+            f"{inc_prefix}.{field}",
+            as_int_maybe(get_path(diagram, inc_prefix, field)),
+            main.count("included"),
+            _sample([main.tally("included")], max_ids),
+        )
+    if prior_reviews:
+        compare(
+            "previous.studies",
+            as_int_maybe(get_path(diagram, "previous", "studies")),
+            prior.total(),
+            _sample([prior.tally("prior")], max_ids),
+        )
+
+    # identification (origins; records with an "md_" ID are not counted)
+    if main.any_origin:
+        compare(
+            f"{prefix}.identification.databases",
+            sum_counts_any(get_path(lane, "identification", "databases")),
+            db_origins,
+            "origins of database records",
+        )
+        compare(
+            f"{prefix}.removed_before_screening.duplicates",
+            as_int_maybe(get_path(lane, "removed_before_screening", "duplicates")),
+            max(0, main.origins - main.kept),
+            "origins minus retained records",
+        )
+
+    # other-methods lanes
+    om = diagram.get("other_methods")
+    om_lanes = [om] if isinstance(om, Mapping) else list(om or [])
+    om_lanes = [
+        om_lane for om_lane in om_lanes if isinstance(om_lane, Mapping)
+    ]
+    # the loader drops lanes without records: pair lanes by label, else by
+    # position among the non-empty groups
+    position = -1
+    for (label, _), group in zip(groups, lanes):
+        if not group.total():
+            continue
+        position += 1
+        idx = next(
+            (i for i, om_lane in enumerate(om_lanes) if label and om_lane.get("label") == label),
+            position,
+        )
+        om_prefix = "other_methods" if isinstance(om, Mapping) else f"other_methods[{idx}]"
+        om_lane = om_lanes[idx] if idx < len(om_lanes) else {}
+        compare(
+            f"{om_prefix}.identification",
+            sum_counts_any(om_lane.get("identification")),
+            group.total(),
+            _sample([group.tally("lane")], max_ids),
+        )
+
+    # exclusion reasons vs. excluded reports
+    reasons = get_path(lane, "reports", "excluded_reasons")
+    reason_sum = sum_counts_any(reasons) if isinstance(reasons, Mapping) else None
+    excluded = main.count("fulltext_excluded")
+    if reason_sum is not None and reason_sum != excluded:
+        issues.append(
+            ValidationIssue(
+                severity="warning",
+                code="reconcile.reasons_mismatch",
+                message=(
+                    f"Excluded reports: {excluded}. Sum of reasons: {reason_sum}. "
+                    f"Without reason: {_sample([no_reason], max_ids)}. "
+                    f"With several reasons: {_sample([several_reasons], max_ids)}."
+                ),
+                path=f"{prefix}.reports.excluded_reasons",
+            )
+        )
+
+    if unclassified.count:
+        issues.append(
+            ValidationIssue(
+                severity="warning",
+                code="reconcile.unclassified_status",
+                message=(
+                    f"{unclassified.count} record(s) have a status that is not counted "
+                    f"in any box: {_sample([unclassified], max_ids)}."
+                ),
+                path=prefix,
+            )
+        )
+
+    return issues
+
+
+def reconcile_records(
+    params: Any,
+    records_path: Path | str,
+    *,
+    prior_reviews: list[str] | None = None,
+    other_methods: OtherMethodsPrefixes | None = None,
+    origin_field: str = "colrev_origin",
+    max_ids: int = 20,
+) -> list[ValidationIssue]:
+    """Reconcile PRISMA inputs against a records.bib file, streaming it (see `reconcile`)."""
+    fields = {*HEADER_FIELDS, origin_field}
+    return reconcile(
+        params,
+        iter_record_headers(records_path, fields=fields),
+        prior_reviews=prior_reviews,
+        other_methods=other_methods,
+        origin_field=origin_field,
+        max_ids=max_ids,
+    )
@@ -0,0 +1,195 @@
+"""
+Multi-page PDF report: one page per diagram, optionally with its validation
+issues and a table of its counts.
+
+    with PdfReport("qa.pdf") as report:
+        for name, params in reviews.items():
+            report.add_page(params, title=name)
+
+All pages are written to one PDF document, so fonts and other resources are
+embedded once for the whole report instead of once per diagram.
+"""
+
+from __future__ import annotations
+
+import io
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from .batch import issue_line
+from .instrument import stage
+from .loader import counts_table
+from .output import OutputOptions, pdf_metadata, write_if_changed
+from .prisma import Prisma2020Diagram, PrismaStyle, as_diagram, figure_size
+from .validation import ValidationIssue
+
+# in the field order of Prisma2020New / Prisma2020Updated
+_INPUTS = (
+    "previous",
+    "db_registers",
+    "new_db_registers",
+    "included",
+    "other_methods",
+    "new_included",
+)
+
+# side panel (inches)
+_PANEL_WIDTH = 5.5
+_TITLE_HEIGHT = 0.6
+_LINE = 0.17
+_HEADING = 0.35
+
+
+def _diagram_inputs(diagram: Prisma2020Diagram) -> Dict[str, Any]:
+    return {k: getattr(diagram, k) for k in _INPUTS if getattr(diagram, k) is not None}
+
+
+class PdfReport:
+    """
+    Collects pages in memory and writes the PDF on `close` (atomically, and
+    only if its content changed). One matplotlib figure is reused for all
+    pages.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        issues: bool = True,
+        counts: bool = True,
+        figsize: tuple[float, float] = (14, 10),
+        style: Optional[PrismaStyle] = None,
+        output: Optional[OutputOptions] = None,
+    ):
+        self.path = Path(path)
+        self.issues = issues
+        self.counts = counts
+        self.figsize = figsize
+        self.style = style
+        self.pages = 0
+        self.written = False
+        output = output or OutputOptions()
+        self._buffer = io.BytesIO()
+        self._pdf = PdfPages(self._buffer, metadata=pdf_metadata(output))
+        self._figure = Figure()
+
+    def add_page(self, inputs: Any, *, title: Optional[str] = None) -> list[ValidationIssue]:
+        """Draw one diagram (PRISMA inputs, see `as_diagram`); returns its validation issues."""
+        diagram = as_diagram(inputs, style=self.style)
+        issues = diagram.validate() if self.issues else []
+
+        panel: list[tuple[str, str, str]] = []  # (kind, left, right)
+        if self.issues:
+            panel.append(("heading", "Validation", ""))
+            for issue in issues:
+                for i, line in enumerate(textwrap.wrap(issue_line(issue), 72)):
+                    panel.append(("line", line if i == 0 else f"    {line}", ""))
+            if not issues:
+                panel.append(("line", "No issues", ""))
+        if self.counts:
+            panel.append(("heading", "Counts", ""))
+            panel.extend(
+                ("row", field, str(value))
+                for field, value in counts_table(_diagram_inputs(diagram))
+            )
+
+        figure = self._figure
+        figure.clear()
+        with stage("draw"):
+            ax = figure.add_axes((0.0, 0.0, 1.0, 1.0))  # placed below
+            diagram.draw(ax, figsize=self.figsize)
+            if title:
+                ax.set_title(title, loc="left", fontsize=14)
+
+            diagram_w = figure_size(self.figsize, ax.get_xlim())[0]
+            panel_w = _PANEL_WIDTH if panel else 0.0
+            panel_h = sum(_HEADING if kind == "heading" else _LINE for kind, _, _ in panel)
+            diagram_h = self.figsize[1]
+            page_w = diagram_w + panel_w
+            page_h = max(diagram_h, panel_h + 0.5) + _TITLE_HEIGHT
+            figure.set_size_inches(page_w, page_h)
+            bottom = 1.0 - (_TITLE_HEIGHT + diagram_h) / page_h
+            ax.set_position((0.0, bottom, diagram_w / page_w, diagram_h / page_h))
+            if panel:
+                self._draw_panel(figure, panel, left=diagram_w / page_w, page_h=page_h)
+
+        with stage("save"):
+            self._pdf.savefig(figure)
+        self.pages += 1
+        return issues
+
+    def _draw_panel(
+        self, figure: Figure, panel: list[tuple[str, str, str]], *, left: float, page_h: float
+    ) -> None:
+        top = page_h - _TITLE_HEIGHT
+        ax = figure.add_axes((left, 0.0, 1.0 - left, top / page_h))
+        ax.set_xlim(0.0, _PANEL_WIDTH)
+        ax.set_ylim(0.0, top)  # inches from the bottom of the page
+        ax.axis("off")
+        y = top - 0.2
+        for kind, text, value in panel:
+            if kind == "heading":
+                y -= _HEADING
+                ax.text(0.1, y, text, fontsize=11, fontweight="bold", va="bottom")
+                continue
+            y -= _LINE
+            ax.text(0.1, y, text, fontsize=7, va="bottom")
+            if value:
+                ax.text(_PANEL_WIDTH - 0.3, y, value, fontsize=7, va="bottom", ha="right")
+
+    def close(self) -> bool:
+        """
+        Finish the PDF and write it; returns True if the file was written. A
+        report without pages is not written.
+        """
+        if self._pdf is None:
+            return self.written
+        pdf, self._pdf = self._pdf, None
+        with stage("save"):
+            pdf.close()
+            if self.pages:
+                self.written = write_if_changed(self.path, self._buffer.getvalue())
+        return self.written
+
+    def discard(self) -> None:
+        """Drop the pages without writing the file."""
+        if self._pdf is not None:
+            pdf, self._pdf = self._pdf, None
+            pdf.close()
+
+    def __enter__(self) -> "PdfReport":
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_pdf_report(
+    diagrams: Sequence[Any],
+    path: str | Path,
+    *,
+    titles: Optional[Sequence[str]] = None,
+    issues: bool = True,
+    counts: bool = True,
+    figsize: tuple[float, float] = (14, 10),
+    style: Optional[PrismaStyle] = None,
+    output: Optional[OutputOptions] = None,
+) -> Path:
+    """Write one page per diagram (PRISMA inputs) to a single PDF."""
+    if not diagrams:
+        raise ValueError("no diagrams to write")
+    if titles is not None and len(titles) != len(diagrams):
+        raise ValueError("titles must have one entry per diagram")
+    with PdfReport(
+        path, issues=issues, counts=counts, figsize=figsize, style=style, output=output
+    ) as report:
+        for i, inputs in enumerate(diagrams):
+            report.add_page(inputs, title=titles[i] if titles is not None else None)
+    return Path(path)
@@ -0,0 +1,466 @@
+"""
+Local HTTP rendering service (standard library only).
+
+    POST /render?format=svg   body: Prisma2020New/Prisma2020Updated inputs as JSON
+    POST /validate            body: same; returns the validation issues
+    GET  /metrics             Prometheus text format
+    GET  /healthz
+
+Diagrams are drawn by a bounded pool of warm worker processes and repeated
+requests are answered from an LRU cache keyed by a hash of the inputs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import INPUT_KEYS, warm_render_worker
+from .validation import DiagramInputs, validate_diagram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: int = 2
+    max_pending: int = 16  # renders queued or running; more are rejected (503)
+    timeout: float = 30.0  # seconds per render (504 when exceeded)
+    cache_entries: int = 256
+    cache_bytes: int = 64 * 1024 * 1024
+    max_body: int = 1024 * 1024
+
+
+def _render_spec(spec: Mapping[str, Any], fmt: str) -> bytes:
+    # runs in a worker process
+    from .prisma import Prisma2020Diagram  # pylint: disable=import-outside-toplevel
+
+    return Prisma2020Diagram(**spec).render([fmt])[fmt]
+
+
+def _ping() -> int:
+    return 0
+
+
+# -------------------------
+# Response cache and metrics
+# -------------------------
+
+
+class LRUCache:
+    """Rendered bytes by key, bounded by entry count and total size."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = value
+            self._bytes += len(value)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def stats(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._data), self._bytes
+
+
+class Metrics:
+    """Request counters and recent latencies per endpoint."""
+
+    def __init__(self, *, window: int = 1024):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._latency: Dict[str, Deque[float]] = {}
+        self._sum: Dict[str, float] = {}
+        self._window = window
+
+    def observe(self, endpoint: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self._counts[(endpoint, status)] = self._counts.get((endpoint, status), 0) + 1
+            self._latency.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+            self._sum[endpoint] = self._sum.get(endpoint, 0.0) + seconds
+
+    def prometheus(self, gauges: Mapping[str, float]) -> str:
+        lines = [
+            "# TYPE prisma_requests_total counter",
+        ]
+        with self._lock:
+            for (endpoint, status), count in sorted(self._counts.items()):
+                lines.append(
+                    f'prisma_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+            lines.append("# TYPE prisma_request_seconds summary")
+            for endpoint, samples in sorted(self._latency.items()):
+                ordered = sorted(samples)
+                for q in (0.5, 0.95, 0.99):
+                    value = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+                    lines.append(
+                        f'prisma_request_seconds{{endpoint="{endpoint}",quantile="{q}"}} '
+                        f"{value:.6f}"
+                    )
+                total = sum(c for (e, _), c in self._counts.items() if e == endpoint)
+                label = f'{{endpoint="{endpoint}"}}'
+                lines.append(f"prisma_request_seconds_sum{label} {self._sum[endpoint]:.6f}")
+                lines.append(f"prisma_request_seconds_count{label} {total}")
+        lines.append("# TYPE prisma_uptime_seconds gauge")
+        lines.append(f"prisma_uptime_seconds {time.time() - self.started:.3f}")
+        for name, value in gauges.items():
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# Application
+# -------------------------
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str, payload: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
+
+
+class RenderingApp:
+    """Validation, cached rendering through the worker pool, and metrics."""
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.cache = LRUCache(max_entries=config.cache_entries, max_bytes=config.cache_bytes)
+        self.metrics = Metrics()
+        self.pool = self._new_pool()
+        self._slots = threading.BoundedSemaphore(config.max_pending)
+        # identical renders in flight share one future (and the pool running it)
+        self._pending: Dict[str, Tuple[Future, ProcessPoolExecutor]] = {}
+        self._lock = threading.Lock()
+        self.timeouts = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.config.workers, initializer=warm_render_worker
+        )
+
+    def warm_up(self) -> None:
+        """Start all workers (and their imports) before the first request."""
+        futures = [self.pool.submit(_ping) for _ in range(self.config.workers)]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        self._shutdown(self.pool)
+
+    @staticmethod
+    def _shutdown(pool: ProcessPoolExecutor) -> None:
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:  # pragma: no cover
+            pool.shutdown(wait=False)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Start a fresh pool for later requests (a worker died, e.g. out of memory)."""
+        with self._lock:
+            if self.pool is not broken:
+                return  # already replaced by another request
+            self.pool = self._new_pool()
+        self._shutdown(broken)
+
+    @staticmethod
+    def parse_spec(body: bytes) -> Dict[str, Any]:
+        try:
+            spec = json.loads(body)
+        except ValueError as exc:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {exc}") from exc
+        if not isinstance(spec, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Expected a JSON object of diagram inputs")
+        unknown = sorted(set(spec) - INPUT_KEYS)
+        if unknown:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown keys: {', '.join(unknown)}")
+        return spec
+
+    @staticmethod
+    def issues(spec: Mapping[str, Any]) -> list[Dict[str, Any]]:
+        return [asdict(i) for i in validate_diagram(DiagramInputs(**spec))]
+
+    @staticmethod
+    def cache_key(spec: Mapping[str, Any], fmt: str) -> str:
+        canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{fmt}\n{canonical}".encode("utf-8")).hexdigest()
+
+    def render(self, spec: Mapping[str, Any], fmt: str) -> Tuple[bytes, str, bool]:
+        """Encoded diagram, cache key (ETag) and whether it came from the cache."""
+        key = self.cache_key(spec, fmt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, key, True
+
+        pool = self.pool
+        submitted = False
+        try:
+            with self._lock:
+                pending = self._pending.get(key)
+                if pending is not None:
+                    future, pool = pending
+                else:
+                    pool = self.pool
+                    if not self._slots.acquire(blocking=False):
+                        raise RequestError(
+                            HTTPStatus.SERVICE_UNAVAILABLE, "Too many renders in progress"
+                        )
+                    try:
+                        future = pool.submit(_render_spec, dict(spec), fmt)
+                    except BaseException:
+                        self._slots.release()
+                        raise
+                    self._pending[key] = (future, pool)
+                    submitted = True
+            if submitted:
+                # outside the lock: the callback runs at once if the future is already done
+                future.add_done_callback(lambda f, key=key: self._done(key, f))
+            data = future.result(timeout=self.config.timeout)
+        except FutureTimeout as exc:
+            # the worker finishes in the background; its slot is freed then
+            self.timeouts += 1
+            raise RequestError(
+                HTTPStatus.GATEWAY_TIMEOUT, f"Rendering took longer than {self.config.timeout}s"
+            ) from exc
+        except BrokenProcessPool as exc:
+            self._replace_pool(pool)
+            raise RequestError(HTTPStatus.INTERNAL_SERVER_ERROR, "Rendering worker failed") from exc
+        except (TypeError, ValueError) as exc:
+            # raised by Prisma2020Diagram(**spec) in the worker: malformed inputs
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid diagram inputs: {exc}") from exc
+        return data, key, False
+
+    def _done(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        self._slots.release()
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def gauges(self) -> Dict[str, float]:
+        entries, size = self.cache.stats()
+        with self._lock:
+            in_flight = len(self._pending)
+        return {
+            "prisma_cache_hits_total": self.cache.hits,
+            "prisma_cache_misses_total": self.cache.misses,
+            "prisma_cache_entries": entries,
+            "prisma_cache_bytes": size,
+            "prisma_renders_in_flight": in_flight,
+            "prisma_render_timeouts_total": self.timeouts,
+            "prisma_workers": self.config.workers,
+        }
+
+
+# -------------------------
+# HTTP layer
+# -------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logger.info("%s %s", self.address_string(), format % args)
+
+    def _send(
+        self,
+        status: HTTPStatus,
+        body: bytes,
+        content_type: str,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json")
+
+    def _body(self) -> bytes:
+        header = self.headers.get("Content-Length") or "0"
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid Content-Length: {header}")
+        if length > self.server.app.config.max_body:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        return self.rfile.read(length)
+
+    def _dispatch(self, endpoint: str, handler: Any) -> None:
+        t0 = time.perf_counter()
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+        try:
+            status = handler()
+        except RequestError as exc:
+            status = exc.status
+            payload = {"error": str(exc)}
+            if exc.payload is not None:
+                payload["issues"] = exc.payload
+            self._send_json(status, payload)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("request failed")
+            self._send_json(status, {"error": f"{type(exc).__name__}: {exc}"})
+        finally:
+            self.server.app.metrics.observe(endpoint, int(status), time.perf_counter() - t0)
+
+    def do_GET(self) -> None:  # noqa: N802
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self._dispatch("metrics", self._metrics)
+        elif path == "/healthz":
+            self._dispatch("healthz", lambda: self._ok(b"ok\n"))
+        else:
+            self._dispatch("other", self._not_found)
+
+    do_HEAD = do_GET
+
+    def do_POST(self) -> None:  # noqa: N802
+        path = urlsplit(self.path).path
+        if path == "/render":
+            self._dispatch("render", self._render)
+        elif path == "/validate":
+            self._dispatch("validate", self._validate)
+        else:
+            self._dispatch("other", self._not_found)
+
+    def _ok(self, body: bytes) -> HTTPStatus:
+        self._send(HTTPStatus.OK, body, "text/plain; charset=utf-8")
+        return HTTPStatus.OK
+
+    def _not_found(self) -> HTTPStatus:
+        raise RequestError(HTTPStatus.NOT_FOUND, f"No such endpoint: {self.path}")
+
+    def _metrics(self) -> HTTPStatus:
+        app = self.server.app
+        body = app.metrics.prometheus(app.gauges()).encode("utf-8")
+        self._send(HTTPStatus.OK, body, "text/plain; version=0.0.4")
+        return HTTPStatus.OK
+
+    def _validate(self) -> HTTPStatus:
+        spec = self.server.app.parse_spec(self._body())
+        self._send_json(HTTPStatus.OK, {"issues": self.server.app.issues(spec)})
+        return HTTPStatus.OK
+
+    def _render(self) -> HTTPStatus:
+        app = self.server.app
+        query = parse_qs(urlsplit(self.path).query)
+        fmt = (query.get("format") or ["png"])[0].lower()
+        if fmt not in CONTENT_TYPES:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unsupported format: {fmt}")
+        validation = (query.get("validation") or ["raise"])[0]
+        if validation not in {"raise", "warn", "off"}:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unsupported validation: {validation}")
+
+        spec = app.parse_spec(self._body())
+        issues = [] if validation == "off" else app.issues(spec)
+        errors = [i for i in issues if i["severity"] == "error"]
+        if errors and validation == "raise":
+            raise RequestError(
+                HTTPStatus.UNPROCESSABLE_ENTITY, "PRISMA validation failed", payload=issues
+            )
+
+        key = app.cache_key(spec, fmt)
+        if self.headers.get("If-None-Match") == f'"{key}"' and key in app.cache:
+            self._send(HTTPStatus.NOT_MODIFIED, b"", CONTENT_TYPES[fmt], {"ETag": f'"{key}"'})
+            return HTTPStatus.NOT_MODIFIED
+
+        data, key, hit = app.render(spec, fmt)
+        self._send(
+            HTTPStatus.OK,
+            data,
+            CONTENT_TYPES[fmt],
+            {
+                "ETag": f'"{key}"',
+                "X-Cache": "hit" if hit else "miss",
+                "X-Prisma-Issues": str(len(issues)),
+            },
+        )
+        return HTTPStatus.OK
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: ServerConfig, app: RenderingApp):
+        self.app = app
+        super().__init__((config.host, config.port), _Handler)
+
+
+def make_server(config: Optional[ServerConfig] = None) -> _HTTPServer:
+    """Create the server (with its worker pool); call `serve_forever()` on it."""
+    config = config or ServerConfig()
+    return _HTTPServer(config, RenderingApp(config))
+
+
+def serve(config: Optional[ServerConfig] = None) -> None:
+    server = make_server(config)
+    server.app.warm_up()
+    host, port = server.server_address[:2]
+    logger.info("serving on http://%s:%s", host, port)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.app.close()
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+from xml.sax.saxutils import escape
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .prisma import Box, BoxGeometry, PrismaStyle
+
+# ============================================================================
+# Compact SVG renderer
+# ============================================================================
+
+# Fraction of the figure height covered by the axes in matplotlib's default
+# subplot (figure.subplot.top - figure.subplot.bottom). Used to map data units
+# to points so that font sizes match the matplotlib output.
+_AXES_FRACTION = 0.77
+_LINE_HEIGHT = 1.2  # em
+_PADDING = 8.0  # px around the drawing
+
+
+def _parse_pad(boxstyle: str) -> float:
+    """Extract ``pad`` from a matplotlib boxstyle string (e.g. "round,pad=0.06")."""
+    for part in boxstyle.split(",")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip() == "pad":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+class SvgRenderer:
+    """
+    Emit the diagram as hand-written SVG.
+
+    Text is kept as ``<text>`` elements, identical box shapes are defined once
+    in ``<defs>`` and placed with ``<use>``, arrow heads share one marker and
+    coordinates are rounded to ``precision`` decimals.
+    """
+
+    def __init__(
+        self,
+        *,
+        figsize: tuple[float, float],
+        style: PrismaStyle,
+        xlim: tuple[float, float],
+        precision: int = 2,
+    ):
+        self.style = style
+        self.xlim = xlim
+        self.ylim = style.ylim
+        self.precision = precision
+
+        self.scale = 72.0 * figsize[1] * _AXES_FRACTION / (
+            style.ylim[1] - style.ylim[0]
+        )
+
+        self._classes: dict[tuple[str, str, float], str] = {}
+        self._shapes: dict[tuple[str, str, str, str], str] = {}
+        self._body: list[str] = []
+        self._bbox = [float("inf"), float("inf"), float("-inf"), float("-inf")]
+
+    # ------------------------------------------------------------------------
+    # Coordinate helpers
+    # ------------------------------------------------------------------------
+
+    def _num(self, value: float) -> str:
+        text = f"{value:.{self.precision}f}"
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+        return "0" if text in {"-0", ""} else text
+
+    def _x(self, x: float) -> float:
+        return (x - self.xlim[0]) * self.scale
+
+    def _y(self, y: float) -> float:
+        return (self.ylim[1] - y) * self.scale
+
+    def _extend(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        bb = self._bbox
+        bb[0] = min(bb[0], x0, x1)
+        bb[1] = min(bb[1], y0, y1)
+        bb[2] = max(bb[2], x0, x1)
+        bb[3] = max(bb[3], y0, y1)
+
+    def _style_class(self, face: str, edge: str, linewidth: float) -> str:
+        key = (face, edge, linewidth)
+        if key not in self._classes:
+            self._classes[key] = f"s{len(self._classes)}"
+        return self._classes[key]
+
+    def _shape(self, width: str, height: str, rx: str, cls: str) -> str:
+        key = (width, height, rx, cls)
+        if key not in self._shapes:
+            self._shapes[key] = f"r{len(self._shapes)}"
+        return self._shapes[key]
+
+    def _rect(
+        self,
+        *,
+        left: float,
+        bottom: float,
+        width: float,
+        height: float,
+        pad: float,
+        face: str,
+        edge: str,
+        linewidth: float,
+    ) -> None:
+        x0 = self._x(left - pad)
+        y0 = self._y(bottom + height + pad)
+        w = (width + 2 * pad) * self.scale
+        h = (height + 2 * pad) * self.scale
+        cls = self._style_class(face, edge, linewidth)
+        shape = self._shape(self._num(w), self._num(h), self._num(pad * self.scale), cls)
+        self._body.append(
+            f'<use xlink:href="#{shape}" x="{self._num(x0)}" y="{self._num(y0)}"/>'
+        )
+        self._extend(x0, y0, x0 + w, y0 + h)
+
+    def _text(
+        self,
+        x: float,
+        y: float,
+        text: str,
+        *,
+        anchor: str,
+        fontsize: float,
+        rotate: bool = False,
+    ) -> None:
+        sx, sy = self._num(self._x(x)), self._num(self._y(y))
+        lines = text.split("\n")
+        attrs = f'x="{sx}" y="{sy}" font-size="{self._num(fontsize)}"'
+        if anchor != "start":
+            attrs += f' text-anchor="{anchor}"'
+        if rotate:
+            attrs += f' transform="rotate(-90 {sx} {sy})"'
+
+        if len(lines) == 1:
+            self._body.append(f"<text {attrs}>{escape(text)}</text>")
+            return
+
+        first_dy = -(len(lines) - 1) / 2 * _LINE_HEIGHT
+        spans = [f'<tspan x="{sx}" dy="{self._num(first_dy)}em">{escape(lines[0])}</tspan>']
+        spans += [
+            f'<tspan x="{sx}" dy="{_LINE_HEIGHT}em">{escape(line)}</tspan>'
+            for line in lines[1:]
+        ]
+        self._body.append(f"<text {attrs}>{''.join(spans)}</text>")
+
+    # ------------------------------------------------------------------------
+    # Renderer interface (mirrors MatplotlibRenderer)
+    # ------------------------------------------------------------------------
+
+    def set_ylim(self, bottom: float, top: float) -> None:
+        # The viewBox is fitted to the drawn content, so only the top matters.
+        self.ylim = (bottom, self.ylim[1])
+
+    def draw_box(
+        self,
+        box: Box,
+        *,
+        facecolor: Optional[str] = None,
+        edgecolor: Optional[str] = None,
+        fontsize: Optional[int] = None,
+        boxstyle: Optional[str] = None,
+    ) -> BoxGeometry:
+        g = box.geometry()
+        self._rect(
+            left=g.left,
+            bottom=g.bottom,
+            width=g.width,
+            height=g.height,
+            pad=_parse_pad(boxstyle or self.style.boxstyle),
+            face=facecolor or self.style.box_face,
+            edge=edgecolor or self.style.box_edge,
+            linewidth=1,
+        )
+        if box.align == "left":
+            self._text(
+                g.left + 0.08,
+                g.center_y,
+                box.text,
+                anchor="start",
+                fontsize=fontsize or self.style.box_fontsize,
+            )
+        else:
+            self._text(
+                g.center_x,
+                g.center_y,
+                box.text,
+                anchor="middle",
+                fontsize=fontsize or self.style.box_fontsize,
+            )
+        return g
+
+    def draw_arrow(
+        self, xy_from: tuple[float, float], xy_to: tuple[float, float]
+    ) -> None:
+        self.draw_polyline_arrow([xy_from, xy_to])
+
+    def draw_polyline_arrow(self, points: list[tuple[float, float]]) -> None:
+        if len(points) < 2:
+            return
+        coords = [(self._x(x), self._y(y)) for x, y in points]
+        for x, y in coords:
+            self._extend(x, y, x, y)
+        pts = " ".join(f"{self._num(x)},{self._num(y)}" for x, y in coords)
+        self._body.append(f'<polyline class="a" points="{pts}"/>')
+
+    def draw_phase_label(self, xc: float, yc: float, height: float, text: str) -> None:
+        w = self.style.phase_bar_w
+        self._rect(
+            left=xc - w / 2,
+            bottom=yc - height / 2,
+            width=w,
+            height=height,
+            pad=0.06,
+            face=self.style.phase_face,
+            edge="none",
+            linewidth=0,
+        )
+        self._text(xc, yc, text, anchor="middle", fontsize=9, rotate=True)
+
+    # ------------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------------
+
+    def to_string(self) -> str:
+        x0, y0, x1, y1 = self._bbox
+        if x0 > x1:
+            x0 = y0 = x1 = y1 = 0.0
+        x0, y0 = x0 - _PADDING, y0 - _PADDING
+        w, h = x1 - x0 + _PADDING, y1 - y0 + _PADDING
+
+        css = [
+            "text{font-family:DejaVu Sans,Arial,sans-serif;dominant-baseline:central}",
+            ".a{fill:none;stroke:#000;stroke-width:1;marker-end:url(#ah)}",
+        ]
+        for (face, edge, lw), cls in self._classes.items():
+            css.append(f".{cls}{{fill:{face};stroke:{edge};stroke-width:{lw}}}")
+
+        defs = [
+            '<marker id="ah" viewBox="0 0 10 10" refX="10" refY="5" '
+            'markerWidth="8" markerHeight="8" orient="auto">'
+            '<path d="M0,0L10,5L0,10" fill="none" stroke="#000" stroke-width="1.5"/>'
+            "</marker>"
+        ]
+        for (sw, sh, rx, cls), shape in self._shapes.items():
+            defs.append(
+                f'<rect id="{shape}" class="{cls}" width="{sw}" height="{sh}" rx="{rx}"/>'
+            )
+
+        view_box = " ".join(self._num(v) for v in (x0, y0, w, h))
+        return "".join(
+            [
+                '<svg xmlns="http://www.w3.org/2000/svg" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" '
+                f'viewBox="{view_box}" width="{self._num(w)}" height="{self._num(h)}">',
+                f"<style>{''.join(css)}</style>",
+                f"<defs>{''.join(defs)}</defs>",
+                f'<rect x="{self._num(x0)}" y="{self._num(y0)}" '
+                f'width="{self._num(w)}" height="{self._num(h)}" fill="#fff"/>',
+                "".join(self._body),
+                "</svg>\n",
+            ]
+        )
+
+    def save(self, filename: str | Path) -> None:
+        Path(filename).write_text(self.to_string(), encoding="utf-8")
+
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional, Mapping
+from functools import cached_property
+from operator import itemgetter
+from time import perf_counter_ns
+from collections.abc import Mapping
+from typing import Any, Callable, Optional, Sequence, Union
 from typing_extensions import Literal, Protocol
 
 # flake8: noqa
@@ -22,23 +26,52 @@ class ValidationIssue:
     path: str | None = None
 
 
+# anything reported by validation: plain issues or (lazily formatted) rule findings
+Issue = Union[ValidationIssue, "Finding"]
+
+
 class _DiagramLike(Protocol):
     # We avoid importing Prisma2020Diagram to prevent circular imports.
     is_updated: bool
     db_registers: Optional[Mapping[str, Any]]
     included: Optional[Mapping[str, Any]]
-    other_methods: Optional[Mapping[str, Any]]
+    other_methods: Optional[Mapping[str, Any] | list[Mapping[str, Any]]]
     previous: Optional[Mapping[str, Any]]
     new_db_registers: Optional[Mapping[str, Any]]
     new_included: Optional[Mapping[str, Any]]
 
 
+@dataclass(frozen=True)
+class DiagramInputs:
+    """
+    Diagram inputs as accepted by `Prisma2020Diagram`, for validating specs
+    without constructing (and rendering) a diagram.
+    """
+
+    db_registers: Optional[Mapping[str, Any]] = None
+    included: Optional[Mapping[str, Any]] = None
+    other_methods: Optional[Mapping[str, Any] | list[Mapping[str, Any]]] = None
+    previous: Optional[Mapping[str, Any]] = None
+    new_db_registers: Optional[Mapping[str, Any]] = None
+    new_included: Optional[Mapping[str, Any]] = None
+
+    @property
+    def is_updated(self) -> bool:
+        # same rule as Prisma2020Diagram
+        return (
+            self.previous is not None
+            or self.new_db_registers is not None
+            or self.new_included is not None
+        )
+
+
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
 
 
-def _as_int_maybe(x: Any) -> Optional[int]:
+def as_int_maybe(x: Any) -> Optional[int]:
+    """The value as an int, or None if it is not a count."""
     if x is None:
         return None
     if isinstance(x, bool):
@@ -51,7 +84,7 @@ def _as_int_maybe(x: Any) -> Optional[int]:
         return None
 
 
-def _sum_counts_any(x: Any) -> Optional[int]:
+def sum_counts_any(x: Any) -> Optional[int]:
     """
     Sum count-like values.
 
@@ -81,7 +114,8 @@ def _sum_counts_any(x: Any) -> Optional[int]:
         return None
 
 
-def _get_path(d: Any, *keys: str) -> Any:
+def get_path(d: Any, *keys: str) -> Any:
+    """Value at the nested keys, or None if any of them is missing."""
     cur: Any = d
     for k in keys:
         if not isinstance(cur, Mapping) or k not in cur:
@@ -94,14 +128,14 @@ def _lane(diagram: _DiagramLike) -> Optional[Mapping[str, Any]]:
     return diagram.new_db_registers if diagram.is_updated else diagram.db_registers
 
 
-def _mk(
-    severity: Severity, code: str, message: str, path: str | None = None
-) -> ValidationIssue:
-    return ValidationIssue(severity=severity, code=code, message=message, path=path)
-
-
-def _neg(x: Optional[int]) -> bool:
-    return x is not None and x < 0
+def _other_lanes(diagram: _DiagramLike) -> list[tuple[str, Any]]:
+    """(path prefix, lane) for each other-methods lane."""
+    om = diagram.other_methods
+    if om is None:
+        return []
+    if isinstance(om, Mapping):
+        return [("other_methods", om)]
+    return [(f"other_methods[{i}]", lane) for i, lane in enumerate(om)]
 
 
 # -----------------------------------------------------------------------------
@@ -128,14 +162,14 @@ def _lane_name_from_path(path: str | None) -> str:
         return "the databases/registers lane"
     if head == "new_db_registers":
         return "the new databases/registers lane"
-    if head == "other_methods":
+    if head.startswith("other_methods"):
         return "the other-methods lane"
     if head in {"included", "new_included"}:
         return "the included block"
     return head.replace("_", " ")
 
 
-def _human_issue(issue: ValidationIssue) -> tuple[str, str]:
+def _human_issue(issue: Issue) -> tuple[str, str]:
     """
     Return (title_line, body_text) where:
       - title_line is: "WARNING: Included exceeds assessed" (colored)
@@ -355,347 +389,535 @@ def _human_issue(issue: ValidationIssue) -> tuple[str, str]:
 
 
 # -----------------------------------------------------------------------------
-# Lane validation (shared by main lane and other_methods lane)
+# Snapshot: input values extracted and normalized once per diagram
 # -----------------------------------------------------------------------------
 
+# lane section -> (value name, key) pairs read from it
+_LANE_FIELDS: tuple[tuple[str, tuple[tuple[str, str], ...]], ...] = (
+    (
+        "removed_before_screening",
+        (
+            ("duplicates", "duplicates"),
+            ("automation", "automation"),
+            ("other_removed", "other"),
+        ),
+    ),
+    ("records", (("screened", "screened"), ("excluded", "excluded"))),
+    (
+        "reports",
+        (
+            ("sought", "sought"),
+            ("not_retrieved", "not_retrieved"),
+            ("assessed", "assessed"),
+        ),
+    ),
+)
 
-def _validate_lane(
-    *,
-    lane: Mapping[str, Any],
-    issues: list[ValidationIssue],
-    prefix: str,
-    check_identification: bool,
-) -> None:
+
+def _kind(value: Any) -> str:
+    if value is None:
+        return "missing"
+    return "mapping" if isinstance(value, Mapping) else "invalid"
+
+
+def _lane_values(
+    lane: Mapping[str, Any], *, prefix: str, check_identification: bool
+) -> dict[str, Any]:
     """
-    Validate one PRISMA lane structure.
+    Normalized counts of one lane plus derived values used by the rules.
 
-    - prefix: used in issue paths, e.g. "db_registers" or "other_methods"
-    - check_identification: True for main db/register lane; False for other_methods lane
-      (because other_methods identification schema differs)
+    `identified` is only computed for the main lane (other-methods lanes use a
+    different identification schema), so identification rules do not fire there.
     """
-    identified: Optional[int] = None
+    values: dict[str, Any] = {"prefix": prefix}
+    for section, fields in _LANE_FIELDS:
+        block = get_path(lane, section)
+        if not isinstance(block, Mapping):
+            block = {}
+        for name, key in fields:
+            values[name] = as_int_maybe(block.get(key))
 
+    identified: Optional[int] = None
     if check_identification:
-        databases_val = _get_path(lane, "identification", "databases")
-        registers_val = _get_path(lane, "identification", "registers")
-        db_total = _sum_counts_any(databases_val)
-        reg_total = _sum_counts_any(registers_val)
+        db_total = sum_counts_any(get_path(lane, "identification", "databases"))
+        reg_total = sum_counts_any(get_path(lane, "identification", "registers"))
         if db_total is not None or reg_total is not None:
             identified = int((db_total or 0) + (reg_total or 0))
+    values["identified"] = identified
 
-    dup = _as_int_maybe(_get_path(lane, "removed_before_screening", "duplicates"))
-    auto = _as_int_maybe(_get_path(lane, "removed_before_screening", "automation"))
-    other_removed = _as_int_maybe(_get_path(lane, "removed_before_screening", "other"))
-    removed_sum = sum(x for x in (dup, auto, other_removed) if x is not None)
-
-    screened = _as_int_maybe(_get_path(lane, "records", "screened"))
-    excluded_records = _as_int_maybe(_get_path(lane, "records", "excluded"))
-
-    sought = _as_int_maybe(_get_path(lane, "reports", "sought"))
-    not_retrieved = _as_int_maybe(_get_path(lane, "reports", "not_retrieved"))
-    assessed = _as_int_maybe(_get_path(lane, "reports", "assessed"))
-
-    # Negative checks (errors)
-    for name, val, path in [
-        ("duplicates", dup, f"{prefix}.removed_before_screening.duplicates"),
-        ("automation", auto, f"{prefix}.removed_before_screening.automation"),
-        ("other_removed", other_removed, f"{prefix}.removed_before_screening.other"),
-        ("screened", screened, f"{prefix}.records.screened"),
-        ("excluded", excluded_records, f"{prefix}.records.excluded"),
-        ("sought", sought, f"{prefix}.reports.sought"),
-        ("not_retrieved", not_retrieved, f"{prefix}.reports.not_retrieved"),
-        ("assessed", assessed, f"{prefix}.reports.assessed"),
-    ]:
-        if _neg(val):
-            issues.append(
-                _mk(
-                    "error", "negative.count", f"{name} must be >= 0 (got {val}).", path
-                )
-            )
+    removed = sum(
+        v
+        for v in (values["duplicates"], values["automation"], values["other_removed"])
+        if v is not None
+    )
+    values["removed"] = removed
+    values["available"] = None if identified is None else identified - removed
 
-    if check_identification and _neg(identified):
-        issues.append(
-            _mk(
-                "error",
-                "negative.count",
-                f"identified must be >= 0 (got {identified}).",
-                f"{prefix}.identification",
-            )
-        )
+    assessed, not_retrieved = values["assessed"], values["not_retrieved"]
+    values["split"] = (
+        None if assessed is None or not_retrieved is None else assessed + not_retrieved
+    )
+    return values
 
-    # Hard consistency (errors)
-    if check_identification and identified is not None and removed_sum > identified:
-        issues.append(
-            _mk(
-                "error",
-                "inconsistent.removed_gt_identified",
-                f"Identified: {identified}. Removed before screening: {removed_sum}.",
-                f"{prefix}.removed_before_screening",
-            )
-        )
 
-    # Plausibility (warnings)
-    if screened is None:
-        issues.append(
-            _mk(
-                "warning",
-                "missing.records.screened",
-                "records.screened is missing.",
-                f"{prefix}.records.screened",
-            )
-        )
+@dataclass(frozen=True)
+class _OtherLane:
+    values: dict[str, Any]  # lane values (only meaningful if has_lane_bits)
+    structure: dict[str, Any]  # prefix + kinds of identification/reports
+    has_lane_bits: bool
 
-    if check_identification and identified is not None and screened is not None:
-        remaining = identified - removed_sum
-        if remaining >= 0 and screened > remaining:
-            issues.append(
-                _mk(
-                    "warning",
-                    "suspicious.screened_gt_remaining",
-                    f"Identified: {identified}. Removed before screening: {removed_sum}. Available to screen: {remaining}. Reported as screened: {screened}.",
-                    f"{prefix}.records.screened",
-                )
-            )
 
-    if (
-        screened is not None
-        and excluded_records is not None
-        and excluded_records > screened
-    ):
-        issues.append(
-            _mk(
-                "warning",
-                "suspicious.excluded_gt_screened",
-                f"Screened: {screened}. Excluded: {excluded_records}.",
-                f"{prefix}.records.excluded",
-            )
-        )
+@dataclass(frozen=True)
+class Snapshot:
+    diagram: dict[str, Any]
+    lane: Optional[dict[str, Any]]
+    included: Optional[dict[str, Any]]
+    others: list[_OtherLane]
 
-    if sought is None:
-        issues.append(
-            _mk(
-                "warning",
-                "missing.reports.sought",
-                "reports.sought is missing.",
-                f"{prefix}.reports.sought",
+
+def snapshot(diagram: _DiagramLike) -> Snapshot:
+    """Extract and normalize all rule inputs of a diagram (one pass)."""
+    updated = diagram.is_updated
+    lane = _lane(diagram)
+    main_prefix = "new_db_registers" if updated else "db_registers"
+
+    diagram_values = {
+        "is_updated": updated,
+        "has_lane": lane is not None,
+        "has_previous": diagram.previous is not None,
+        "has_new_included": diagram.new_included is not None,
+        "has_new_db_registers": diagram.new_db_registers is not None,
+        "has_included": diagram.included is not None,
+        "has_db_registers": diagram.db_registers is not None,
+    }
+    if lane is None:
+        return Snapshot(diagram=diagram_values, lane=None, included=None, others=[])
+
+    lane_values = _lane_values(lane, prefix=main_prefix, check_identification=True)
+
+    inc_block = (diagram.new_included if updated else diagram.included) or {}
+    included_values = {
+        "prefix": main_prefix,
+        "inc_prefix": "new_included" if updated else "included",
+        "included_studies": as_int_maybe(inc_block.get("studies")),
+        "included_reports": as_int_maybe(inc_block.get("reports")),
+        "assessed": lane_values["assessed"],
+        "has_identification": get_path(lane, "identification") is not None,
+    }
+
+    others = []
+    for om_prefix, om in _other_lanes(diagram):
+        records = get_path(om, "records")
+        reports = get_path(om, "reports")
+        has_lane_bits = isinstance(records, Mapping) or isinstance(reports, Mapping)
+        others.append(
+            _OtherLane(
+                values=(
+                    _lane_values(om, prefix=om_prefix, check_identification=False)
+                    if has_lane_bits
+                    else {}
+                ),
+                structure={
+                    "prefix": om_prefix,
+                    "identification": _kind(get_path(om, "identification")),
+                    "reports": _kind(reports),
+                },
+                has_lane_bits=has_lane_bits,
             )
         )
-    else:
-        if not_retrieved is not None and not_retrieved > sought:
-            issues.append(
-                _mk(
-                    "warning",
-                    "suspicious.not_retrieved_gt_sought",
-                    f"Sought: {sought}. Not retrieved: {not_retrieved}.",
-                    f"{prefix}.reports.not_retrieved",
-                )
-            )
-        if assessed is not None and assessed > sought:
-            issues.append(
-                _mk(
-                    "warning",
-                    "suspicious.assessed_gt_sought",
-                    f"Sought: {sought}. Assessed: {assessed}.",
-                    f"{prefix}.reports.assessed",
-                )
-            )
-        if (
-            assessed is not None
-            and not_retrieved is not None
-            and assessed + not_retrieved != sought
-        ):
-            issues.append(
-                _mk(
-                    "warning",
-                    "suspicious.sought_split_mismatch",
-                    f"Sought: {sought}. Assessed: {assessed}. Not retrieved: {not_retrieved}. Assessed + Not retrieved = {assessed + not_retrieved}.",
-                    f"{prefix}.reports",
-                )
-            )
+
+    return Snapshot(
+        diagram=diagram_values,
+        lane=lane_values,
+        included=included_values,
+        others=others,
+    )
 
 
 # -----------------------------------------------------------------------------
-# Public API
+# Rules
 # -----------------------------------------------------------------------------
 
+# "diagram": required blocks; "lane": main lane and other-methods lanes with
+# records/reports; "included": included block vs. main lane; "other": structure
+# of each other-methods lane.
+RuleScope = Literal["diagram", "lane", "included", "other"]
 
-def validate_diagram(diagram: _DiagramLike) -> list[ValidationIssue]:
-    issues: list[ValidationIssue] = []
 
-    lane = _lane(diagram)
-    if lane is None:
-        issues.append(
-            _mk(
-                "error",
-                "missing.lane",
-                "Missing db/registers lane block.",
-                "db_registers/new_db_registers",
-            )
+@dataclass(frozen=True)
+class Rule:
+    """
+    A validation rule over one scope of the snapshot.
+
+    `check` receives the values named in `inputs` (in order). `message` and
+    `path` are `str.format` templates over the scope's values and are only
+    formatted when a finding is reported.
+    """
+
+    name: str
+    code: str
+    severity: Severity
+    scope: RuleScope
+    inputs: tuple[str, ...]
+    check: Callable[..., bool]
+    message: str
+    path: str
+    fatal: bool = False  # stop evaluating further rules if this one fires
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A rule hit; exposes the same fields as `ValidationIssue`."""
+
+    rule: Rule
+    values: Mapping[str, Any]
+
+    @property
+    def severity(self) -> Severity:
+        return self.rule.severity
+
+    @property
+    def code(self) -> str:
+        return self.rule.code
+
+    @cached_property
+    def message(self) -> str:
+        return self.rule.message.format_map(self.values)
+
+    @cached_property
+    def path(self) -> str:
+        return self.rule.path.format_map(self.values)
+
+    def issue(self) -> ValidationIssue:
+        return ValidationIssue(
+            severity=self.severity, code=self.code, message=self.message, path=self.path
         )
-        return issues
-
-    # Required blocks (mode-specific)
-    if diagram.is_updated:
-        if diagram.previous is None:
-            issues.append(
-                _mk(
-                    "error",
-                    "missing.previous",
-                    "Updated review requires previous=...",
-                    "previous",
-                )
-            )
-        if diagram.new_included is None:
-            issues.append(
-                _mk(
-                    "error",
-                    "missing.new_included",
-                    "Updated review requires new_included=...",
-                    "new_included",
-                )
-            )
-        if diagram.new_db_registers is None:
-            issues.append(
-                _mk(
-                    "error",
-                    "missing.new_db_registers",
-                    "Updated review requires new_db_registers=...",
-                    "new_db_registers",
-                )
-            )
-    else:
-        if diagram.included is None:
-            issues.append(
-                _mk(
-                    "error",
-                    "missing.included",
-                    "New review requires included=...",
-                    "included",
-                )
-            )
-        if diagram.db_registers is None:
-            issues.append(
-                _mk(
-                    "error",
-                    "missing.db_registers",
-                    "New review requires db_registers=...",
-                    "db_registers",
-                )
-            )
 
-    # Main lane
-    main_prefix = "new_db_registers" if diagram.is_updated else "db_registers"
-    _validate_lane(
-        lane=lane, issues=issues, prefix=main_prefix, check_identification=True
+
+def _present(*values: Any) -> bool:
+    return all(v is not None for v in values)
+
+
+def _is_negative(x: Optional[int]) -> bool:
+    return x is not None and x < 0
+
+
+def _gt(a: Optional[int], b: Optional[int]) -> bool:
+    """a > b (False if either is missing)."""
+    return a is not None and b is not None and a > b
+
+
+def _negative(name: str, path: str, scope: RuleScope = "lane") -> Rule:
+    return Rule(
+        name=f"negative.{name}",
+        code="negative.count",
+        severity="error",
+        scope=scope,
+        inputs=(name,),
+        check=_is_negative,
+        message=f"{name} must be >= 0 (got {{{name}}}).",
+        path=path,
     )
 
-    # Included plausibility
-    if diagram.is_updated:
-        inc_block = diagram.new_included or {}
-        inc_prefix = "new_included"
-    else:
-        inc_block = diagram.included or {}
-        inc_prefix = "included"
-
-    included_studies = _as_int_maybe(inc_block.get("studies"))
-    included_reports = _as_int_maybe(inc_block.get("reports"))
-
-    for name, val, path in [
-        ("included_studies", included_studies, f"{inc_prefix}.studies"),
-        ("included_reports", included_reports, f"{inc_prefix}.reports"),
-    ]:
-        if _neg(val):
-            issues.append(
-                _mk(
-                    "error", "negative.count", f"{name} must be >= 0 (got {val}).", path
-                )
-            )
 
-    assessed_main = _as_int_maybe(_get_path(lane, "reports", "assessed"))
-    if (
-        assessed_main is not None
-        and included_reports is not None
-        and included_reports > assessed_main
-    ):
-        issues.append(
-            _mk(
-                "warning",
-                "suspicious.included_reports_gt_assessed",
-                f"Assessed: {assessed_main}. Included reports: {included_reports}.",
-                f"{inc_prefix}.reports",
-            )
-        )
+def _required(block: str, *, updated: bool) -> Rule:
+    mode = "Updated" if updated else "New"
+    return Rule(
+        name=f"missing.{block}",
+        code=f"missing.{block}",
+        severity="error",
+        scope="diagram",
+        inputs=("is_updated", f"has_{block}"),
+        check=lambda is_updated, present: is_updated is updated and not present,
+        message=f"{mode} review requires {block}=...",
+        path=block,
+    )
 
-    if _get_path(lane, "identification") is None:
-        issues.append(
-            _mk(
-                "warning",
-                "missing.identification",
-                "identification block is missing.",
-                f"{main_prefix}.identification",
-            )
-        )
 
-    # other_methods
-    if diagram.other_methods is not None:
-        om = diagram.other_methods
+def _other_structure(part: str, kind: str, text: str) -> Rule:
+    return Rule(
+        name=f"other_methods.{kind}.{part}",
+        code=f"other_methods.{kind}.{part}",
+        severity="warning",
+        scope="other",
+        inputs=(part,),
+        check=lambda value: value == kind,
+        message=f"{{prefix}}.{part} {text}.",
+        path=f"{{prefix}}.{part}",
+    )
 
-        has_lane_bits = isinstance(_get_path(om, "records"), Mapping) or isinstance(
-            _get_path(om, "reports"), Mapping
-        )
-        if has_lane_bits:
-            _validate_lane(
-                lane=om,
-                issues=issues,
-                prefix="other_methods",
-                check_identification=False,
-            )
 
-        ident = _get_path(om, "identification")
-        if ident is None:
-            issues.append(
-                _mk(
-                    "warning",
-                    "other_methods.missing.identification",
-                    "other_methods.identification is missing.",
-                    "other_methods.identification",
-                )
-            )
-        elif not isinstance(ident, Mapping):
-            issues.append(
-                _mk(
-                    "warning",
-                    "other_methods.invalid.identification",
-                    "other_methods.identification is not a mapping.",
-                    "other_methods.identification",
-                )
-            )
+RULES: tuple[Rule, ...] = (
+    # --- required blocks ---
+    Rule(
+        name="missing.lane",
+        code="missing.lane",
+        severity="error",
+        scope="diagram",
+        inputs=("has_lane",),
+        check=lambda has_lane: not has_lane,
+        message="Missing db/registers lane block.",
+        path="db_registers/new_db_registers",
+        fatal=True,
+    ),
+    _required("previous", updated=True),
+    _required("new_included", updated=True),
+    _required("new_db_registers", updated=True),
+    _required("included", updated=False),
+    _required("db_registers", updated=False),
+    # --- lanes: negative counts ---
+    _negative("duplicates", "{prefix}.removed_before_screening.duplicates"),
+    _negative("automation", "{prefix}.removed_before_screening.automation"),
+    _negative("other_removed", "{prefix}.removed_before_screening.other"),
+    _negative("screened", "{prefix}.records.screened"),
+    _negative("excluded", "{prefix}.records.excluded"),
+    _negative("sought", "{prefix}.reports.sought"),
+    _negative("not_retrieved", "{prefix}.reports.not_retrieved"),
+    _negative("assessed", "{prefix}.reports.assessed"),
+    _negative("identified", "{prefix}.identification"),
+    # --- lanes: consistency (errors) ---
+    Rule(
+        name="inconsistent.removed_gt_identified",
+        code="inconsistent.removed_gt_identified",
+        severity="error",
+        scope="lane",
+        inputs=("removed", "identified"),
+        check=_gt,
+        message="Identified: {identified}. Removed before screening: {removed}.",
+        path="{prefix}.removed_before_screening",
+    ),
+    # --- lanes: plausibility (warnings) ---
+    Rule(
+        name="missing.records.screened",
+        code="missing.records.screened",
+        severity="warning",
+        scope="lane",
+        inputs=("screened",),
+        check=lambda screened: screened is None,
+        message="records.screened is missing.",
+        path="{prefix}.records.screened",
+    ),
+    Rule(
+        name="suspicious.screened_gt_remaining",
+        code="suspicious.screened_gt_remaining",
+        severity="warning",
+        scope="lane",
+        inputs=("screened", "available"),
+        check=lambda screened, available: _gt(screened, available) and available >= 0,
+        message=(
+            "Identified: {identified}. Removed before screening: {removed}. "
+            "Available to screen: {available}. Reported as screened: {screened}."
+        ),
+        path="{prefix}.records.screened",
+    ),
+    Rule(
+        name="suspicious.excluded_gt_screened",
+        code="suspicious.excluded_gt_screened",
+        severity="warning",
+        scope="lane",
+        inputs=("excluded", "screened"),
+        check=_gt,
+        message="Screened: {screened}. Excluded: {excluded}.",
+        path="{prefix}.records.excluded",
+    ),
+    Rule(
+        name="missing.reports.sought",
+        code="missing.reports.sought",
+        severity="warning",
+        scope="lane",
+        inputs=("sought",),
+        check=lambda sought: sought is None,
+        message="reports.sought is missing.",
+        path="{prefix}.reports.sought",
+    ),
+    Rule(
+        name="suspicious.not_retrieved_gt_sought",
+        code="suspicious.not_retrieved_gt_sought",
+        severity="warning",
+        scope="lane",
+        inputs=("not_retrieved", "sought"),
+        check=_gt,
+        message="Sought: {sought}. Not retrieved: {not_retrieved}.",
+        path="{prefix}.reports.not_retrieved",
+    ),
+    Rule(
+        name="suspicious.assessed_gt_sought",
+        code="suspicious.assessed_gt_sought",
+        severity="warning",
+        scope="lane",
+        inputs=("assessed", "sought"),
+        check=_gt,
+        message="Sought: {sought}. Assessed: {assessed}.",
+        path="{prefix}.reports.assessed",
+    ),
+    Rule(
+        name="suspicious.sought_split_mismatch",
+        code="suspicious.sought_split_mismatch",
+        severity="warning",
+        scope="lane",
+        inputs=("split", "sought"),
+        check=lambda split, sought: _present(split, sought) and split != sought,
+        message=(
+            "Sought: {sought}. Assessed: {assessed}. Not retrieved: {not_retrieved}. "
+            "Assessed + Not retrieved = {split}."
+        ),
+        path="{prefix}.reports",
+    ),
+    # --- included block ---
+    _negative("included_studies", "{inc_prefix}.studies", scope="included"),
+    _negative("included_reports", "{inc_prefix}.reports", scope="included"),
+    Rule(
+        name="suspicious.included_reports_gt_assessed",
+        code="suspicious.included_reports_gt_assessed",
+        severity="warning",
+        scope="included",
+        inputs=("included_reports", "assessed"),
+        check=_gt,
+        message="Assessed: {assessed}. Included reports: {included_reports}.",
+        path="{inc_prefix}.reports",
+    ),
+    Rule(
+        name="missing.identification",
+        code="missing.identification",
+        severity="warning",
+        scope="included",
+        inputs=("has_identification",),
+        check=lambda has_identification: not has_identification,
+        message="identification block is missing.",
+        path="{prefix}.identification",
+    ),
+    # --- other-methods lanes (structure) ---
+    _other_structure("identification", "missing", "is missing"),
+    _other_structure("identification", "invalid", "is not a mapping"),
+    _other_structure("reports", "missing", "is missing"),
+    _other_structure("reports", "invalid", "is not a mapping"),
+)
 
-        rep = _get_path(om, "reports")
-        if rep is None:
-            issues.append(
-                _mk(
-                    "warning",
-                    "other_methods.missing.reports",
-                    "other_methods.reports is missing.",
-                    "other_methods.reports",
-                )
-            )
-        elif not isinstance(rep, Mapping):
-            issues.append(
-                _mk(
-                    "warning",
-                    "other_methods.invalid.reports",
-                    "other_methods.reports is not a mapping.",
-                    "other_methods.reports",
-                )
+
+# -----------------------------------------------------------------------------
+# Engine
+# -----------------------------------------------------------------------------
+
+
+def _compile(rule: Rule) -> Callable[[Mapping[str, Any]], bool]:
+    """Bind a rule's input lookup to its check (values -> hit)."""
+    check = rule.check
+    if len(rule.inputs) == 1:
+        (name,) = rule.inputs
+        return lambda values: check(values[name])
+    getter = itemgetter(*rule.inputs)
+    return lambda values: check(*getter(values))
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    hits: int = 0
+    ns: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.ns / 1e9
+
+
+class ValidationEngine:
+    """
+    Evaluate a rule table against diagram snapshots.
+
+    `stats` accumulates calls, hits and time per rule name (and the snapshot
+    extraction under "snapshot") across runs; see `reset_stats`. One clock read
+    per rule keeps the overhead low, so bookkeeping of a hit is attributed to
+    the following rule.
+    """
+
+    def __init__(self, rules: Sequence[Rule] = RULES):
+        names = [r.name for r in rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Rule names must be unique.")
+        self.rules = tuple(rules)
+        self._by_scope: dict[str, list[tuple[Rule, Callable, RuleStats]]] = {}
+        self.stats: dict[str, RuleStats] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stats = {"snapshot": RuleStats()}
+        self._by_scope = {}
+        for rule in self.rules:
+            stats = self.stats[rule.name] = RuleStats()
+            self._by_scope.setdefault(rule.scope, []).append(
+                (rule, _compile(rule), stats)
             )
 
-    return issues
+    def _apply(
+        self, scope: RuleScope, values: Mapping[str, Any], out: list[Finding]
+    ) -> bool:
+        """Append findings of one scope; returns True if a fatal rule fired."""
+        clock = perf_counter_ns
+        t0 = clock()
+        for rule, evaluate, stats in self._by_scope.get(scope, ()):
+            hit = evaluate(values)
+            t1 = clock()
+            stats.ns += t1 - t0
+            stats.calls += 1
+            t0 = t1
+            if hit:
+                stats.hits += 1
+                out.append(Finding(rule, values))
+                if rule.fatal:
+                    return True
+        return False
+
+    def run(self, diagram: _DiagramLike) -> list[Finding]:
+        t0 = perf_counter_ns()
+        snap = snapshot(diagram)
+        stats = self.stats["snapshot"]
+        stats.ns += perf_counter_ns() - t0
+        stats.calls += 1
+
+        findings: list[Finding] = []
+        if self._apply("diagram", snap.diagram, findings) or snap.lane is None:
+            return findings
+
+        self._apply("lane", snap.lane, findings)
+        if snap.included is not None:
+            self._apply("included", snap.included, findings)
+        for other in snap.others:
+            if other.has_lane_bits:
+                self._apply("lane", other.values, findings)
+            self._apply("other", other.structure, findings)
+        return findings
+
+
+DEFAULT_ENGINE = ValidationEngine()
+
+
+# -----------------------------------------------------------------------------
+# Public API
+# -----------------------------------------------------------------------------
+
+
+def validate_diagram(
+    diagram: _DiagramLike, *, engine: Optional[ValidationEngine] = None
+) -> list[ValidationIssue]:
+    """Run all validation rules on a diagram."""
+    return [f.issue() for f in find_issues(diagram, engine=engine)]
+
+
+def find_issues(
+    diagram: _DiagramLike, *, engine: Optional[ValidationEngine] = None
+) -> list[Finding]:
+    """
+    Like `validate_diagram`, but returns the rule findings themselves.
+
+    Findings expose `severity`, `code`, `message` and `path` like
+    `ValidationIssue`; messages are only formatted when accessed
+    (use `Finding.issue()` for a plain value).
+    """
+    return (engine or DEFAULT_ENGINE).run(diagram)
 
 
 def handle_validation(
-    issues: list[ValidationIssue], *, mode: ValidationMode = "warn"
+    issues: Sequence[Issue], *, mode: ValidationMode = "warn"
 ) -> None:
     if mode == "off" or not issues:
         return
@@ -720,7 +942,7 @@ def handle_validation(
         print("\n\n".join(out))
 
 
-def _format_issues(issues: list[ValidationIssue], *, title: str) -> str:
+def _format_issues(issues: Sequence[Issue], *, title: str) -> str:
     lines = [title + ":\n"]
     for i in issues:
         title_line, body_text = _human_issue(i)
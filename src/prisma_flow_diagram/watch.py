@@ -0,0 +1,346 @@
+"""Re-render diagrams when records files change (inotify, with a polling fallback)."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from .batch import RenderJob, issue_line
+from .loader import Prisma2020New, Prisma2020Updated, status_from_records
+from .reconcile import HEADER_FIELDS, RecordsCache
+from .validation import DiagramInputs, ValidationIssue, validate_diagram
+
+# -------------------------
+# File watchers
+# -------------------------
+
+# inotify(7) event masks
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_IN_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (+ name)
+
+
+def _os_error() -> OSError:
+    errno = ctypes.get_errno()
+    return OSError(errno, os.strerror(errno))
+
+
+class InotifyWatcher:
+    """
+    Linux inotify through libc. The folders of the files are watched, so that
+    files replaced by a rename (as editors and CoLRev do) are still seen.
+    """
+
+    def __init__(self, paths: Iterable[Path | str]):
+        self.paths = {Path(p).resolve() for p in paths}
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise _os_error()
+        self._dirs: Dict[int, Path] = {}
+        for directory in {p.parent for p in self.paths}:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+            if wd < 0:
+                error = _os_error()
+                os.close(self._fd)
+                raise error
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Watched files changed within `timeout` seconds (None: block)."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _IN_EVENT.size <= len(data):
+            wd, _, _, length = _IN_EVENT.unpack_from(data, offset)
+            offset += _IN_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if path in self.paths:
+                    changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Compares modification time, size and inode every `interval` seconds."""
+
+    def __init__(self, paths: Iterable[Path | str], *, interval: float = 0.5):
+        self.paths = {Path(p).resolve() for p in paths}
+        self.interval = interval
+        self._state = {p: self._stat(p) for p in self.paths}
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[tuple[int, int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                current = self._stat(path)
+                if current != self._state[path]:
+                    self._state[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+Watcher = Any  # InotifyWatcher | PollingWatcher
+
+
+def open_watcher(
+    paths: Iterable[Path | str], *, poll_interval: float = 0.5, polling: bool = False
+) -> Watcher:
+    """An inotify watcher where available, else a polling one."""
+    paths = list(paths)
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):  # no inotify (limits, containers, ...)
+            pass
+    return PollingWatcher(paths, interval=poll_interval)
+
+
+def wait_for_changes(
+    watcher: Watcher, *, debounce: float = 0.2, timeout: Optional[float] = None
+) -> Set[Path]:
+    """
+    Block until watched files change, then until they have not changed for
+    `debounce` seconds (a burst of writes is reported once). Returns an empty
+    set if nothing changed within `timeout` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    changed: Set[Path] = set()
+    while not changed:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            return changed
+        changed = watcher.wait(remaining)
+
+    quiet_until = time.monotonic() + debounce
+    while True:
+        remaining = quiet_until - time.monotonic()
+        if remaining <= 0:
+            return changed
+        more = watcher.wait(remaining)
+        if more:
+            changed |= more
+            quiet_until = time.monotonic() + debounce
+
+
+# -------------------------
+# Warm rendering
+# -------------------------
+
+
+class WarmRenderer:
+    """
+    Draws every update onto the same matplotlib figure, so that the backend,
+    fonts and figure are set up once.
+    """
+
+    def __init__(self, *, figsize: tuple[float, float] = (14, 10), output: Any = None):
+        # imported here: rendering pulls in matplotlib
+        from matplotlib.figure import Figure  # pylint: disable=import-outside-toplevel
+
+        from .output import OutputOptions  # pylint: disable=import-outside-toplevel
+
+        self.figsize = figsize
+        self.output = output or OutputOptions()
+        self.figure = Figure(figsize=figsize)
+
+    def warm_up(self) -> None:
+        """Import the diagram code and build the font cache before the first update."""
+        from . import prisma  # noqa: F401  pylint: disable=unused-import,import-outside-toplevel
+
+        self.figure.text(0.5, 0.5, "warm-up")
+        self.figure.savefig(io.BytesIO(), format="png")
+        self.figure.clear()
+
+    def save(
+        self, params: Prisma2020New | Prisma2020Updated, outputs: Sequence[Path | str]
+    ) -> list[Path]:
+        """Write `params` to the outputs whose content changes; returns those paths."""
+        from .instrument import stage  # pylint: disable=import-outside-toplevel
+        from .output import figure_bytes, write_if_changed
+        from .prisma import Prisma2020Diagram, figure_size
+
+        self.figure.clear()
+        renderer = Prisma2020Diagram(**asdict(params)).draw(
+            self.figure.add_subplot(), figsize=self.figsize
+        )
+        self.figure.set_size_inches(*figure_size(self.figsize, renderer.ax.get_xlim()))
+
+        encoded: Dict[str, bytes] = {}
+        written = []
+        with stage("save"):
+            for path in map(Path, outputs):
+                fmt = path.suffix.lower().lstrip(".")
+                if fmt not in encoded:
+                    encoded[fmt] = figure_bytes(
+                        self.figure, fmt, style=renderer.style, options=self.output
+                    )
+                if write_if_changed(path, encoded[fmt]):
+                    written.append(path)
+        return written
+
+
+# -------------------------
+# Watch loop
+# -------------------------
+
+
+@dataclass(frozen=True)
+class WatchUpdate:
+    records: str
+    counts_changed: bool
+    written: tuple[str, ...] = ()
+    issues: tuple[ValidationIssue, ...] = ()
+    error: Optional[str] = None
+    parsed: int = 0  # entries (re)parsed
+    seconds: float = 0.0
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "failed"
+        return "rendered" if self.counts_changed else "unchanged"
+
+
+@dataclass
+class _WatchState:
+    job: RenderJob
+    cache: RecordsCache
+    params: Optional[Prisma2020New | Prisma2020Updated] = None
+
+
+def _refresh(state: _WatchState, renderer: WarmRenderer) -> WatchUpdate:
+    job = state.job
+    t0 = time.perf_counter()
+    try:
+        records = state.cache.load(job.records)
+        params = status_from_records(
+            records,
+            prior_reviews=job.prior_reviews,
+            other_methods=job.other_methods,
+            origin_field=job.origin_field,
+        )
+        if params == state.params:
+            return WatchUpdate(
+                records=job.records,
+                counts_changed=False,
+                parsed=state.cache.parsed,
+                seconds=time.perf_counter() - t0,
+            )
+        issues = tuple(validate_diagram(DiagramInputs(**asdict(params))))
+        written = renderer.save(params, job.outputs)
+    except Exception as exc:  # pylint: disable=broad-except
+        # keep watching: the file may be half-written or temporarily invalid
+        return WatchUpdate(
+            records=job.records,
+            counts_changed=False,
+            error=f"{type(exc).__name__}: {exc}",
+            parsed=state.cache.parsed,
+            seconds=time.perf_counter() - t0,
+        )
+    state.params = params
+    return WatchUpdate(
+        records=job.records,
+        counts_changed=True,
+        written=tuple(str(p) for p in written),
+        issues=issues,
+        parsed=state.cache.parsed,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def watch(
+    jobs: Sequence[RenderJob],
+    *,
+    debounce: float = 0.2,
+    poll_interval: float = 0.5,
+    polling: bool = False,
+    figsize: tuple[float, float] = (14, 10),
+    output: Any = None,
+    on_update: Optional[Callable[[WatchUpdate], None]] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Render each job, then re-render it whenever its records file changes and
+    the PRISMA counts differ from the last rendering. Runs until `stop` is set
+    (or forever).
+    """
+    # one state per job: jobs on the same records file may differ in outputs or lanes
+    states: Dict[Path, List[_WatchState]] = {}
+    for job in jobs:
+        states.setdefault(Path(job.records).resolve(), []).append(
+            _WatchState(job=job, cache=RecordsCache(fields={*HEADER_FIELDS, job.origin_field}))
+        )
+    renderer = WarmRenderer(figsize=figsize, output=output)
+    watcher = open_watcher(states, poll_interval=poll_interval, polling=polling)
+
+    def refresh(path: Path) -> None:
+        for state in states[path]:
+            update = _refresh(state, renderer)
+            if on_update is not None:
+                on_update(update)
+
+    try:
+        for path in states:
+            refresh(path)
+        while stop is None or not stop.is_set():
+            changed = wait_for_changes(
+                watcher, debounce=debounce, timeout=None if stop is None else 0.5
+            )
+            for path in sorted(changed):
+                refresh(path)
+    finally:
+        watcher.close()
+
+
+def update_line(update: WatchUpdate) -> str:
+    line = (
+        f"{time.strftime('%H:%M:%S')} {update.status:<9} {update.seconds:6.3f}s  "
+        f"{update.records} ({update.parsed} entries parsed)"
+    )
+    if update.error is not None:
+        return f"{line}\n    {update.error}"
+    return line + "".join(f"\n    {issue_line(i)}" for i in update.issues)
@@ -0,0 +1,198 @@
+"""Background rendering jobs (used by the CoLRev endpoint)."""
+
+from __future__ import annotations
+
+import json
+import os
+import stat
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .loader import Prisma2020New, Prisma2020Updated
+from .output import OutputOptions
+
+# -------------------------
+# Job files
+# -------------------------
+#
+# <job_dir>/job.json    job specification (inputs, targets, output options)
+# <job_dir>/pid         process id of the worker
+# <job_dir>/done.json   completion marker: {"status": "ok"|"error", ...}
+# <job_dir>/error.log   traceback / stderr of the worker
+
+JOB_FILE = "job.json"
+PID_FILE = "pid"
+DONE_FILE = "done.json"
+ERROR_LOG = "error.log"
+
+_PARAM_TYPES = {
+    "Prisma2020New": Prisma2020New,
+    "Prisma2020Updated": Prisma2020Updated,
+}
+
+
+def private_dir(path: Path) -> Path:
+    """
+    Create `path` (mode 0700) unless it exists, and make sure that it is a
+    directory that only the current user can access.
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise RuntimeError(f"{path} is not a directory")
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        raise RuntimeError(f"{path} must be owned by the current user with mode 0700")
+    return path
+
+
+def start_job(
+    job_dir: Path,
+    params: Prisma2020New | Prisma2020Updated,
+    filenames: Sequence[Path],
+    *,
+    output: Optional[OutputOptions] = None,
+    fingerprint: Optional[tuple[Path, str]] = None,
+) -> int:
+    """
+    Hand rendering of `params` to `filenames` to a detached worker process.
+
+    `fingerprint` (path, value) is written by the worker once all files were
+    rendered successfully. Returns the worker pid.
+    """
+    private_dir(job_dir)
+    for name in (DONE_FILE, ERROR_LOG, PID_FILE):
+        (job_dir / name).unlink(missing_ok=True)
+
+    spec = {
+        "type": type(params).__name__,
+        "params": asdict(params),
+        "filenames": [str(f) for f in filenames],
+        "output": asdict(output or OutputOptions()),
+        "fingerprint": [str(fingerprint[0]), fingerprint[1]] if fingerprint else None,
+    }
+    (job_dir / JOB_FILE).write_text(json.dumps(spec), encoding="utf-8")
+
+    with open(job_dir / ERROR_LOG, "ab") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "prisma_flow_diagram.worker", str(job_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            start_new_session=True,
+            env={**os.environ, "MPLBACKEND": "Agg"},
+        )
+    (job_dir / PID_FILE).write_text(str(proc.pid), encoding="utf-8")
+    return proc.pid
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        # reap if it is our own (finished) child, so it does not linger as a zombie
+        if os.waitpid(pid, os.WNOHANG) != (0, 0):
+            return False
+    except ChildProcessError:
+        pass
+    except OSError:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def job_status(job_dir: Path) -> str:
+    """One of "none", "running", "done", "failed" (worker exited without marker)."""
+    if (job_dir / DONE_FILE).is_file():
+        return "done"
+    try:
+        pid = int((job_dir / PID_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return "none"
+    return "running" if _pid_alive(pid) else "failed"
+
+
+def wait_for_job(
+    job_dir: Path, *, timeout: Optional[float] = None, poll: float = 0.1
+) -> Optional[dict[str, Any]]:
+    """
+    Wait for a job and return its completion marker (None if there is no job
+    or the timeout expired). A worker that died without a marker is reported
+    as {"status": "error", ...} with the error log attached.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        status = job_status(job_dir)
+        if status == "none":
+            return None
+        if status == "done":
+            return json.loads((job_dir / DONE_FILE).read_text(encoding="utf-8"))
+        if status == "failed":
+            return {"status": "error", "error": _read_log(job_dir)}
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        time.sleep(poll)
+
+
+def reap_job(job_dir: Path) -> None:
+    """Remove the files of a finished job."""
+    for name in (JOB_FILE, PID_FILE, DONE_FILE, ERROR_LOG):
+        (job_dir / name).unlink(missing_ok=True)
+
+
+def _read_log(job_dir: Path) -> str:
+    try:
+        return (job_dir / ERROR_LOG).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+
+
+# -------------------------
+# Worker entry point
+# -------------------------
+
+
+def run_job(job_dir: Path) -> dict[str, Any]:
+    # imported here: rendering pulls in matplotlib
+    from .prisma import Prisma2020Diagram
+
+    spec = json.loads((job_dir / JOB_FILE).read_text(encoding="utf-8"))
+    params = _PARAM_TYPES[spec["type"]](**spec["params"])
+    diagram = Prisma2020Diagram(**asdict(params))
+    written = diagram.save(
+        spec["filenames"],
+        validation="off",
+        output=OutputOptions(**spec["output"]),
+    )
+    if spec.get("fingerprint"):
+        path, value = spec["fingerprint"]
+        Path(path).write_text(value + "\n", encoding="utf-8")
+    return {"status": "ok", "written": [str(p) for p in written]}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    job_dir = Path(args[0])
+    try:
+        marker = run_job(job_dir)
+    except Exception:  # pylint: disable=broad-except
+        tb = traceback.format_exc()
+        with open(job_dir / ERROR_LOG, "a", encoding="utf-8") as log:
+            log.write(tb)
+        marker = {"status": "error", "error": tb}
+
+    tmp = job_dir / (DONE_FILE + ".tmp")
+    tmp.write_text(json.dumps(marker), encoding="utf-8")
+    os.replace(tmp, job_dir / DONE_FILE)
+    return 0 if marker["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
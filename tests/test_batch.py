@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from prisma_flow_diagram import cli
+from prisma_flow_diagram.batch import (
+    RenderJob,
+    default_outputs,
+    job_name,
+    load_manifest,
+    load_spec,
+    render_jobs,
+    render_report_json,
+    report_json,
+    report_junit,
+    validate_file,
+    validate_files,
+)
+
+DEMO_RECORDS = Path(__file__).resolve().parents[1] / "demo" / "data" / "records.bib"
+
+INPUTS = {
+    "db_registers": {
+        "identification": {"databases": 120, "registers": 8},
+        "removed_before_screening": {"duplicates": 20},
+        "records": {"screened": 108, "excluded": 80},
+        "reports": {"sought": 28, "not_retrieved": 3, "assessed": 25},
+    },
+    "included": {"studies": 10, "reports": 10},
+}
+
+
+@pytest.fixture
+def specs(tmp_path) -> dict[str, Path]:
+    paths = {
+        "ok": tmp_path / "ok.json",
+        "negative": tmp_path / "negative.json",
+        "unknown": tmp_path / "unknown.json",
+    }
+    paths["ok"].write_text(json.dumps(INPUTS), encoding="utf-8")
+    paths["negative"].write_text(
+        json.dumps({**INPUTS, "included": {"studies": -1}}), encoding="utf-8"
+    )
+    paths["unknown"].write_text(json.dumps({**INPUTS, "bogus": 1}), encoding="utf-8")
+    return paths
+
+
+def test_load_spec_rejects_unknown_keys(specs) -> None:
+    assert load_spec(specs["ok"]) == INPUTS
+    with pytest.raises(ValueError, match="unknown keys bogus"):
+        load_spec(specs["unknown"])
+
+
+def test_validate_file(specs) -> None:
+    assert not validate_file(specs["ok"]).failed()
+    negative = validate_file(specs["negative"])
+    assert [i.code for i in negative.issues] == ["negative.count"]
+    assert negative.failed() and not negative.failed("never")
+    unknown = validate_file(specs["unknown"])
+    assert unknown.error is not None and unknown.failed("never")
+
+
+def test_validate_records_file(tmp_path) -> None:
+    ok, missing = validate_files([DEMO_RECORDS, tmp_path / "missing.bib"], jobs=1)
+    assert ok.error is None and not ok.failed()
+    assert missing.error is not None and "not found" in missing.error
+
+
+def test_reports(specs) -> None:
+    reports = validate_files([specs["ok"], specs["negative"], specs["unknown"]], jobs=1)
+    assert [r.input for r in reports] == [str(specs[k]) for k in ("ok", "negative", "unknown")]
+
+    summary = json.loads(report_json(reports))["summary"]
+    assert (summary["inputs"], summary["failed"], summary["unreadable"]) == (3, 2, 1)
+
+    suite = ET.fromstring(report_junit(reports)).find("testsuite")
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("3", "1", "1")
+    cases = suite.findall("testcase")
+    assert cases[0].find("failure") is None and cases[0].find("error") is None
+    assert cases[1].find("failure").get("type") == "negative.count"
+    assert cases[2].find("error") is not None
+
+
+def test_validate_cli_exit_status(specs, tmp_path) -> None:
+    report = tmp_path / "report.xml"
+    assert cli.main(["validate", str(specs["ok"])]) == 0
+    inputs = [str(specs["ok"]), str(specs["negative"])]
+    assert cli.main(["validate", *inputs, "--format", "junit", "-o", str(report)]) == 1
+    assert ET.parse(report).getroot().tag == "testsuites"
+    assert cli.main(["validate", str(specs["negative"]), "--fail-on", "never"]) == 0
+
+
+# -------------------------
+# Rendering
+# -------------------------
+
+
+def test_job_name_and_default_outputs() -> None:
+    records = Path("reviews/alpha/data/records.bib")
+    assert job_name(records) == "alpha"
+    assert job_name(Path("alpha.bib")) == "alpha"
+    assert default_outputs(records, ["png", "svg"]) == (
+        str(records.parent / "prisma.png"),
+        str(records.parent / "prisma.svg"),
+    )
+    assert default_outputs(records, ["pdf"], output_dir="out") == (str(Path("out/alpha.pdf")),)
+
+
+def test_load_manifest(tmp_path) -> None:
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "defaults": {"prior_reviews": ["prior.bib"]},
+                "jobs": [
+                    {"records": "a/data/records.bib", "output": "a.png"},
+                    {"records": "b.bib", "outputs": ["b.png", "b.svg"], "prior_reviews": None},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert load_manifest(manifest) == [
+        RenderJob(
+            records=str(tmp_path / "a/data/records.bib"),
+            outputs=(str(tmp_path / "a.png"),),
+            prior_reviews=["prior.bib"],
+        ),
+        RenderJob(
+            records=str(tmp_path / "b.bib"),
+            outputs=(str(tmp_path / "b.png"), str(tmp_path / "b.svg")),
+        ),
+    ]
+
+    manifest.write_text(json.dumps([{"records": "a.bib", "outpt": "a.png"}]), encoding="utf-8")
+    with pytest.raises(ValueError, match="job 0: unknown keys outpt"):
+        load_manifest(manifest)
+    manifest.write_text(json.dumps([{"records": "a.bib"}]), encoding="utf-8")
+    with pytest.raises(ValueError, match="missing output"):
+        load_manifest(manifest)
+
+
+def test_render_jobs_reports_written_unchanged_and_failed(tmp_path) -> None:
+    jobs = [
+        RenderJob(records=str(DEMO_RECORDS), outputs=(str(tmp_path / "demo.svg"),)),
+        RenderJob(records=str(tmp_path / "missing.bib"), outputs=(str(tmp_path / "x.svg"),)),
+    ]
+    seen = []
+    first = render_jobs(jobs, workers=1, on_report=seen.append)
+    assert [r.status for r in first] == ["written", "failed"]
+    assert seen == first
+    assert "load" in first[0].stages and first[0].issues == ()
+
+    # the same counts give the same bytes: nothing is rewritten
+    second = render_jobs(jobs[:1], workers=1)
+    assert [r.status for r in second] == ["unchanged"]
+
+    summary = json.loads(render_report_json(first + second))["summary"]
+    assert (summary["written"], summary["unchanged"], summary["failed"]) == (1, 1, 1)
+
+
+def test_batch_cli_over_worker_pool(tmp_path) -> None:
+    report = tmp_path / "report.json"
+    argv = ["batch", str(DEMO_RECORDS), str(DEMO_RECORDS), "--output-dir", str(tmp_path)]
+    assert cli.main([*argv, "--formats", "svg", "-j", "2", "-o", str(report)]) == 0
+    jobs = json.loads(report.read_text(encoding="utf-8"))["jobs"]
+    assert [job["outputs"] for job in jobs] == [[str(tmp_path / "demo.svg")]] * 2
+    assert (tmp_path / "demo.svg").exists()
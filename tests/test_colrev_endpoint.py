@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import types
+from pathlib import Path
+
+import pytest
+
+from prisma_flow_diagram import counts_table, status_from_records
+
+pytest.importorskip("colrev")
+
+from colrev.loader import load_utils  # noqa: E402
+
+from prisma_flow_diagram.colrev import PRISMA  # noqa: E402
+
+DEMO_RECORDS = Path(__file__).resolve().parents[1] / "demo" / "data" / "records.bib"
+
+
+@pytest.fixture
+def endpoint(tmp_path, monkeypatch) -> PRISMA:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    review_manager = types.SimpleNamespace(
+        path=tmp_path,
+        paths=types.SimpleNamespace(output=tmp_path / "output", records=DEMO_RECORDS),
+    )
+    return PRISMA(
+        data_operation=types.SimpleNamespace(review_manager=review_manager),
+        settings={"endpoint": "colrev.prisma"},
+    )
+
+
+def test_live_counts_match_rendered_counts(endpoint: PRISMA) -> None:
+    # update_data aggregates the records loaded by the data operation
+    rendered = status_from_records(load_utils.load(filename=str(DEMO_RECORDS)))
+    live = endpoint.live_counts()
+    assert counts_table(live) == counts_table(rendered)
+    assert live.db_registers["reports"]["excluded_reasons"] == {
+        "non-empirical": 1,
+        "biases": 2,
+    }
+
+
+def test_advice_lists_current_counts(endpoint: PRISMA) -> None:
+    advice = endpoint.get_advice()
+    assert "Current counts:" in advice["msg"]
+    assert "db_registers.reports.excluded_reasons.biases: 2" in advice["detailed_msg"]
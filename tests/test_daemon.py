@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from prisma_flow_diagram import __version__, cli, daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+DEMO_RECORDS = Path(__file__).resolve().parents[1] / "demo" / "data" / "records.bib"
+
+PONG = {"ok": True, "protocol": daemon.PROTOCOL, "version": __version__, "pid": 0, "requests": 0}
+
+
+def _fake_daemon(path: Path, answer: Callable[[dict], object]) -> threading.Thread:
+    """
+    Serve one connection: each request line is answered with the JSON of
+    `answer(request)`; None closes the connection (like a daemon that died).
+    """
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def run() -> None:
+        with server:
+            conn, _ = server.accept()
+            with conn, conn.makefile("rb") as file:
+                for line in file:
+                    response = answer(json.loads(line))
+                    if response is None:
+                        return
+                    try:
+                        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+                    except OSError:  # the client gave up
+                        return
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_no_daemon(tmp_path) -> None:
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.request({"op": "ping"}, socket_path=tmp_path / "missing.sock")
+
+
+def test_timeout_is_reported_as_unavailable(tmp_path) -> None:
+    path = tmp_path / "d.sock"
+    hang = threading.Event()
+    _fake_daemon(path, lambda request: PONG if request["op"] == "ping" else hang.wait(5))
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.request({"op": "counts", "records": "x"}, socket_path=path, timeout=0.2)
+    hang.set()
+
+
+def test_other_version_is_reported_as_unavailable(tmp_path) -> None:
+    path = tmp_path / "d.sock"
+    _fake_daemon(path, lambda request: {**PONG, "version": "0.0.0-other"})
+    with pytest.raises(daemon.DaemonUnavailable, match="restart it"):
+        daemon.request({"op": "counts", "records": "x"}, socket_path=path)
+
+
+def test_render_falls_back_when_the_daemon_dies(tmp_path, capsys) -> None:
+    path = tmp_path / "d.sock"
+    # answers the version check, then closes the connection during the render
+    _fake_daemon(path, lambda request: PONG if request["op"] == "ping" else None)
+    output = tmp_path / "prisma.svg"
+    assert cli.main(["render", str(DEMO_RECORDS), str(output), "--socket", str(path)]) == 0
+    assert output.read_bytes().startswith(b"<?xml")
+
+
+def test_serve_counts_and_shutdown(tmp_path) -> None:
+    path = tmp_path / "d.sock"
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=daemon.serve, args=(path,), kwargs={"on_ready": lambda _: ready.set()}, daemon=True
+    )
+    thread.start()
+    assert ready.wait(60)
+
+    assert daemon.request({"op": "ping"}, socket_path=path)["version"] == __version__
+    response = daemon.request({"op": "counts", "records": str(DEMO_RECORDS)}, socket_path=path)
+    assert dict(response["table"])["db_registers.records.screened"] == 90
+    with pytest.raises(RuntimeError, match="unknown op"):
+        daemon.request({"op": "bogus"}, socket_path=path)
+
+    daemon.request({"op": "shutdown"}, socket_path=path)
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not path.exists()
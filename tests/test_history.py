@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from prisma_flow_diagram.history import iter_history, iter_revisions, write_history
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+
+def _bib(*records: tuple[str, str]) -> str:
+    return "".join(
+        f"@article{{{rid},\n   colrev_origin = {{db.bib/{i:04d};}},\n"
+        f"   colrev_status = {{{status}}},\n}}\n\n"
+        for i, (rid, status) in enumerate(records, start=1)
+    )
+
+
+VERSIONS = [
+    ("import", _bib(("a", "md_processed"), ("b", "md_processed"))),
+    ("prescreen", _bib(("a", "rev_prescreen_included"), ("b", "rev_prescreen_excluded"))),
+    ("include", _bib(("a", "rev_included"), ("b", "rev_prescreen_excluded"))),
+]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+    git("init", "-q")
+    git("config", "user.name", "test")
+    git("config", "user.email", "test@example.org")
+    records = tmp_path / "data" / "records.bib"
+    records.parent.mkdir()
+    for subject, text in VERSIONS:
+        records.write_text(text, encoding="utf-8")
+        git("add", "data/records.bib")
+        git("commit", "-q", "-m", subject)
+    (tmp_path / "README.md").write_text("unrelated\n", encoding="utf-8")
+    git("add", "README.md")
+    git("commit", "-q", "-m", "readme")
+    git("revert", "--no-edit", "HEAD~1")  # back to the "prescreen" blob
+    return records
+
+
+def test_revisions_are_listed_oldest_first(repo) -> None:
+    revisions = list(iter_revisions(repo))
+    assert [r.subject for r in revisions] == [
+        "import",
+        "prescreen",
+        "include",
+        'Revert "include"',
+    ]
+    assert revisions[-1].blob == revisions[1].blob
+    assert [r.subject for r in iter_revisions(repo, max_count=1)] == ['Revert "include"']
+
+
+def test_counts_per_revision(repo) -> None:
+    points = list(iter_history(repo))
+    screened = [p.params.db_registers["records"]["screened"] for p in points]
+    excluded = [p.params.db_registers["records"]["excluded"] for p in points]
+    assert (screened, excluded) == ([0, 2, 2, 2], [0, 1, 1, 1])
+    assert [p.params.included["studies"] for p in points] == [0, 0, 1, 0]
+    # the revert brings back an earlier blob: its counts are reused, nothing is parsed
+    assert points[-1].params == points[1].params
+    assert points[-1].parsed == 0
+
+
+def test_write_history(repo) -> None:
+    csv_file = io.StringIO()
+    write_history(iter_history(repo), csv_file)
+    header, *rows = csv_file.getvalue().splitlines()
+    assert header.startswith("commit,timestamp,subject,")
+    assert len(rows) == 4
+
+    jsonl_file = io.StringIO()
+    write_history(iter_history(repo), jsonl_file, fmt="jsonl")
+    lines = [json.loads(line) for line in jsonl_file.getvalue().splitlines()]
+    assert [line["subject"] for line in lines][-1] == 'Revert "include"'
+    assert lines[2]["included.studies"] == 1
+
+    with pytest.raises(ValueError, match="unknown format"):
+        write_history(iter_history(repo), io.StringIO(), fmt="xml")
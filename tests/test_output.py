@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from prisma_flow_diagram import OutputOptions, Prisma2020Diagram
+
+INPUTS = {
+    "db_registers": {
+        "identification": {"databases": {"Scopus": 1842, "Web of Science": 3}, "registers": 73},
+        "removed_before_screening": {"duplicates": 412},
+        "records": {"screened": 1506, "excluded": 1320},
+        "reports": {
+            "sought": 186,
+            "not_retrieved": 9,
+            "assessed": 177,
+            "excluded_reasons": {"Wrong population": 41, "Wrong outcome": 84},
+        },
+    },
+    "included": {"studies": 38, "reports": 52},
+}
+
+
+@pytest.mark.parametrize("fmt", ["png", "svg", "pdf"])
+def test_render_is_byte_identical(fmt: str) -> None:
+    first = Prisma2020Diagram(**INPUTS).render([fmt])[fmt]
+    time.sleep(1.1)  # creation dates have a resolution of one second
+    second = Prisma2020Diagram(**INPUTS).render([fmt])[fmt]
+    assert first == second
+
+
+@pytest.mark.parametrize("fmt", ["png", "svg", "pdf"])
+def test_saved_files_are_byte_identical(tmp_path, fmt: str) -> None:
+    first, second = tmp_path / f"first.{fmt}", tmp_path / f"second.{fmt}"
+    Prisma2020Diagram(**INPUTS).save([first], validation="off")
+    time.sleep(1.1)
+    Prisma2020Diagram(**INPUTS).save([second], validation="off")
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_pdf_has_no_creation_date() -> None:
+    data = Prisma2020Diagram(**INPUTS).render(["pdf"])["pdf"]
+    assert b"/CreationDate" not in data
+
+
+def test_nondeterministic_pdf_has_creation_date() -> None:
+    output = OutputOptions(deterministic=False)
+    data = Prisma2020Diagram(**INPUTS).render(["pdf"], output=output)["pdf"]
+    assert b"/CreationDate" in data
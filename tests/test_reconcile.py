@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from pathlib import Path
+
+from prisma_flow_diagram import load_status_from_records, status_from_records
+from prisma_flow_diagram.reconcile import reconcile, reconcile_records
+
+DEMO_RECORDS = Path(__file__).resolve().parents[1] / "demo" / "data" / "records.bib"
+
+
+def _record(rid: str, status: str, origin: str) -> dict:
+    return {"ID": rid, "colrev_status": status, "colrev_origin": origin}
+
+
+RECORDS = [
+    _record("a", "rev_included", "db.bib/0001"),
+    _record("b", "rev_prescreen_excluded", "db.bib/0002;db.bib/0003"),
+    _record("c", "rev_included", "citations.bib/0001"),
+    _record("d", "rev_prescreen_excluded", "experts.bib/0001"),
+    _record("e", "rev_included", "experts.bib/0002"),
+]
+
+
+def _mismatches(issues: list) -> list:
+    return [i for i in issues if i.code == "reconcile.count_mismatch"]
+
+
+def test_consistent_counts_have_no_mismatch() -> None:
+    params = status_from_records({r["ID"]: r for r in RECORDS})
+    assert _mismatches(reconcile(params, RECORDS)) == []
+
+
+def test_edited_count_is_reported() -> None:
+    params = asdict(status_from_records({r["ID"]: r for r in RECORDS}))
+    params["included"]["studies"] += 1
+    issues = _mismatches(reconcile(params, RECORDS))
+    assert [i.path for i in issues] == ["included.studies"]
+
+
+def test_empty_lane_between_other_methods_lanes() -> None:
+    # the loader drops lane "A" (no records): "B" and "C" move up one position
+    other_methods = {
+        "A": ["nonexistent.bib"],
+        "B": ["citations.bib"],
+        "C": ["experts.bib"],
+    }
+    params = status_from_records({r["ID"]: r for r in RECORDS}, other_methods=other_methods)
+    assert [lane["label"] for lane in params.other_methods] == ["B", "C"]
+    assert _mismatches(reconcile(params, RECORDS, other_methods=other_methods)) == []
+
+
+def test_empty_lane_between_other_methods_lanes_of_demo_project() -> None:
+    other_methods = {
+        "A": ["nonexistent.bib"],
+        "B": ["WagnerPresterPare2021.bib"],
+        "C": ["Fiers2023.csv"],
+    }
+    params = load_status_from_records(DEMO_RECORDS, other_methods=other_methods)
+    issues = reconcile_records(params, DEMO_RECORDS, other_methods=other_methods)
+    assert _mismatches(issues) == []
+
+
+def test_edited_lane_count_is_reported_at_its_position() -> None:
+    other_methods = {"A": ["nonexistent.bib"], "B": ["citations.bib"], "C": ["experts.bib"]}
+    params = asdict(
+        status_from_records({r["ID"]: r for r in RECORDS}, other_methods=other_methods)
+    )
+    params["other_methods"][1]["identification"]["experts.bib"] = 5
+    issues = _mismatches(reconcile(params, RECORDS, other_methods=other_methods))
+    assert [i.path for i in issues] == ["other_methods[1].identification"]
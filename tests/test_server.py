@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from prisma_flow_diagram.server import LRUCache, ServerConfig, make_server
+
+INPUTS = {
+    "db_registers": {
+        "identification": {"databases": 120, "registers": 8},
+        "removed_before_screening": {"duplicates": 20},
+        "records": {"screened": 108, "excluded": 80},
+        "reports": {
+            "sought": 28,
+            "not_retrieved": 3,
+            "assessed": 25,
+            "excluded_reasons": {"Wrong population": 10, "Wrong outcome": 5},
+        },
+    },
+    "included": {"studies": 10, "reports": 10},
+}
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server(ServerConfig(port=0, workers=1))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.app.close()
+
+
+def _request(server, method: str, path: str, body=None, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=60)
+    try:
+        data = body if isinstance(body, bytes) or body is None else json.dumps(body).encode()
+        conn.request(method, path, body=data, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_render_is_cached_and_has_an_etag(server) -> None:
+    status, headers, body = _request(server, "POST", "/render?format=svg", INPUTS)
+    assert (status, headers["X-Cache"]) == (200, "miss")
+    assert body.startswith(b"<?xml")
+
+    status, again, cached = _request(server, "POST", "/render?format=svg", INPUTS)
+    assert (status, again["X-Cache"], cached) == (200, "hit", body)
+
+    etag = {"If-None-Match": headers["ETag"]}
+    status, _, body = _request(server, "POST", "/render?format=svg", INPUTS, etag)
+    assert (status, body) == (304, b"")
+
+
+def test_validation_errors_give_422(server) -> None:
+    spec = {**INPUTS, "included": {"studies": -1}}
+    status, _, body = _request(server, "POST", "/render?format=svg", spec)
+    assert status == 422
+    assert json.loads(body)["issues"]
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {**INPUTS, "bogus": 1},
+        {**INPUTS, "included": [1, 2]},  # TypeError in Prisma2020Diagram(**spec)
+        {**INPUTS, "db_registers": 5},
+    ],
+)
+def test_bad_inputs_give_400(server, spec) -> None:
+    status, _, body = _request(server, "POST", "/render?format=svg&validation=off", spec)
+    assert status == 400, body
+    assert "error" in json.loads(body)
+
+
+def test_negative_content_length_gives_400(server) -> None:
+    status, _, _ = _request(server, "POST", "/validate", b"", {"Content-Length": "-1"})
+    assert status == 400
+
+
+def test_metrics_count_requests(server) -> None:
+    _request(server, "GET", "/healthz")
+    status, _, body = _request(server, "GET", "/metrics")
+    assert status == 200
+    assert 'prisma_requests_total{endpoint="healthz",status="200"}' in body.decode()
+    assert "prisma_cache_entries" in body.decode()
+
+
+def test_lru_cache_evicts_by_entries_and_bytes() -> None:
+    cache = LRUCache(max_entries=2, max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # "b" is now the least recently used
+    cache.put("c", b"12")
+    assert "b" not in cache and "a" in cache and "c" in cache
+
+    cache.put("d", b"12345678")  # 8 + 2 bytes fit, "a" (4 bytes) does not
+    assert cache.stats() == (2, 10)
+    assert "a" not in cache
+
+    cache.put("e", b"x" * 11)  # larger than the whole cache: not stored
+    assert "e" not in cache
+    assert (cache.hits, cache.misses) == (1, 0)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from prisma_flow_diagram.validation import (
+    RULES,
+    DiagramInputs,
+    Rule,
+    ValidationEngine,
+    ValidationIssue,
+    find_issues,
+    validate_diagram,
+)
+
+INPUTS = {
+    "db_registers": {
+        "identification": {"databases": 120, "registers": 8},
+        "removed_before_screening": {"duplicates": 20},
+        "records": {"screened": 108, "excluded": 80},
+        "reports": {
+            "sought": 28,
+            "not_retrieved": 3,
+            "assessed": 25,
+            "excluded_reasons": {"Wrong population": 10, "Wrong outcome": 5},
+        },
+    },
+    "included": {"studies": 10, "reports": 10},
+}
+
+
+def _inputs(**changes: dict) -> DiagramInputs:
+    spec = copy.deepcopy(INPUTS)
+    for block, values in changes.items():
+        spec[block].update(values)
+    return DiagramInputs(**spec)
+
+
+def test_consistent_inputs_have_no_issues() -> None:
+    assert validate_diagram(_inputs()) == []
+
+
+def test_negative_count_is_an_error() -> None:
+    assert validate_diagram(_inputs(included={"studies": -1})) == [
+        ValidationIssue(
+            severity="error",
+            code="negative.count",
+            message="included_studies must be >= 0 (got -1).",
+            path="included.studies",
+        )
+    ]
+
+
+def test_missing_lane_stops_further_rules() -> None:
+    issues = validate_diagram(DiagramInputs(included={"studies": -1}))
+    assert [i.code for i in issues] == ["missing.lane"]
+
+
+def test_findings_match_validation_issues() -> None:
+    inputs = _inputs(included={"studies": -1, "reports": 40})
+    findings = find_issues(inputs)
+    issues = validate_diagram(inputs)
+    assert len(issues) == 2
+    assert [f.issue() for f in findings] == issues
+    assert [(f.severity, f.code, f.message, f.path) for f in findings] == [
+        (i.severity, i.code, i.message, i.path) for i in issues
+    ]
+    assert len(set(issues)) == len(issues)  # plain values: hashable
+
+
+def test_engine_counts_calls_and_hits_per_rule() -> None:
+    engine = ValidationEngine()
+    validate_diagram(_inputs(), engine=engine)
+    validate_diagram(_inputs(included={"studies": -1}), engine=engine)
+    assert engine.stats["snapshot"].calls == 2
+    assert engine.stats["negative.included_studies"].calls == 2
+    assert engine.stats["negative.included_studies"].hits == 1
+    assert engine.stats["missing.lane"].hits == 0
+
+    engine.reset_stats()
+    assert engine.stats["snapshot"].calls == 0
+
+
+def test_custom_rule_table() -> None:
+    rule = Rule(
+        name="few.studies",
+        code="few.studies",
+        severity="warning",
+        scope="included",
+        inputs=("included_studies",),
+        check=lambda studies: studies is not None and studies < 20,
+        message="Only {included_studies} studies included.",
+        path="included.studies",
+    )
+    engine = ValidationEngine((*RULES, rule))
+    issues = validate_diagram(_inputs(), engine=engine)
+    assert [(i.code, i.message) for i in issues] == [("few.studies", "Only 10 studies included.")]
+
+
+def test_rule_names_must_be_unique() -> None:
+    with pytest.raises(ValueError, match="unique"):
+        ValidationEngine((*RULES, RULES[0]))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from prisma_flow_diagram import cli
+from prisma_flow_diagram.batch import RenderJob
+from prisma_flow_diagram.watch import watch
+
+DEMO_RECORDS = Path(__file__).resolve().parents[1] / "demo" / "data" / "records.bib"
+
+
+def test_jobs_on_the_same_records_file_are_all_rendered(tmp_path) -> None:
+    records = tmp_path / "records.bib"
+    shutil.copy(DEMO_RECORDS, records)
+    jobs = [
+        RenderJob(records=str(records), outputs=(str(tmp_path / "a.svg"),)),
+        RenderJob(records=str(records), outputs=(str(tmp_path / "b.png"),)),
+    ]
+    stop = threading.Event()
+    updates = []
+
+    def on_update(update) -> None:
+        updates.append(update)
+        if len(updates) == len(jobs):
+            stop.set()
+
+    timeout = threading.Timer(60, stop.set)  # fail instead of hanging
+    timeout.start()
+    watch(jobs, polling=True, poll_interval=0.1, on_update=on_update, stop=stop)
+    timeout.cancel()
+    assert [u.written for u in updates] == [(str(tmp_path / "a.svg"),), (str(tmp_path / "b.png"),)]
+    assert (tmp_path / "a.svg").exists() and (tmp_path / "b.png").exists()
+
+
+def test_show_cannot_be_combined_with_watch(tmp_path, capsys) -> None:
+    with pytest.raises(SystemExit):
+        cli.main(["render", str(DEMO_RECORDS), str(tmp_path / "a.svg"), "--watch", "--show"])
+    assert "not allowed with argument" in capsys.readouterr().err